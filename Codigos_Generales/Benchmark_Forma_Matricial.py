@@ -0,0 +1,94 @@
+import argparse
+import os
+import sys
+import time
+import pandas as pd
+from pyomo.environ import value
+from Forma_Matricial import Compilar
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.extend(os.path.join(DIRECTORIO, carpeta) for carpeta in
+                ('Problema_Dieta', 'I_Problema_Prestamo_Bancario', 'Problema_Decimas'))
+from Modelo_Problema_Dieta import Problema_Dieta
+from Modelo_Problema_Prestamo_Bancario_Lab import Problema_Prestamo
+from Problema_GreenPharma import Problema_GreenPharma
+from Generador_Instancias import Generar_Instancia, Cargar_Instancia
+
+# Tamaños (fabricas, centros, periodos) de GreenPharma sinteticos
+TAMANOS = [(10, 12, 24), (50, 200, 24), (100, 500, 52)]
+
+def Instancias(tamanos=TAMANOS):
+    # (nombre, problema con los datos cargados)
+    for nombre, clase, archivo in (('Dieta', Problema_Dieta, os.path.join('Problema_Dieta', 'Data_Problema_Dieta.xlsx')),
+                                   ('Prestamo', Problema_Prestamo, os.path.join('I_Problema_Prestamo_Bancario', 'Data_Prestamo_Bancario.xlsx')),
+                                   ('GreenPharma', Problema_GreenPharma, os.path.join('Problema_Decimas', 'Data_Input.xlsx'))):
+        problema = clase()
+        problema.ReadExcelFile(os.path.join(DIRECTORIO, archivo))
+        yield nombre, problema
+    for N_fabricas, N_centros, N_periodos in tamanos:
+        yield (f'GreenPharma_{N_fabricas}x{N_centros}x{N_periodos}',
+               Cargar_Instancia(Problema_GreenPharma(), Generar_Instancia(N_fabricas, N_centros, N_periodos)))
+
+def Camino_Pyomo(problema):
+    # Modelo Pyomo + Solucionador (GLPK por defecto, o el backend de IO_SOLVER): construccion, escritura del LP,
+    # solver y lectura de la solucion
+    inicio = time.perf_counter()
+    modelo = problema.Model()
+    construccion = time.perf_counter() - inicio
+    problema.opt.Resolver(modelo)
+    return value(modelo.FunObj), {'Construccion_s': construccion, 'Compilacion_s': 0.0,
+                                  'Solucion_s': problema.opt.Tiempos['total']}
+
+def Camino_Compilado(problema):
+    # Modelo Pyomo compilado a matrices y resuelto con linprog (sin archivo LP)
+    inicio = time.perf_counter()
+    modelo = problema.Model()
+    construccion = time.perf_counter() - inicio
+    forma = Compilar(modelo)
+    Solucion = forma.Resolver()
+    return Solucion.Objetivo, {'Construccion_s': construccion, 'Compilacion_s': forma.Tiempos['compilacion'],
+                               'Solucion_s': forma.Tiempos['solucion'] + forma.Tiempos['carga']}
+
+def Camino_Directo(problema):
+    # Matrices armadas desde los arreglos de datos (sin Pyomo) y resueltas con linprog
+    inicio = time.perf_counter()
+    forma = problema.Matrices()
+    construccion = time.perf_counter() - inicio
+    Solucion = forma.Resolver()
+    return Solucion.Objetivo, {'Construccion_s': construccion, 'Compilacion_s': 0.0,
+                               'Solucion_s': forma.Tiempos['solucion'] + forma.Tiempos['carga']}
+
+CAMINOS = {'Pyomo': Camino_Pyomo, 'Compilado': Camino_Compilado, 'Directo': Camino_Directo}
+
+def Medir(instancias, Caminos=CAMINOS, repeticiones=3):
+    # Mejor tiempo total de cada camino por instancia, objetivo y diferencia contra el camino Pyomo
+    Tabla = []
+    for nombre, problema in instancias:
+        referencia = None
+        for camino, funcion in Caminos.items():
+            mejor = None
+            for _ in range(repeticiones):
+                objetivo, tiempos = funcion(problema)
+                tiempos['Total_s'] = sum(tiempos.values())
+                if mejor is None or tiempos['Total_s'] < mejor['Total_s']:
+                    mejor = tiempos
+            referencia = objetivo if referencia is None else referencia
+            Tabla.append({'Instancia': nombre, 'Camino': camino, **{fase: round(t, 4) for fase, t in mejor.items()},
+                          'Objetivo': objetivo, 'Diferencia': abs(objetivo - referencia)})
+            print(Tabla[-1])
+    Tabla = pd.DataFrame(Tabla)
+    Resumen = Tabla.pivot_table(index='Instancia', columns='Camino', values='Total_s', sort=False)
+    for camino in Caminos:
+        if camino != 'Pyomo' and {'Pyomo', camino} <= set(Resumen.columns):
+            Resumen['Aceleracion_' + camino] = (Resumen['Pyomo'] / Resumen[camino]).round(1)
+    return Tabla, Resumen
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Pyomo + solver contra forma matricial + linprog (HiGHS)')
+    parser.add_argument('--max', type=int, default=len(TAMANOS), help='Numero de tamaños sinteticos de GreenPharma')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    Tabla, Resumen = Medir(Instancias(TAMANOS[:args.max]), repeticiones=args.repeticiones)
+    print(Tabla.to_string(index=False))
+    print(Resumen.to_string())
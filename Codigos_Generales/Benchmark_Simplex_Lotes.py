@@ -0,0 +1,92 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from scipy.optimize import linprog
+from Simplex_Lotes import Simplex_Lotes, Validar
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+def Lote_Dieta(Data, K, Variacion=0.2, rng=None):
+    # Un Problema_Dieta por cliente: costos, proteina y fibra de los forrajes y libras minimas con variacion por cliente.
+    # min C·x  s.a.  sum x >= L,  P·x >= 0.3 sum x,  F·x <= 0.05 sum x  (las dos ultimas como filas <= 0)
+    rng = rng or np.random.default_rng()
+    n = len(Data)
+    ruido = lambda: 1 + Variacion*rng.uniform(-1, 1, size=(K, n))
+    C, P, F = Data['Costo'].to_numpy()*ruido(), Data['Proteina'].to_numpy()*ruido(), Data['Fibra'].to_numpy()*ruido()
+    A_ub = np.stack([-np.ones((K, n)), 0.3 - P, F - 0.05], axis=1)
+    b_ub = np.column_stack([-rng.uniform(400, 1200, size=K), np.zeros(K), np.zeros(K)])
+    return C, A_ub, b_ub
+
+def Lote_Prestamo(Data, K, Variacion=0.2, rng=None):
+    # Un Problema_Prestamo por cliente (maximizar se pasa a minimizar -c): tasas y deudas con variacion y capital
+    # disponible por cliente. Las restricciones 2 y 3 usan los tipos de prestamo del laboratorio (4 y 5; 1 a 3)
+    rng = rng or np.random.default_rng()
+    n = len(Data)
+    Tasa = Data['Tasa'].to_numpy()*(1 + Variacion*rng.uniform(-1, 1, size=(K, n)))
+    Deuda = Data['Deuda'].to_numpy()*(1 + Variacion*rng.uniform(-1, 1, size=(K, n)))
+    tipo = np.arange(1, n + 1)
+    A = np.stack([np.ones(n), 0.4 - (tipo >= 4), 0.5*(tipo <= 3) - (tipo == 3)])
+    A_ub = np.concatenate([np.broadcast_to(A, (K, 3, n)), (Deuda - 0.04)[:, None, :]], axis=1)
+    b_ub = np.column_stack([rng.uniform(5, 20, size=K), np.zeros((K, 3))])
+    return -Tasa*(1 - Deuda), A_ub, b_ub
+
+def Lote_Aleatorio(K, n, m, Acotado=False, rng=None):
+    # Problemas densos aleatorios con filas <= e = de signos mezclados: hay optimos, infactibles y no acotados.
+    # Con Acotado la primera fila es sum x <= 10 y no quedan no acotados (mas iteraciones por problema)
+    rng = rng or np.random.default_rng()
+    m_eq = m // 4
+    A_ub, b_ub = rng.normal(size=(K, m - m_eq, n)), rng.normal(size=(K, m - m_eq))
+    if Acotado:
+        A_ub[:, 0, :], b_ub[:, 0] = 1, 10
+    return rng.normal(size=(K, n)), A_ub, b_ub, rng.normal(size=(K, m_eq, n)), rng.normal(size=(K, m_eq))
+
+def Medir(lotes, Muestra=500):
+    # Problemas por segundo del simplex por lotes y de linprog (HiGHS, un problema por llamada, sobre una muestra),
+    # y validacion de la muestra contra linprog
+    Tabla = []
+    for nombre, arreglos in lotes:
+        arreglos = dict(zip(('c', 'A_ub', 'b_ub', 'A_eq', 'b_eq'), arreglos))
+        K = len(arreglos['c'])
+        inicio = time.perf_counter()
+        resultado = Simplex_Lotes(**arreglos)
+        lotes_s = time.perf_counter() - inicio
+
+        muestra = {nombre_arreglo: a[:Muestra] for nombre_arreglo, a in arreglos.items()}
+        k = len(muestra['c'])
+        inicio = time.perf_counter()
+        for i in range(k):
+            linprog(muestra['c'][i], bounds=(0, None), method='highs',
+                    **{nombre_arreglo: a[i] for nombre_arreglo, a in muestra.items() if nombre_arreglo != 'c'})
+        linprog_s = time.perf_counter() - inicio
+
+        submuestra = resultado.__class__({clave: valor[:Muestra] for clave, valor in resultado.items()})
+        _, Discrepancias = Validar(resultado=submuestra, **muestra)
+        estados = np.bincount(resultado.status, minlength=4)
+        Tabla.append({'Lote': nombre, 'Problemas': K, 'Forma': arreglos['A_ub'].shape[1:],
+                      'Optimos': estados[0], 'Infactibles': estados[2], 'No_Acotados': estados[3], 'Limite': estados[1],
+                      'Iteraciones_Max': resultado.nit.max(), 'Lotes_s': round(lotes_s, 3),
+                      'Lotes_Problemas_s': round(K / lotes_s), 'Linprog_Problemas_s': round(k / linprog_s),
+                      'Aceleracion': round(K / lotes_s / (k / linprog_s), 1),
+                      'Validados': k, 'Discrepancias': len(Discrepancias)})
+        print(Tabla[-1])
+    return pd.DataFrame(Tabla)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Simplex por lotes contra linprog (un problema por llamada)')
+    parser.add_argument('--problemas', type=int, default=20000, help='Problemas por lote (clientes)')
+    parser.add_argument('--muestra', type=int, default=500, help='Problemas resueltos con linprog para validar y comparar')
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    Dieta = pd.read_excel(os.path.join(DIRECTORIO, 'Problema_Dieta', 'Data_Problema_Dieta.xlsx'), sheet_name='Data')
+    Prestamo = pd.read_excel(os.path.join(DIRECTORIO, 'I_Problema_Prestamo_Bancario', 'Data_Prestamo_Bancario.xlsx'),
+                             sheet_name='Data')
+    lotes = [('Dieta', Lote_Dieta(Dieta, args.problemas, rng=rng)),
+             ('Prestamo', Lote_Prestamo(Prestamo, args.problemas, rng=rng)),
+             ('Aleatorio_5x4', Lote_Aleatorio(args.problemas, 5, 4, rng=rng)),
+             ('Aleatorio_20x8', Lote_Aleatorio(args.problemas, 20, 8, Acotado=True, rng=rng))]
+    Tabla = Medir(lotes, args.muestra)
+    print(Tabla.to_string(index=False))
@@ -0,0 +1,128 @@
+"""
+Carga comun de los libros Excel de entrada. Abre el libro una sola vez y lee todas las hojas pedidas
+(en vez de un pd.read_excel por hoja), valida columnas, filas y NaNs segun un esquema por hoja y guarda
+las hojas leidas en un cache binario (pickle) identificado por el hash del contenido del archivo.
+Si el archivo no cambia, las siguientes ejecuciones no vuelven a leer el Excel.
+El cache se guarda en IO_CACHE_DATOS o, por defecto, en __cache_datos__ junto al archivo; el nombre del
+cache lleva el del libro y un hash de su ruta, asi libros homonimos en otras carpetas no se pisan.
+Indexar arma en bloque, desde arreglos NumPy, los diccionarios con que se inicializan los Param.
+Huella_Datos identifica datos ya cargados en memoria (DataFrames, arreglos, escalares) por su contenido.
+"""
+
+import hashlib
+import itertools
+import os
+import re
+import numpy as np
+import pandas as pd
+
+DIRECTORIO_CACHE = '__cache_datos__'
+
+def Hash_Archivo(FileName, bloque=1 << 20):
+    h = hashlib.sha256()
+    with open(FileName, 'rb') as archivo:
+        for parte in iter(lambda: archivo.read(bloque), b''):
+            h.update(parte)
+    return h.hexdigest()
+
+def Huella_Datos(*objetos):
+    # sha256 del contenido: DataFrames y Series (valores, indice y columnas), arreglos (bytes, forma y tipo),
+    # listas, tuplas y diccionarios recorridos en orden, y el repr de cualquier otro objeto
+    h = hashlib.sha256()
+    def Agregar(objeto):
+        if isinstance(objeto, (pd.DataFrame, pd.Series)):
+            h.update(pd.util.hash_pandas_object(objeto, index=True).to_numpy().tobytes())
+            h.update(repr(list(objeto.columns) if isinstance(objeto, pd.DataFrame) else objeto.name).encode())
+        elif isinstance(objeto, np.ndarray):
+            h.update(f'{objeto.shape}{objeto.dtype}'.encode())
+            h.update(np.ascontiguousarray(objeto).tobytes())
+        elif isinstance(objeto, (list, tuple)):
+            h.update(f'{type(objeto).__name__}{len(objeto)}'.encode())
+            for elemento in objeto:
+                Agregar(elemento)
+        elif isinstance(objeto, dict):
+            h.update(f'dict{len(objeto)}'.encode())
+            for clave, valor in objeto.items():
+                Agregar(clave)
+                Agregar(valor)
+        else:
+            h.update(repr(objeto).encode())
+        h.update(b'|')
+    for objeto in objetos:
+        Agregar(objeto)
+    return h.hexdigest()
+
+def Prefijo_Cache(FileName):
+    # Nombre del libro y hash corto de su ruta absoluta (Problema_Control/Data_Input.xlsx y
+    # Problema_Decimas/Data_Input.xlsx tienen caches distintos aunque compartan IO_CACHE_DATOS)
+    base = os.path.splitext(os.path.basename(FileName))[0]
+    return f'{base}_{hashlib.sha256(os.path.abspath(FileName).encode()).hexdigest()[:8]}'
+
+def Ruta_Cache(FileName, huella, Directorio_Cache=None):
+    directorio = Directorio_Cache or os.environ.get('IO_CACHE_DATOS') or \
+        os.path.join(os.path.dirname(os.path.abspath(FileName)), DIRECTORIO_CACHE)
+    return directorio, os.path.join(directorio, f'{Prefijo_Cache(FileName)}_{huella[:16]}.pkl')
+
+def Leer_Libro(FileName, Esquema, Cache=True, Directorio_Cache=None):
+    # Esquema: {'Hoja': {'columnas': [...], 'filas': n, 'index_col': 0, 'sin_nans': [...]}}; cada clave es opcional.
+    # 'sin_nans' son las columnas que no pueden tener NaN (por defecto toda la hoja).
+    # Devuelve {'Hoja': DataFrame} en el orden del esquema
+    Esquema = {hoja: (reglas or {}) for hoja, reglas in Esquema.items()}
+    claves = {hoja: f"{hoja}|{reglas.get('index_col')}" for hoja, reglas in Esquema.items()}
+
+    guardadas = {}
+    if Cache:
+        directorio, ruta = Ruta_Cache(FileName, Hash_Archivo(FileName), Directorio_Cache)
+        if os.path.exists(ruta):
+            guardadas = pd.read_pickle(ruta)
+
+    faltantes = [hoja for hoja in Esquema if claves[hoja] not in guardadas]
+    if faltantes:
+        with pd.ExcelFile(FileName) as libro:
+            for hoja in faltantes:
+                if hoja not in libro.sheet_names:
+                    raise ValueError(f"{FileName}: falta la hoja '{hoja}' (hojas: {libro.sheet_names})")
+                guardadas[claves[hoja]] = libro.parse(hoja, index_col=Esquema[hoja].get('index_col'))
+
+    tablas = {hoja: guardadas[claves[hoja]] for hoja in Esquema}
+    Validar_Hojas(tablas, Esquema, FileName)
+
+    if Cache and faltantes:
+        # Solo se guarda lo que paso la validacion; se eliminan los caches de versiones anteriores de este mismo
+        # libro (no los de Data_Input_SM.xlsx ni los de otro Data_Input.xlsx)
+        os.makedirs(directorio, exist_ok=True)
+        anteriores = re.compile(re.escape(Prefijo_Cache(FileName)) + r'_[0-9a-f]{16}\.pkl')
+        for nombre in os.listdir(directorio):
+            anterior = os.path.join(directorio, nombre)
+            if anteriores.fullmatch(nombre) and anterior != ruta:
+                os.remove(anterior)
+        pd.to_pickle(guardadas, ruta)
+    return tablas
+
+def Validar_Hojas(tablas, Esquema, FileName=''):
+    # Reune todos los problemas encontrados y los informa juntos en un solo ValueError
+    errores = []
+    for hoja, reglas in Esquema.items():
+        Table = tablas[hoja]
+        reglas = reglas or {}
+        columnas = list(reglas.get('columnas', []))
+        faltantes = [c for c in columnas if c not in Table.columns]
+        if faltantes:
+            errores.append(f"{hoja}: faltan las columnas {faltantes}")
+        filas = reglas.get('filas')
+        if filas is not None and len(Table) != filas:
+            errores.append(f"{hoja}: {len(Table)} filas, se esperaban {filas}")
+        sin_nans = reglas.get('sin_nans', list(Table.columns))
+        nulos = Table[[c for c in sin_nans if c in Table.columns]].isna().sum()
+        for columna, n in nulos[nulos > 0].items():
+            errores.append(f"{hoja}: {n} NaN en la columna '{columna}'")
+    if errores:
+        raise ValueError(f'Datos invalidos en {FileName}:\n  ' + '\n  '.join(errores))
+
+def Indexar(arreglo, Inicios=None):
+    # Diccionario {(i, j, ...): valor} con indices desde 1 (o desde Inicios por eje), construido en bloque
+    Inicios = Inicios or (1,) * arreglo.ndim
+    indices = itertools.product(*(range(inicio, inicio + n) for inicio, n in zip(Inicios, arreglo.shape)))
+    if arreglo.ndim == 1:
+        indices = (k[0] for k in indices)
+    return dict(zip(indices, arreglo.ravel().tolist()))
@@ -0,0 +1,71 @@
+"""
+Extraccion columnar de resultados de modelos Pyomo. Cada componente indexado (Var, Param, Suffix)
+se convierte en arreglos NumPy en una sola pasada y de ahi en DataFrames, en vez de llenar la
+tabla celda por celda con Table.loc[r, col]. La escritura de las tablas (xlsx, csv, parquet o feather,
+manteniendo los nombres de hoja de cada problema) esta en Salida_Resultados.
+"""
+
+import numpy as np
+import pandas as pd
+from Salida_Resultados import Escribir_Resultados, FORMATOS
+
+def Extraer_Valores(componente, sufijo=None):
+    # Devuelve (indices, valores): indices con forma (n, k) y valores con forma (n,)
+    # Con 'sufijo' (p. ej. model.dual o model.rc) se extrae el valor del sufijo de cada elemento.
+    # Un par (indices, valores) ya extraido (p. ej. de Forma_Matricial) se devuelve tal cual
+    if isinstance(componente, tuple):
+        indices, valores = componente
+        return np.asarray(indices), np.asarray(valores, dtype=float)
+    if sufijo is not None:
+        datos = {indice: sufijo.get(elemento) for indice, elemento in componente.items()}
+    elif hasattr(componente, 'extract_values'):
+        datos = componente.extract_values()
+    else:
+        datos = dict(componente.items())
+    n = len(datos)
+    valores = np.fromiter((np.nan if v is None else v for v in datos.values()), dtype=float, count=n)
+    claves = list(datos.keys())
+    if n and isinstance(claves[0], tuple):
+        indices = np.array(claves)
+    else:
+        indices = np.array(claves).reshape(n, 1)
+    return indices, valores
+
+def Tabla_Indices(indices, valores, columnas, valor, decimales=4, solo_no_nulos=False, orden=None, tolerancia=0.0):
+    # Arma la tabla a partir de arreglos; 'orden' define las columnas por las que se ordena y su posicion
+    if solo_no_nulos:
+        mascara = np.abs(np.nan_to_num(valores)) > tolerancia
+        indices, valores = indices[mascara], valores[mascara]
+    Table = pd.DataFrame(indices, columns=list(columnas))
+    Table[valor] = np.round(valores, decimales) if decimales is not None else valores
+    if orden:
+        Table = Table.sort_values(list(orden), kind='stable', ignore_index=True)
+        restantes = [c for c in columnas if c not in orden]
+        Table = Table[list(orden) + restantes + [valor]]
+    return Table
+
+def Tabla_Variable(componente, columnas, valor, decimales=4, solo_no_nulos=False, orden=None, tolerancia=0.0, sufijo=None):
+    # Tabla larga (una fila por indice) de un componente indexado
+    indices, valores = Extraer_Valores(componente, sufijo)
+    return Tabla_Indices(indices, valores, columnas, valor, decimales, solo_no_nulos, orden, tolerancia)
+
+def Tabla_Columnas(componentes, indice, decimales=4):
+    # Varios componentes con el mismo conjunto indice, uno por columna ({'columna': componente})
+    Table = None
+    for columna, componente in componentes.items():
+        indices, valores = Extraer_Valores(componente)
+        if Table is None:
+            Table = pd.DataFrame(indices, columns=[indice] if indices.shape[1] == 1 else list(indice))
+        Table[columna] = np.round(valores, decimales)
+    return Table
+
+def Tabla_Ancha(componente, fila, decimales=4):
+    # Componente con indice (fila, columna) pivotado: una fila por elemento y una columna por segundo indice
+    indices, valores = Extraer_Valores(componente)
+    filas, pos_fila = np.unique(indices[:, 0], return_inverse=True)
+    columnas, pos_columna = np.unique(indices[:, 1], return_inverse=True)
+    matriz = np.full((len(filas), len(columnas)), np.nan)
+    matriz[pos_fila, pos_columna] = np.round(valores, decimales)
+    Table = pd.DataFrame(matriz, columns=[str(c) for c in columnas])
+    Table.insert(0, fila, [str(f) for f in filas])
+    return Table
@@ -0,0 +1,171 @@
+"""
+Forma matricial de los modelos lineales del proyecto:
+    min/max c·x + Constante  sujeto a  A_ub·x <= b_ub,  A_eq·x = b_eq,  Cotas[0] <= x <= Cotas[1]
+con matrices dispersas de SciPy y el nombre de cada bloque de columnas (variable) y de filas (restriccion)
+con sus indices. Se obtiene de dos formas:
+  - Compilar(modelo): cualquier modelo Pyomo ya construido, con el compilador de forma estandar de Pyomo
+    (sin escribir el archivo LP)
+  - directamente desde los arreglos de datos, sin Pyomo (Matrices() de cada problema)
+Resolver() usa scipy.optimize.linprog(method='highs') en el mismo proceso (milp si hay variables enteras) y
+devuelve una Solucion_Matricial con un atributo (indices, valores) por variable, el mismo formato de
+Extraer_Valores, de modo que los Print_Results/Tablas_Resultados existentes la aceptan en lugar del modelo.
+"""
+
+import time
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog, milp, Bounds, LinearConstraint
+from pyomo.environ import maximize, minimize
+
+class Solucion_Matricial:
+    # Resultado de Forma_Matricial.Resolver: Objetivo, Estado (codigos de linprog), Mensaje y un atributo
+    # (indices, valores) por cada bloque de variables. Duales {restriccion: (indices, valores)} solo en problemas lineales
+    def __init__(self, resultado, Objetivo, Variables, Duales=None, Costos_Reducidos=None):
+        self.Resultado = resultado
+        self.Estado = resultado.status
+        self.Mensaje = resultado.message
+        self.Objetivo = Objetivo
+        self.FunObj = Objetivo
+        for nombre, valores in Variables.items():
+            setattr(self, nombre, valores)
+        self.Variables = Variables
+        self.Duales = Duales or {}
+        self.Costos_Reducidos = Costos_Reducidos or {}
+
+    @property
+    def Optimo(self):
+        return self.Estado == 0
+
+class Forma_Matricial:
+    def __init__(self, c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, Cotas=None, Enteras=None, Variables=None,
+                 Restricciones_ub=None, Restricciones_eq=None, Signos_ub=None, Sentido=minimize, Constante=0.0,
+                 Columnas=None):
+        # Variables/Restricciones_*: {nombre: indices (n, k)} en el orden de las columnas/filas.
+        # Signos_ub: -1 en las filas >= que se pasaron a <= multiplicando por -1 (para el signo de los duales).
+        # Columnas: VarData de Pyomo de cada columna (solo al compilar un modelo), para Cargar_Solucion
+        self.c = np.asarray(c, dtype=float)
+        n = len(self.c)
+        self.A_ub = sparse.csr_array(A_ub) if A_ub is not None else sparse.csr_array((0, n))
+        self.b_ub = np.asarray(b_ub if b_ub is not None else [], dtype=float)
+        self.A_eq = sparse.csr_array(A_eq) if A_eq is not None else sparse.csr_array((0, n))
+        self.b_eq = np.asarray(b_eq if b_eq is not None else [], dtype=float)
+        self.Cotas = Cotas if Cotas is not None else (np.zeros(n), np.full(n, np.inf))
+        self.Enteras = Enteras if Enteras is not None else np.zeros(n, dtype=bool)
+        self.Variables = Variables if Variables is not None else {'x': np.arange(1, n + 1).reshape(n, 1)}
+        self.Restricciones_ub = Restricciones_ub or {}
+        self.Restricciones_eq = Restricciones_eq or {}
+        self.Signos_ub = Signos_ub if Signos_ub is not None else np.ones(len(self.b_ub))
+        self.Sentido = Sentido
+        self.Constante = Constante
+        self.Columnas = Columnas
+        self.Tiempos = {}
+
+    @property
+    def Tamano(self):
+        return {'Variables': len(self.c), 'Filas_ub': self.A_ub.shape[0], 'Filas_eq': self.A_eq.shape[0],
+                'No_Nulos': self.A_ub.nnz + self.A_eq.nnz, 'Enteras': int(self.Enteras.sum())}
+
+    def Resolver(self, Tiempo_Limite=None, Gap=None, Metodo='highs'):
+        # Problema lineal con linprog (Metodo: 'highs', 'highs-ds' o 'highs-ipm'); con enteras milp (HiGHS)
+        signo = -1.0 if self.Sentido == maximize else 1.0
+        inicio = time.perf_counter()
+        if self.Enteras.any():
+            restricciones = [LinearConstraint(A, -np.inf, b) for A, b in ((self.A_ub, self.b_ub),) if A.shape[0]]
+            restricciones += [LinearConstraint(A, b, b) for A, b in ((self.A_eq, self.b_eq),) if A.shape[0]]
+            opciones = {clave: valor for clave, valor in (('time_limit', Tiempo_Limite), ('mip_rel_gap', Gap))
+                        if valor is not None}
+            resultado = milp(signo*self.c, integrality=self.Enteras.astype(int), bounds=Bounds(*self.Cotas),
+                             constraints=restricciones, options=opciones)
+        else:
+            opciones = {'time_limit': Tiempo_Limite} if Tiempo_Limite is not None else {}
+            con_ub, con_eq = self.A_ub.shape[0] > 0, self.A_eq.shape[0] > 0
+            resultado = linprog(signo*self.c, A_ub=self.A_ub if con_ub else None, b_ub=self.b_ub if con_ub else None,
+                                A_eq=self.A_eq if con_eq else None, b_eq=self.b_eq if con_eq else None,
+                                bounds=np.column_stack(self.Cotas), method=Metodo, options=opciones)
+        self.Tiempos['solucion'] = time.perf_counter() - inicio
+
+        if resultado.x is None:
+            return Solucion_Matricial(resultado, None, {})
+        inicio = time.perf_counter()
+        Solucion = Solucion_Matricial(resultado, signo*resultado.fun + self.Constante, self.Separar(resultado.x),
+                                      *self.Sensibilidad(resultado, signo))
+        self.Tiempos['carga'] = time.perf_counter() - inicio
+        return Solucion
+
+    def Separar(self, valores, Bloques=None):
+        # Arreglo por columna (o por fila) -> {nombre: (indices, valores)} segun los bloques
+        Bloques = self.Variables if Bloques is None else Bloques
+        separados, inicio = {}, 0
+        for nombre, indices in Bloques.items():
+            separados[nombre] = (indices, valores[inicio:inicio + len(indices)])
+            inicio += len(indices)
+        return separados
+
+    def Sensibilidad(self, resultado, signo):
+        # Duales y costos reducidos con la convencion de Pyomo (derivada del objetivo original respecto al lado
+        # derecho); milp no los entrega
+        if not hasattr(resultado, 'eqlin') or resultado.eqlin is None:
+            return {}, {}
+        duales = {}
+        if self.A_ub.shape[0]:
+            duales.update(self.Separar(signo*self.Signos_ub*resultado.ineqlin.marginals, self.Restricciones_ub))
+        if self.A_eq.shape[0]:
+            duales.update(self.Separar(signo*resultado.eqlin.marginals, self.Restricciones_eq))
+        reducidos = self.Separar(signo*(resultado.lower.marginals + resultado.upper.marginals))
+        return duales, reducidos
+
+    def Cargar_Solucion(self, Solucion):
+        # Valores de la solucion en las variables del modelo Pyomo compilado (para usar el modelo como antes)
+        if self.Columnas is None:
+            raise ValueError('La forma matricial no se compilo desde un modelo Pyomo')
+        for var, valor in zip(self.Columnas, Solucion.Resultado.x):
+            var.set_value(valor, skip_validation=True)
+
+def Bloques(componentes):
+    # Lista de objetos Pyomo (VarData o ConstraintData) -> {nombre del componente: indices (n, k)}, en orden
+    nombres, indices = [], []
+    for objeto in componentes:
+        indice = objeto.index()
+        nombres.append(objeto.parent_component().local_name)
+        indices.append(indice if isinstance(indice, tuple) else (indice,))
+    separados = {}
+    for nombre, indice in zip(nombres, indices):
+        separados.setdefault(nombre, []).append(indice)
+    return {nombre: np.array(lista) for nombre, lista in separados.items()}
+
+def Compilar(modelo):
+    # Modelo Pyomo lineal (o lineal entero) ya construido -> Forma_Matricial, sin escribir archivos. Las columnas
+    # se agrupan por variable (orden de aparicion); si un componente quedara repartido se reordena
+    from pyomo.repn.plugins.standard_form import LinearStandardFormCompiler
+    inicio = time.perf_counter()
+    forma = LinearStandardFormCompiler().write(modelo, mixed_form=True, set_sense=None)
+    if len(forma.objectives) != 1:
+        raise ValueError(f'Se esperaba un objetivo activo, hay {len(forma.objectives)}')
+    Sentido = forma.objectives[0].sense
+
+    orden = {}
+    for var in forma.columns:
+        orden.setdefault(var.parent_component(), len(orden))
+    columnas = sorted(range(len(forma.columns)), key=lambda k: orden[forma.columns[k].parent_component()])
+    Columnas = [forma.columns[k] for k in columnas]
+    c = forma.c.toarray()[0][columnas]
+    A = sparse.csr_array(forma.A)[:, columnas]
+    rhs = np.asarray(forma.rhs, dtype=float)
+    tipos = np.array([tipo for _, tipo in forma.rows])
+    filas = [fila for fila, _ in forma.rows]
+
+    # Filas: 1 (<=), -1 (>=, se multiplica por -1) y 0 (=)
+    ub, eq = np.flatnonzero(tipos != 0), np.flatnonzero(tipos == 0)
+    Signos_ub = np.where(tipos[ub] == -1, -1.0, 1.0)
+    A_ub = sparse.diags_array(Signos_ub) @ A[ub] if len(ub) else None
+    b_ub = Signos_ub*rhs[ub]
+    cotas = np.array([(np.nan if v.lb is None else v.lb, np.nan if v.ub is None else v.ub) for v in Columnas],
+                     dtype=float).reshape(len(Columnas), 2)
+    Cotas = (np.nan_to_num(cotas[:, 0], nan=-np.inf), np.nan_to_num(cotas[:, 1], nan=np.inf))
+    Enteras = np.array([v.is_integer() or v.is_binary() for v in Columnas], dtype=bool)
+
+    Forma = Forma_Matricial(c, A_ub, b_ub, A[eq] if len(eq) else None, rhs[eq], Cotas, Enteras, Bloques(Columnas),
+                            Bloques(filas[k] for k in ub), Bloques(filas[k] for k in eq), Signos_ub, Sentido,
+                            float(forma.c_offset[0]), Columnas)
+    Forma.Tiempos['compilacion'] = time.perf_counter() - inicio
+    return Forma
@@ -0,0 +1,188 @@
+"""
+Instrumentacion de carga, construccion, solucion y exportacion de los modelos (reemplaza los print de
+debug_pyomo_model). Registra:
+  - fases con tiempo y memoria: Fase('carga_datos'), Construccion() alrededor de la construccion del modelo
+    (con el tiempo de cada componente Pyomo), Registrar_Solver() con escritura/solucion/carga del Solucionador
+  - conteos por componente: indices de Var/Param/Set, restricciones y no nulos (coeficientes de variables)
+y los escribe en JSON o CSV (agregando filas, para seguir la evolucion entre ejecuciones).
+Se activa con Instrumentacion(Activa=True) o la variable de entorno IO_INSTRUMENTAR; desactivada, Fase()
+devuelve un contexto vacio y el resto de los metodos no hace nada.
+La memoria es aproximada: maximo RSS del proceso y, con Memoria=True (o IO_INSTRUMENTAR=memoria),
+la memoria asignada por Python durante cada fase y componente (tracemalloc, que hace todo mas lento).
+"""
+
+import contextlib
+import datetime
+import json
+import logging
+import os
+import time
+import tracemalloc
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FASE_VACIA = contextlib.nullcontext()
+# Pyomo informa el tiempo de construccion de cada componente en este logger (ConstructionTimer)
+LOGGER_CONSTRUCCION = 'pyomo.common.timing.construction'
+
+def Memoria_Maxima():
+    # Maximo RSS del proceso en MB (ru_maxrss esta en KB en Linux)
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class _Registro_Construccion(logging.Handler):
+    # Recibe los ConstructionTimer de Pyomo: componente, tipo, indices, tiempo y memoria asignada desde el anterior
+    def __init__(self, instrumentacion, fase):
+        super().__init__(logging.INFO)
+        self.instrumentacion = instrumentacion
+        self.fase = fase
+        self.memoria = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+
+    def emit(self, record):
+        timer = record.msg
+        if not hasattr(timer, 'obj'):
+            return
+        componente = timer.obj
+        # Los conjuntos implicitos (dominios como Any) no pertenecen al modelo
+        if getattr(componente, 'parent_block', lambda: None)() is None:
+            return
+        try:
+            indices = len(componente)
+        except TypeError:
+            indices = None
+        fila = {'Fase': self.fase, 'Componente': timer.name, 'Tipo': getattr(componente.ctype, '__name__', ''),
+                'Indices': indices, 'Tiempo_s': timer.timer}
+        if self.memoria is not None:
+            actual = tracemalloc.get_traced_memory()[0]
+            fila['Memoria_MB'] = (actual - self.memoria) / 2**20
+            self.memoria = actual
+        self.instrumentacion.Construcciones.append(fila)
+
+class Instrumentacion:
+    def __init__(self, Activa=None, Memoria=None, Etiqueta=''):
+        entorno = os.environ.get('IO_INSTRUMENTAR', '')
+        self.Activa = bool(entorno) if Activa is None else Activa
+        self.Memoria = (entorno == 'memoria') if Memoria is None else Memoria
+        self.Etiqueta = Etiqueta
+        self.Fases = []
+        self.Construcciones = []
+        self.Componentes = []
+
+    def Fase(self, nombre):
+        if not self.Activa:
+            return FASE_VACIA
+        return self._Fase(nombre)
+
+    @contextlib.contextmanager
+    def _Fase(self, nombre):
+        iniciar_traza = self.Memoria and not tracemalloc.is_tracing()
+        if iniciar_traza:
+            tracemalloc.start()
+        if self.Memoria:
+            tracemalloc.reset_peak()
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            fila = {'Fase': nombre, 'Tiempo_s': time.perf_counter() - inicio, 'RSS_max_MB': Memoria_Maxima()}
+            if self.Memoria:
+                fila['Memoria_pico_MB'] = (tracemalloc.get_traced_memory()[1] - memoria_inicial) / 2**20
+                if iniciar_traza:
+                    tracemalloc.stop()
+            self.Fases.append(fila)
+
+    @contextlib.contextmanager
+    def Construccion(self, nombre='construccion'):
+        # Fase de construccion con el detalle por componente (los ConstructionTimer que Pyomo ya genera)
+        if not self.Activa:
+            yield
+            return
+        logger = logging.getLogger(LOGGER_CONSTRUCCION)
+        nivel, propagar = logger.level, logger.propagate
+        with self.Fase(nombre):
+            handler = _Registro_Construccion(self, nombre)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            try:
+                yield
+            finally:
+                logger.removeHandler(handler)
+                logger.setLevel(nivel)
+                logger.propagate = propagar
+
+    def Registrar_Solver(self, opt, nombre='solver'):
+        # Fases del ultimo solve del Solucionador (escritura, solucion, carga) y nodos de branch-and-bound
+        if not self.Activa:
+            return
+        for fase, tiempo in opt.Tiempos.items():
+            if fase != 'total':
+                self.Fases.append({'Fase': f'{nombre}.{fase}', 'Tiempo_s': tiempo, 'RSS_max_MB': Memoria_Maxima(),
+                                   'Backend': opt.Backend, 'Nodos': opt.Nodos})
+
+    def Contar_Componentes(self, modelo, No_Nulos=True):
+        # Indices por componente y, para las restricciones, no nulos (variables distintas en cada fila)
+        if not self.Activa:
+            return
+        from pyomo.environ import Var, Param, Set, Constraint, Objective, SOSConstraint
+        from pyomo.core.expr.visitor import identify_variables
+        for tipo in (Set, Param, Var, Constraint, SOSConstraint, Objective):
+            for componente in modelo.component_objects(tipo, active=True if tipo in (Constraint, Objective) else None):
+                fila = {'Componente': componente.name, 'Tipo': tipo.__name__, 'Indices': len(componente)}
+                if tipo is Var:
+                    fila['Fijas'] = sum(1 for var in componente.values() if var.fixed)
+                elif tipo is Constraint and No_Nulos:
+                    fila['No_Nulos'] = sum(sum(1 for _ in identify_variables(restriccion.body, include_fixed=False))
+                                           for restriccion in componente.values())
+                self.Componentes.append(fila)
+
+    def Tabla_Fases(self):
+        return pd.DataFrame(self.Fases)
+
+    def Tabla_Construcciones(self):
+        return pd.DataFrame(self.Construcciones)
+
+    def Tabla_Componentes(self):
+        return pd.DataFrame(self.Componentes)
+
+    def Resumen(self):
+        # Totales por tipo de componente (variables, restricciones, no nulos) y tiempo por fase
+        componentes = self.Tabla_Componentes()
+        resumen = {'Etiqueta': self.Etiqueta, 'Fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+                   'RSS_max_MB': Memoria_Maxima()}
+        if not componentes.empty:
+            for tipo, grupo in componentes.groupby('Tipo'):
+                resumen[f'N_{tipo}'] = int(grupo['Indices'].sum())
+            if 'No_Nulos' in componentes:
+                resumen['No_Nulos'] = int(componentes['No_Nulos'].sum())
+        for fila in self.Fases:
+            resumen[f"{fila['Fase']}_s"] = resumen.get(f"{fila['Fase']}_s", 0.0) + fila['Tiempo_s']
+        return resumen
+
+    def Escribir(self, FileName):
+        # .json: un documento con el resumen y todas las tablas; .csv: agrega una fila de resumen por ejecucion
+        # y escribe el detalle en <base>_fases.csv, <base>_construccion.csv y <base>_componentes.csv
+        if not self.Activa:
+            return
+        base, extension = os.path.splitext(FileName)
+        if extension == '.json':
+            documento = {'Resumen': self.Resumen(), 'Fases': self.Fases,
+                         'Construccion': self.Construcciones, 'Componentes': self.Componentes}
+            with open(FileName, 'w', encoding='utf-8') as archivo:
+                json.dump(documento, archivo, indent=2, default=str)
+        elif extension == '.csv':
+            resumen = pd.DataFrame([self.Resumen()])
+            if os.path.exists(FileName):
+                resumen = pd.concat([pd.read_csv(FileName), resumen], ignore_index=True)
+            resumen.to_csv(FileName, index=False)
+            for sufijo, tabla in (('fases', self.Tabla_Fases()), ('construccion', self.Tabla_Construcciones()),
+                                  ('componentes', self.Tabla_Componentes())):
+                tabla.to_csv(f'{base}_{sufijo}.csv', index=False)
+        else:
+            raise ValueError(f"Formato '{extension}' no soportado (use .json o .csv)")
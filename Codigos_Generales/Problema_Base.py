@@ -0,0 +1,105 @@
+"""
+Clase base de los problemas (ReadExcelFile -> Model -> Solver -> Print_Results) con instancias en cache.
+Cada subclase indica que datos definen la estructura del modelo (Datos_Estructura: conjuntos, tamaños,
+coeficientes fijos) y cuales son valores de Param mutables (Datos_Parametros: {nombre: arreglo}).
+Instancia() construye el modelo una vez por huella de la estructura; si despues solo cambian los valores
+(una nueva columna de precios, una fila de demanda) actualiza en el lugar los Param mutables que cambiaron
+en vez de reconstruir. Con un solver persistente (appsi_highs) el re-solve envia solo esos cambios.
+Tiempos separa construccion, actualizacion y solucion del ultimo Solver().
+Resolver_Matricial() salta Pyomo: arma la Forma_Matricial desde los datos (Matrices() de la subclase) o
+compilando el modelo, y la resuelve con linprog en el mismo proceso.
+"""
+
+import time
+from collections import OrderedDict
+from Carga_Datos import Huella_Datos, Indexar
+from Solucionador import Solucionador
+from Forma_Matricial import Compilar
+
+class Problema_Base:
+    Max_Instancias = 4  # Instancias guardadas (se descarta la usada hace mas tiempo)
+
+    def __init__(self, opt=None):
+        self.opt = opt or Solucionador()
+        self.Instancias = OrderedDict()  # huella de la estructura -> (modelo, huella de cada Param mutable)
+        self.Tiempos = {}
+        self.Reconstruida = None  # True si el ultimo Instancia() construyo el modelo
+        self.Actualizados = []  # Param mutables actualizados por el ultimo Instancia()
+
+    def Datos_Estructura(self):
+        # Objetos que, si cambian, obligan a reconstruir el modelo
+        raise NotImplementedError
+
+    def Datos_Parametros(self):
+        # {nombre del Param mutable: arreglo NumPy con indices desde 1 en cada eje (los de Indexar)}
+        return {}
+
+    def Construir_Instancia(self):
+        # Modelo construido con los Param de Datos_Parametros mutables
+        return self.Model(Mutable=True)
+
+    def Instancia(self):
+        inicio = time.perf_counter()
+        huella = Huella_Datos(type(self).__name__, self.Datos_Estructura())
+        parametros = self.Datos_Parametros()
+        huellas = {nombre: Huella_Datos(arreglo) for nombre, arreglo in parametros.items()}
+
+        if huella in self.Instancias:
+            modelo, anteriores = self.Instancias[huella]
+            self.Instancias.move_to_end(huella)
+            self.Actualizados = [nombre for nombre in huellas if huellas[nombre] != anteriores.get(nombre)]
+            for nombre in self.Actualizados:
+                getattr(modelo, nombre).store_values(Indexar(parametros[nombre]))
+            self.Reconstruida = False
+            self.Tiempos = {'construccion': 0.0, 'actualizacion': time.perf_counter() - inicio}
+        else:
+            modelo = self.Construir_Instancia()
+            if len(self.Instancias) >= self.Max_Instancias:
+                self.Instancias.popitem(last=False)
+            self.Actualizados = list(huellas)
+            self.Reconstruida = True
+            self.Tiempos = {'construccion': time.perf_counter() - inicio, 'actualizacion': 0.0}
+        self.Instancias[huella] = (modelo, huellas)
+        return modelo
+
+    def Resolver_Instancia(self, **opciones):
+        # Instancia (construida o actualizada) resuelta con self.opt; opciones van a Solucionador.Resolver.
+        # Una instancia reutilizada arranca desde la solucion anterior (la base en HiGHS)
+        modelo = self.Instancia()
+        opciones.setdefault('Warmstart', not self.Reconstruida)
+        results = self.opt.Resolver(modelo, **opciones)
+        self.Tiempos['solucion'] = self.opt.Tiempos['total']
+        return modelo, results
+
+    def Matrices(self):
+        # Forma_Matricial construida directamente desde los datos (sin Pyomo), si la subclase la define
+        raise NotImplementedError
+
+    def Resolver_Matricial(self, Directo=True, **opciones):
+        # Directo=True usa Matrices() (o compila el modelo si la subclase no la define); Directo=False compila
+        # siempre el modelo Pyomo. Devuelve (forma, Solucion_Matricial); opciones van a Forma_Matricial.Resolver
+        inicio = time.perf_counter()
+        try:
+            forma = self.Matrices() if Directo else None
+        except NotImplementedError:
+            forma = None
+        if forma is None:
+            forma = Compilar(self.Model())
+        self.Tiempos = {'construccion': time.perf_counter() - inicio}
+        Solucion = forma.Resolver(**opciones)
+        self.Tiempos['solucion'] = forma.Tiempos['solucion'] + forma.Tiempos.get('carga', 0.0)
+        return forma, Solucion
+
+    def Solver_Matricial(self, Directo=True, **opciones):
+        # Como Solver() pero por la forma matricial; la Solucion_Matricial se pasa a Print_Results en vez del modelo
+        _, Solucion = self.Resolver_Matricial(Directo, **opciones)
+        print('Estado: ' + str(Solucion.Mensaje))
+        print('Tiempos: ' + self.Reporte_Tiempos())
+        print('Valor Función Objetivo: ' + str(Solucion.Objetivo))
+        return Solucion
+
+    def Reporte_Tiempos(self):
+        return ', '.join(f'{fase}: {tiempo:.4f} s' for fase, tiempo in self.Tiempos.items())
+
+    def Limpiar_Instancias(self):
+        self.Instancias.clear()
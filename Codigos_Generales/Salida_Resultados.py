@@ -0,0 +1,146 @@
+"""
+Escritura de las tablas de resultados ({'Nombre_Hoja': DataFrame}) en el formato elegido por corrida:
+  - 'xlsx': libro escrito por bloques de filas directamente como XML dentro del zip (sin openpyxl ni una
+    celda-objeto por valor); las hojas de mas de MAX_FILAS_XLSX filas siguen en <Hoja>_2, <Hoja>_3, ...
+  - 'xlsx_openpyxl': pd.ExcelWriter (la escritura anterior, mas lenta y limitada a una hoja por tabla)
+  - 'csv', 'parquet' y 'feather': un archivo por hoja, <base>_<hoja>.<formato> (parquet/feather usan pyarrow)
+El formato por defecto se toma de la variable de entorno IO_FORMATO_SALIDA ('xlsx' si no esta definida).
+Cada hoja puede guardarse en forma dispersa (solo las filas con algun valor no nulo) con Dispersas o con
+IO_DISPERSAS ('*' para todas o nombres de hoja separados por comas).
+"""
+
+import math
+import os
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+import pandas as pd
+
+FORMATOS = ('xlsx', 'xlsx_openpyxl', 'csv', 'parquet', 'feather')
+EXTENSIONES = {'xlsx_openpyxl': 'xlsx'}
+MAX_FILAS_XLSX = 2**20 - 1  # Filas de datos por hoja de Excel (mas la del encabezado)
+BLOQUE = 50000  # Filas por bloque al escribir el XML de una hoja
+
+TIPO_HOJA = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+TIPO_LIBRO = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml'
+ESPACIO = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELACIONES = 'http://schemas.openxmlformats.org/package/2006/relationships'
+DOCUMENTO = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+ENCABEZADO_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+def Tabla_Dispersa(Table):
+    # Solo las filas con algun valor no nulo en las columnas de punto flotante (las de indices son enteras o texto)
+    valores = Table.select_dtypes('float')
+    if valores.empty:
+        return Table
+    return Table[(valores.fillna(0) != 0).any(axis=1)]
+
+def Hojas_Dispersas(tablas, Dispersas=None):
+    # Dispersas: True/'*' (todas), un iterable de nombres de hoja o None (variable de entorno IO_DISPERSAS)
+    if Dispersas is None:
+        Dispersas = os.environ.get('IO_DISPERSAS', '')
+        Dispersas = '*' if Dispersas == '*' else [hoja.strip() for hoja in Dispersas.split(',') if hoja.strip()]
+    if Dispersas is True or Dispersas == '*':
+        return set(tablas)
+    return set(Dispersas or ())
+
+def Celdas(columna):
+    # Celdas XML de una columna: numeros como <v>, texto como cadena en linea; NaN, infinitos y None quedan vacios
+    tipo = columna.dtype.kind
+    valores = columna.tolist()
+    if tipo == 'f':
+        return [f'<c><v>{v!r}</v></c>' if math.isfinite(v) else '<c/>' for v in valores]
+    if tipo in 'iu':
+        return [f'<c><v>{v}</v></c>' for v in valores]
+    if tipo == 'b':
+        return [f'<c t="b"><v>{int(v)}</v></c>' for v in valores]
+    return [Celda(v) for v in valores]
+
+def Celda(valor):
+    if valor is None or (isinstance(valor, float) and not math.isfinite(valor)):
+        return '<c/>'
+    if isinstance(valor, bool):
+        return f'<c t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, (int, float)):
+        return f'<c><v>{valor!r}</v></c>'
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(str(valor))}</t></is></c>'
+
+def Escribir_Hoja(archivo, Table, Bloque=BLOQUE):
+    # Encabezado y filas de Table en el XML de una hoja, un bloque de filas a la vez
+    archivo.write((ENCABEZADO_XML + f'<worksheet xmlns="{ESPACIO}"><sheetData><row r="1">' +
+                   ''.join(Celda(str(columna) or None) for columna in Table.columns) + '</row>').encode('utf-8'))
+    for inicio in range(0, len(Table), Bloque):
+        parte = Table.iloc[inicio:inicio + Bloque]
+        columnas = [Celdas(parte[columna]) for columna in parte.columns] if len(parte.columns) else [[]]*len(parte)
+        filas = (f'<row r="{r}">{"".join(celdas)}</row>' for r, celdas in zip(range(inicio + 2, inicio + 2 + len(parte)),
+                                                                              zip(*columnas)))
+        archivo.write(''.join(filas).encode('utf-8'))
+    archivo.write(b'</sheetData></worksheet>')
+
+def Escribir_Xlsx(tablas, FileName, index=False, Bloque=BLOQUE, Compresion=1):
+    # Libro .xlsx minimo (libro, hojas y relaciones, sin estilos) escrito por bloques dentro del zip.
+    # Compresion: nivel de deflate (1 es el mas rapido; el archivo queda algo mas grande que con openpyxl)
+    hojas = []
+    with zipfile.ZipFile(FileName, 'w', zipfile.ZIP_DEFLATED, compresslevel=Compresion) as libro:
+        for hoja, Table in tablas.items():
+            if index:
+                # Como pd.ExcelWriter: el indice es la primera columna, con su nombre o sin encabezado
+                Table = Table.reset_index().rename(columns={'index': ''} if Table.index.name is None else {})
+            for parte, inicio in enumerate(range(0, max(len(Table), 1), MAX_FILAS_XLSX)):
+                nombre = (hoja if parte == 0 else f'{hoja}_{parte + 1}')[:31]
+                hojas.append(nombre)
+                with libro.open(f'xl/worksheets/sheet{len(hojas)}.xml', 'w', force_zip64=True) as archivo:
+                    Escribir_Hoja(archivo, Table.iloc[inicio:inicio + MAX_FILAS_XLSX], Bloque)
+
+        numeros = range(1, len(hojas) + 1)
+        libro.writestr('[Content_Types].xml', ENCABEZADO_XML +
+                       '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                       '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                       '<Default Extension="xml" ContentType="application/xml"/>'
+                       f'<Override PartName="/xl/workbook.xml" ContentType="{TIPO_LIBRO}"/>' +
+                       ''.join(f'<Override PartName="/xl/worksheets/sheet{n}.xml" ContentType="{TIPO_HOJA}"/>' for n in numeros) +
+                       '</Types>')
+        libro.writestr('_rels/.rels', ENCABEZADO_XML + f'<Relationships xmlns="{RELACIONES}">'
+                       f'<Relationship Id="rId1" Type="{DOCUMENTO}/officeDocument" Target="xl/workbook.xml"/></Relationships>')
+        libro.writestr('xl/workbook.xml', ENCABEZADO_XML + f'<workbook xmlns="{ESPACIO}" xmlns:r="{DOCUMENTO}"><sheets>' +
+                       ''.join(f'<sheet name={quoteattr(nombre)} sheetId="{n}" r:id="rId{n}"/>' for n, nombre in zip(numeros, hojas)) +
+                       '</sheets></workbook>')
+        libro.writestr('xl/_rels/workbook.xml.rels', ENCABEZADO_XML + f'<Relationships xmlns="{RELACIONES}">' +
+                       ''.join(f'<Relationship Id="rId{n}" Type="{DOCUMENTO}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+                               for n in numeros) + '</Relationships>')
+    return [FileName]
+
+def Escribir_Xlsx_Openpyxl(tablas, FileName, index=False):
+    with pd.ExcelWriter(FileName) as writer:
+        for hoja, Table in tablas.items():
+            Table.to_excel(writer, sheet_name=hoja, index=index)
+    return [FileName]
+
+def Escribir_Archivo(Table, archivo, formato, index=False):
+    # Una hoja en un archivo csv, parquet o feather
+    if formato == 'csv':
+        Table.to_csv(archivo, index=index)
+    elif formato == 'parquet':
+        Table.to_parquet(archivo, index=index)
+    else:
+        # feather no guarda el indice: se agrega como columna o se descarta
+        (Table.reset_index() if index else Table.reset_index(drop=True)).to_feather(archivo)
+
+def Escribir_Resultados(tablas, FileName, formato=None, index=False, Dispersas=None):
+    # tablas: {'Nombre_Hoja': DataFrame}. En csv/parquet/feather se escribe un archivo por hoja:
+    # <base>_<hoja>.<formato>. Devuelve la lista de archivos escritos
+    formato = formato or os.environ.get('IO_FORMATO_SALIDA', 'xlsx')
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato '{formato}' no soportado, use uno de {FORMATOS}")
+    dispersas = Hojas_Dispersas(tablas, Dispersas)
+    tablas = {hoja: Tabla_Dispersa(Table) if hoja in dispersas else Table for hoja, Table in tablas.items()}
+    base = os.path.splitext(FileName)[0]
+    if formato == 'xlsx':
+        return Escribir_Xlsx(tablas, base + '.xlsx', index)
+    if formato == 'xlsx_openpyxl':
+        return Escribir_Xlsx_Openpyxl(tablas, base + '.xlsx', index)
+    archivos = []
+    for hoja, Table in tablas.items():
+        archivo = f'{base}_{hoja}.{EXTENSIONES.get(formato, formato)}'
+        Escribir_Archivo(Table, archivo, formato, index)
+        archivos.append(archivo)
+    return archivos
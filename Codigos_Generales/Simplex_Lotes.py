@@ -0,0 +1,172 @@
+"""
+Simplex denso por lotes: resuelve K problemas lineales pequeños del mismo tamaño a la vez
+    min c_k·x  sujeto a  A_ub_k·x <= b_ub_k,  A_eq_k·x = b_eq_k,  x >= 0      (k = 1..K)
+con un solo tableau (K, m+1, columnas) y pivoteos vectorizados en NumPy: en cada iteracion todos los problemas
+que siguen activos eligen su columna de entrada y su fila de salida y pivotean juntos. Esta pensado para
+decenas de miles de problemas de 2 a 20 variables (uno por cliente, como Problema_Dieta o Problema_Prestamo),
+donde el costo de llamar a linprog una vez por problema domina.
+Metodo de dos fases: las filas <= con lado derecho no negativo arrancan con su holgura en la base y el resto
+con una artificial. El estado de cada problema usa los codigos de linprog (0 optimo, 1 limite de iteraciones,
+2 infactible, 3 no acotado). Arreglos compartidos por todos los problemas pueden pasarse sin la dimension K.
+"""
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+MENSAJES = {0: 'Solucion optima', 1: 'Limite de iteraciones', 2: 'Problema infactible', 3: 'Problema no acotado'}
+
+def Pivotear(T, base, idx, filas, columnas):
+    # Pivoteo de los problemas idx en (filas[i], columnas[i]) (vectores del mismo largo que idx). Si pivotean
+    # todos se trabaja sobre T directamente (sin la copia del indexado avanzado)
+    todos = len(idx) == len(T)
+    sub = T if todos else T[idx]
+    rango = np.arange(len(idx))
+    fila = sub[rango, filas, :] / sub[rango, filas, columnas][:, None]
+    columna = sub[rango, :, columnas].copy()
+    columna[rango, filas] = 0
+    sub -= columna[:, :, None] * fila[:, None, :]
+    sub[rango, filas, :] = fila
+    if not todos:
+        T[idx] = sub
+    base[idx, filas] = columnas
+
+def Costos_Reducidos(T, base, costo):
+    # Fila objetivo del tableau para el vector de costos (K, columnas+1): costo - c_B·B^-1·A (la esquina queda en -z)
+    m = base.shape[1]
+    c_B = np.take_along_axis(costo, base, axis=1)
+    T[:, m, :] = costo - np.einsum('kr,krj->kj', c_B, T[:, :m, :])
+
+def Iterar(T, base, estado, nit, Permitidas, Max_Iter, Tol, Bland):
+    # Iteraciones simplex de los problemas con estado -1 (activos) hasta optimo, no acotado o limite de iteraciones.
+    # Permitidas marca las columnas que pueden entrar a la base (las artificiales no vuelven a entrar)
+    m = base.shape[1]
+    activo = estado == -1
+    while True:
+        idx = np.flatnonzero(activo & (nit < Max_Iter))
+        if len(idx) == 0:
+            break
+        costos = np.where(Permitidas, T[idx, m, :-1], np.inf)
+        if Bland:
+            # Regla de Bland: la primera columna con costo reducido negativo (evita ciclos en problemas degenerados)
+            columnas = np.argmax(costos < -Tol, axis=1)
+        else:
+            columnas = np.argmin(costos, axis=1)
+        optimo = costos[np.arange(len(idx)), columnas] >= -Tol
+        activo[idx[optimo]] = False
+        idx, columnas = idx[~optimo], columnas[~optimo]
+        if len(idx) == 0:
+            continue
+
+        # Prueba de la razon minima; sin elementos positivos en la columna el problema es no acotado
+        columna = T[idx, :m, columnas]
+        razon = np.full(columna.shape, np.inf)
+        np.divide(T[idx, :m, -1], columna, out=razon, where=columna > Tol)
+        if Bland:
+            # Empates en la razon minima: sale la fila cuya variable basica tiene el menor indice (la otra mitad de
+            # la regla de Bland; la fila mas baja no garantiza que no haya ciclos)
+            empates = razon <= razon.min(axis=1, keepdims=True) + Tol
+            filas = np.argmin(np.where(empates, base[idx], np.iinfo(base.dtype).max), axis=1)
+        else:
+            filas = np.argmin(razon, axis=1)
+        acotado = np.isfinite(razon[np.arange(len(idx)), filas])
+        estado[idx[~acotado]] = 3
+        activo[idx[~acotado]] = False
+        idx, filas, columnas = idx[acotado], filas[acotado], columnas[acotado]
+
+        Pivotear(T, base, idx, filas, columnas)
+        nit[idx] += 1
+    estado[activo] = 1
+    estado[estado == -1] = 0
+
+def Lote(arreglo, dimensiones, K):
+    # Agrega la dimension K a los arreglos compartidos por todos los problemas
+    arreglo = np.asarray(arreglo, dtype=float)
+    return np.broadcast_to(arreglo, (K,) + arreglo.shape[-dimensiones:]) if arreglo.ndim == dimensiones else arreglo
+
+def Simplex_Lotes(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, Max_Iter=1000, Tol=1e-9, Bland=False):
+    # c (K, n); A_ub (K, m_ub, n); b_ub (K, m_ub); A_eq (K, m_eq, n); b_eq (K, m_eq). Devuelve un OptimizeResult
+    # como el de linprog pero con un valor por problema: x (K, n), fun, status, nit y success (NaN si no hay optimo)
+    c = np.asarray(c, dtype=float)
+    K = max((np.shape(a)[0] for a, d in ((c, 1), (A_ub, 2), (b_ub, 1), (A_eq, 2), (b_eq, 1))
+             if a is not None and np.ndim(a) == d + 1), default=1)
+    c = Lote(c, 1, K)
+    n = c.shape[1]
+    A_ub = Lote(A_ub, 2, K) if A_ub is not None else np.zeros((K, 0, n))
+    b_ub = Lote(b_ub, 1, K) if b_ub is not None else np.zeros((K, 0))
+    A_eq = Lote(A_eq, 2, K) if A_eq is not None else np.zeros((K, 0, n))
+    b_eq = Lote(b_eq, 1, K) if b_eq is not None else np.zeros((K, 0))
+    m_ub, m_eq = A_ub.shape[1], A_eq.shape[1]
+    m = m_ub + m_eq
+
+    # Tableau: variables, holguras, artificiales y lado derecho; la ultima fila es la de costos reducidos
+    artificial = n + m_ub
+    N = artificial + m
+    T = np.zeros((K, m + 1, N + 1))
+    T[:, :m_ub, :n] = A_ub
+    T[:, :m_ub, n:artificial] = np.eye(m_ub)
+    T[:, m_ub:m, :n] = A_eq
+    T[:, :m, -1] = np.concatenate([b_ub, b_eq], axis=1)
+    # Filas con lado derecho negativo se multiplican por -1 (el lado derecho del tableau queda no negativo)
+    negativo = T[:, :m, -1] < 0
+    T[:, :m, :][negativo] *= -1
+    T[:, :m, artificial:N] = np.eye(m)
+
+    # Base inicial: la holgura si la fila es <= con lado derecho no negativo, si no la artificial
+    filas = np.arange(m)
+    con_holgura = (filas < m_ub) & ~negativo
+    base = np.where(con_holgura, n + filas, artificial + filas)
+    estado = np.full(K, -1)
+    nit = np.zeros(K, dtype=int)
+    Permitidas = np.arange(N) < artificial
+
+    # Fase 1: minimizar la suma de las artificiales en la base
+    costo = np.zeros((K, N + 1))
+    costo[:, artificial:N] = ~con_holgura
+    Costos_Reducidos(T, base, costo)
+    Iterar(T, base, estado, nit, Permitidas, Max_Iter, Tol, Bland)
+    escala = 1 + np.abs(T[:, :m, -1]).sum(axis=1)
+    infactible = (estado == 0) & (-T[:, m, -1] > 1e3*Tol*escala)
+    estado[infactible] = 2
+
+    # Artificiales que siguen en la base (en cero) salen por cualquier columna no artificial con coeficiente no nulo;
+    # si la fila no tiene ninguna es redundante y la artificial se queda en cero
+    for r in range(m):
+        fila = np.abs(T[:, r, :artificial])
+        salir = (estado == 0) & (base[:, r] >= artificial) & (fila.max(axis=1) > Tol)
+        idx = np.flatnonzero(salir)
+        Pivotear(T, base, idx, np.full(len(idx), r), np.argmax(fila[idx], axis=1))
+
+    # Fase 2: costos originales desde la base factible
+    seguir = estado == 0
+    estado[seguir] = -1
+    costo = np.zeros((K, N + 1))
+    costo[:, :n] = c
+    Costos_Reducidos(T, base, costo)
+    Iterar(T, base, estado, nit, Permitidas, Max_Iter, Tol, Bland)
+
+    x = np.zeros((K, N))
+    np.put_along_axis(x, base, T[:, :m, -1], axis=1)
+    x = x[:, :n]
+    x[estado != 0] = np.nan
+    fun = np.einsum('kj,kj->k', c, x)
+    return OptimizeResult(x=x, fun=fun, status=estado, nit=nit, success=estado == 0)
+
+def Validar(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, resultado=None, Tol=1e-6, **opciones):
+    # Compara estado y objetivo de cada problema contra linprog (HiGHS). Devuelve el numero de problemas y la
+    # lista de discrepancias (k, estado lotes, estado linprog, objetivo lotes, objetivo linprog)
+    from scipy.optimize import linprog
+    if resultado is None:
+        resultado = Simplex_Lotes(c, A_ub, b_ub, A_eq, b_eq, **opciones)
+    K = len(resultado.status)
+    c = Lote(c, 1, K)
+    arreglos = {nombre: Lote(a, d, K) for nombre, a, d in
+                (('A_ub', A_ub, 2), ('b_ub', b_ub, 1), ('A_eq', A_eq, 2), ('b_eq', b_eq, 1)) if a is not None}
+    Discrepancias = []
+    for k in range(K):
+        referencia = linprog(c[k], bounds=(0, None), method='highs', **{nombre: a[k] for nombre, a in arreglos.items()})
+        estado = resultado.status[k]
+        if estado != referencia.status:
+            Discrepancias.append((k, estado, referencia.status, resultado.fun[k], referencia.fun))
+        elif estado == 0 and abs(resultado.fun[k] - referencia.fun) > Tol*(1 + abs(referencia.fun)):
+            Discrepancias.append((k, estado, referencia.status, resultado.fun[k], referencia.fun))
+    return K, Discrepancias
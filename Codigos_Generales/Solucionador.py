@@ -0,0 +1,212 @@
+"""
+Capa comun de solvers para todas las clases de problemas. Reemplaza las llamadas
+SolverFactory('glpk', executable=...) con rutas fijas por un objeto configurable que:
+  - elige el backend por argumento o por la variable de entorno IO_SOLVER
+    ('glpk' por defecto; 'appsi_highs' es en memoria y persistente; 'cbc', 'gurobi', ... via SolverFactory)
+  - mantiene el modelo cargado en el solver persistente entre resoluciones (solo envia los cambios)
+  - acepta arranque en caliente (valores actuales de las variables como incumbente/base)
+  - registra tiempos por fase: escritura, solucion y carga
+  - con HiGHS registra cada incumbente (tiempo, objetivo, cota) en Incumbentes, p. ej. para el tiempo al primero,
+    y con Al_Incumbente lo carga en el modelo y avisa en cuanto se encuentra (modo anytime)
+La ruta de glpsol se toma de IO_GLPSOL, o de la ruta de anaconda del laboratorio si existe, o del PATH.
+El registro de incumbentes y el conteo de nodos de HiGHS usan atributos internos de appsi (probado con Pyomo
+6.10.1, PYOMO_PROBADO); si otra version no los tiene, se desactivan con un aviso y el solve sigue normalmente.
+"""
+
+import math
+import os
+import time
+from pyomo.environ import SolverFactory, Objective, Suffix, maximize
+from pyomo.opt import SolverResults, SolutionStatus, TerminationCondition
+
+RUTA_GLPSOL = r'/home/pc01/anaconda3/envs/io/bin/glpsol'
+PERSISTENTES = ('appsi_highs',)
+# Version de Pyomo con la que se probaron los atributos internos de appsi que usa Resolver_Persistente
+PYOMO_PROBADO = '6.10.1'
+# Estados de una solucion leida del archivo del solver que corresponden a un punto factible
+SOLUCIONES_FACTIBLES = (SolutionStatus.optimal, SolutionStatus.feasible, SolutionStatus.bestSoFar,
+                        SolutionStatus.globallyOptimal, SolutionStatus.locallyOptimal)
+
+# Nombre de las opciones de limite de tiempo y gap relativo en cada solver
+OPCIONES_LIMITE = {
+    'glpk': ('tmlim', 'mipgap'),
+    'cbc': ('seconds', 'ratioGap'),
+    'gurobi': ('TimeLimit', 'MIPGap'),
+    'cplex': ('timelimit', 'mipgap'),
+}
+
+class Solucionador:
+    def __init__(self, Backend=None, Ejecutable=None, Opciones=None, Tee=False):
+        self.Backend = Backend or os.environ.get('IO_SOLVER', 'glpk')
+        self.Ejecutable = Ejecutable
+        self.Opciones = dict(Opciones or {})
+        self.Tee = Tee
+        self.Tiempos = {}
+        self.Nodos = None  # Nodos de branch-and-bound del ultimo solve, si el solver lo informa
+        self.Incumbentes = []  # (tiempo_s, objetivo, cota) de cada incumbente del ultimo solve (solo HiGHS)
+        self.Al_Incumbente = None  # funcion(tiempo_s, objetivo, cota), con el incumbente ya cargado en el modelo
+        self.Errores_Incumbente = []
+        self.Con_Solucion = False  # True si el ultimo solve cargo una solucion factible en el modelo
+        self.Modelo_Cargado = None  # Modelo cargado en el solver persistente
+        self.Registro_Incumbentes = True  # False si esta version de appsi no permite suscribirse a los incumbentes
+        self.opt = self.Crear_Solver()
+
+    def Crear_Solver(self):
+        if self.Backend in PERSISTENTES:
+            from pyomo.contrib.appsi.solvers import Highs
+            opt = Highs()
+            if opt.available():
+                return opt
+            print(f"Solver '{self.Backend}' no disponible, se usa glpk")
+            self.Backend = 'glpk'
+        ejecutable = self.Ejecutable
+        if self.Backend == 'glpk' and ejecutable is None:
+            ejecutable = os.environ.get('IO_GLPSOL') or (RUTA_GLPSOL if os.path.exists(RUTA_GLPSOL) else None)
+        if ejecutable is not None:
+            return SolverFactory(self.Backend, executable=ejecutable)
+        return SolverFactory(self.Backend)
+
+    @property
+    def Persistente(self):
+        return self.Backend in PERSISTENTES
+
+    def Resolver(self, modelo, Warmstart=False, Tiempo_Limite=None, Gap=None):
+        # Devuelve un SolverResults (compatible con results.write()) y deja los tiempos en self.Tiempos
+        if self.Persistente:
+            results = self.Resolver_Persistente(modelo, Warmstart, Tiempo_Limite, Gap)
+        else:
+            results = self.Resolver_Archivo(modelo, Warmstart, Tiempo_Limite, Gap)
+        self.Tiempos['total'] = self.Tiempos['escritura'] + self.Tiempos['solucion'] + self.Tiempos['carga']
+        return results
+
+    def Resolver_Archivo(self, modelo, Warmstart, Tiempo_Limite, Gap):
+        # Solvers por archivo (glpk, cbc, ...): escribe el LP, lanza el proceso y lee la solucion
+        opciones = dict(self.Opciones)
+        nombre_tiempo, nombre_gap = OPCIONES_LIMITE.get(self.Backend, (None, None))
+        if Tiempo_Limite is not None and nombre_tiempo:
+            opciones[nombre_tiempo] = Tiempo_Limite
+        if Gap is not None and nombre_gap:
+            opciones[nombre_gap] = Gap
+        self.Incumbentes = []
+        argumentos = {'tee': self.Tee, 'load_solutions': False, 'options': opciones}
+        if Warmstart and self.opt.warm_start_capable():
+            argumentos['warmstart'] = True
+
+        inicio = time.perf_counter()
+        results = self.opt.solve(modelo, **argumentos)
+        total = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        self.Con_Solucion = len(results.solution) > 0 and results.solution(0).status in SOLUCIONES_FACTIBLES
+        if len(results.solution) > 0:
+            modelo.solutions.load_from(results)
+        carga = time.perf_counter() - inicio
+
+        # results.solver.time es el tiempo del proceso del solver; el resto es escritura/lectura de archivos
+        solucion = results.solver.time if isinstance(results.solver.time, float) else total
+        self.Tiempos = {'escritura': max(total - solucion, 0.0), 'solucion': solucion, 'carga': carga}
+        nodos = results.solver.statistics.branch_and_bound.number_of_created_subproblems
+        self.Nodos = nodos if isinstance(nodos, int) else None
+        return results
+
+    def Resolver_Persistente(self, modelo, Warmstart, Tiempo_Limite, Gap):
+        # Solver en memoria: la primera vez carga el modelo completo, despues solo actualiza los cambios
+        from pyomo.common.timing import HierarchicalTimer
+        from pyomo.contrib.appsi.base import legacy_solver_status_map, legacy_termination_condition_map
+
+        config = self.opt.config
+        config.stream_solver = self.Tee
+        config.load_solution = False
+        config.warmstart = Warmstart
+        config.time_limit = Tiempo_Limite
+        config.mip_gap = Gap
+        self.opt.highs_options.update(self.Opciones)
+
+        timer = HierarchicalTimer()
+        if modelo is not self.Modelo_Cargado:
+            # El modelo se carga antes de solve para suscribir el registro de incumbentes al objeto HiGHS
+            timer.start('set_instance')
+            self.opt.set_instance(modelo)
+            timer.stop('set_instance')
+            self.Modelo_Cargado = modelo
+            self.Suscribir_Incumbentes()
+        self.Incumbentes, self.Errores_Incumbente = [], []
+        res = self.opt.solve(modelo, timer=timer)
+        for error in self.Errores_Incumbente:
+            print('Error al procesar el incumbente a los ' + error)
+        fases = timer.get_timers()
+        escritura = sum(timer.get_total_time(f) for f in ('set_instance', 'update') if f in fases)
+        solucion = timer.get_total_time('optimize') if 'optimize' in fases else 0.0
+        nodos = getattr(getattr(self.opt, '_solver_model', None), 'getInfo', None)
+        self.Nodos = max(nodos().mip_node_count, 0) if nodos is not None else None
+
+        inicio = time.perf_counter()
+        self.Con_Solucion = res.best_feasible_objective is not None
+        if self.Con_Solucion:
+            res.solution_loader.load_vars()
+            sufijo_dual = modelo.component('dual')
+            if isinstance(sufijo_dual, Suffix) and sufijo_dual.import_enabled():
+                sufijo_dual.update(res.solution_loader.get_duals())
+            sufijo_rc = modelo.component('rc')
+            if isinstance(sufijo_rc, Suffix) and sufijo_rc.import_enabled():
+                sufijo_rc.update(res.solution_loader.get_reduced_costs())
+        carga = time.perf_counter() - inicio
+        self.Tiempos = {'escritura': escritura, 'solucion': solucion, 'carga': carga}
+
+        results = SolverResults()
+        results.solver.name = self.Backend
+        results.solver.status = legacy_solver_status_map[res.termination_condition]
+        results.solver.termination_condition = legacy_termination_condition_map[res.termination_condition]
+        results.solver.time = solucion
+        cotas = (res.best_objective_bound, res.best_feasible_objective)
+        results.problem.sense = self.Sentido(modelo)
+        if results.problem.sense == maximize:
+            results.problem.upper_bound, results.problem.lower_bound = cotas
+        else:
+            results.problem.lower_bound, results.problem.upper_bound = cotas
+        return results
+
+    def Suscribir_Incumbentes(self):
+        # Callback de incumbentes del objeto highspy y mapas de variables de appsi: son internos, se revisan antes
+        highs = getattr(self.opt, '_solver_model', None)
+        self.Registro_Incumbentes = (hasattr(highs, 'cbMipImprovingSolution') and
+                                     hasattr(self.opt, '_pyomo_var_to_solver_var_map') and hasattr(self.opt, '_vars'))
+        if self.Registro_Incumbentes:
+            highs.cbMipImprovingSolution.subscribe(self.Registrar_Incumbente)
+        else:
+            print(f'Registro de incumbentes desactivado: esta version de Pyomo no expone el callback de HiGHS '
+                  f'(probado con Pyomo {PYOMO_PROBADO}); Incumbentes queda vacio y Al_Incumbente no se llama')
+
+    def Registrar_Incumbente(self, evento):
+        datos = evento.data_out
+        self.Incumbentes.append((datos.running_time, datos.objective_function_value, datos.mip_dual_bound))
+        if self.Al_Incumbente is not None:
+            # Un error al usar el incumbente (p. ej. al escribirlo) no debe detener la busqueda. Durante el
+            # solve appsi captura la salida, por eso los errores se informan al terminar
+            try:
+                self.Cargar_Incumbente(datos.mip_solution)
+                self.Al_Incumbente(datos.running_time, datos.objective_function_value, datos.mip_dual_bound)
+            except Exception as error:
+                self.Errores_Incumbente.append(f'{datos.running_time:.2f} s: {error!r}')
+
+    def Cargar_Incumbente(self, solucion):
+        # Valores del incumbente del callback (arreglo en el orden de columnas de HiGHS) en las variables Pyomo
+        for var_id, columna in self.opt._pyomo_var_to_solver_var_map.items():
+            self.opt._vars[var_id][0].set_value(solucion[columna], skip_validation=True)
+
+    def Sentido(self, modelo):
+        for objetivo in modelo.component_data_objects(Objective, active=True):
+            return objetivo.sense
+        return None
+
+    def Reporte(self):
+        return ', '.join(f'{fase}: {tiempo:.4f} s' for fase, tiempo in self.Tiempos.items())
+
+def Es_Optimo(results):
+    return results.solver.termination_condition == TerminationCondition.optimal
+
+def Gap_Relativo(objetivo, cota):
+    # |objetivo - cota| / |objetivo|; nan si falta el incumbente o la cota
+    if objetivo is None or cota is None or not math.isfinite(objetivo) or not math.isfinite(cota):
+        return math.nan
+    return abs(objetivo - cota) / max(abs(objetivo), 1e-9)
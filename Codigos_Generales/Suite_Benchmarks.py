@@ -0,0 +1,259 @@
+"""
+Suite de benchmarks de escalamiento de los modelos del proyecto (GreenPharma, EnergyExchangeModel,
+Scheduling_Problem y Problema_Parking_Electrico). Para cada modelo y tamaño:
+  - genera una instancia sintetica factible con el Generador_Instancias de su carpeta y la escribe en un libro
+    con las mismas hojas que el Excel del laboratorio
+  - mide por separado carga del libro (sin cache), construccion, solucion y exportacion de resultados, con el
+    maximo RSS al final de cada fase y, con --memoria, el pico de memoria de Python de cada fase (tracemalloc)
+Cada caso corre en su propio proceso (memoria maxima sin arrastre de los casos anteriores y sin choques entre los
+Generador_Instancias de cada carpeta) y con un tiempo limite por caso.
+Los resultados se agregan a un archivo .csv o .json (una fila por caso y fase, con la fecha de la ejecucion, la
+version del codigo, Python, Pyomo y el solver) y Comparar() marca las regresiones contra la ejecucion anterior
+o contra otro archivo.
+"""
+
+import argparse
+import datetime
+import multiprocessing
+import os
+import platform
+import queue
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CARPETAS = {'GreenPharma': 'Problema_Decimas', 'Energia': 'Problema_Control',
+            'Scheduling': 'Problema_05_05', 'Parking': 'Problema_05_05'}
+FASES = ('carga', 'construccion', 'solucion', 'exportacion')
+
+# Tamaños crecientes por modelo: (fabricas, centros, periodos), (nodos,), (camiones, zonas), (vehiculos,)
+TAMANOS = {
+    'GreenPharma': [(10, 12, 24), (50, 200, 24), (100, 500, 52)],
+    'Energia': [(5,), (100,), (1000,)],
+    'Scheduling': [(2, 6), (10, 40), (20, 100)],
+    'Parking': [(10,), (1000,), (10000,)],
+}
+
+def Caso_GreenPharma(tamano, Inst, Tiempo_Limite):
+    from Problema_GreenPharma import Problema_GreenPharma
+    from Generador_Instancias import Generar_Instancia, Escribir_Instancia
+    Escribir_Instancia(Generar_Instancia(*tamano), 'Data_Input.xlsx')
+    problema = Problema_GreenPharma()
+    with Inst.Fase('carga'):
+        problema.ReadExcelFile('Data_Input.xlsx', Cache=False)
+    with Inst.Fase('construccion'):
+        modelo = problema.Model()
+    with Inst.Fase('solucion'):
+        results = problema.opt.Resolver(modelo, Tiempo_Limite=Tiempo_Limite)
+    Inst.Registrar_Solver(problema.opt)
+    with Inst.Fase('exportacion'):
+        problema.Print_Results(modelo)
+    return modelo, results
+
+def Caso_Energia(tamano, Inst, Tiempo_Limite):
+    from Benchmark_Energia import EnergyExchangeModel
+    from Generador_Instancias import Generar_Alimentador, Escribir_Instancia
+    Escribir_Instancia(Generar_Alimentador(*tamano), 'Data_Input.xlsx')
+    problema = EnergyExchangeModel()
+    problema.opt.Tee = False
+    problema.Tiempo_Limite = Tiempo_Limite
+    with Inst.Fase('carga'):
+        problema.ReadExcelFile('Data_Input.xlsx', Cache=False)
+    with Inst.Fase('construccion'):
+        modelo = problema.BuildModel()
+    with Inst.Fase('solucion'):
+        results = problema.SolveModel()
+    Inst.Registrar_Solver(problema.opt)
+    with Inst.Fase('exportacion'):
+        problema.ExportResults()
+    return modelo, results
+
+def Caso_Scheduling(tamano, Inst, Tiempo_Limite):
+    from Scheduling_Model_V1 import Scheduling_Problem
+    from Generador_Instancias import Generar_Scheduling, Escribir_Scheduling
+    Escribir_Scheduling(Generar_Scheduling(*tamano), 'Data_Input_SM.xlsx')
+    problema = Scheduling_Problem()
+    with Inst.Fase('carga'):
+        problema.ReadExcelFile('Data_Input_SM.xlsx')
+    with Inst.Fase('construccion'):
+        modelo = problema.model()
+    with Inst.Fase('solucion'):
+        results = problema.opt.Resolver(modelo, Tiempo_Limite=Tiempo_Limite)
+    Inst.Registrar_Solver(problema.opt)
+    with Inst.Fase('exportacion'):
+        problema.Print_Results(modelo, Solo_No_Nulos=True)
+    return modelo, results
+
+def Caso_Parking(tamano, Inst, Tiempo_Limite):
+    from Modelo_Parking_Electrico_V1 import Problema_Parking_Electrico
+    from Benchmark_Parking import Perfiles
+    from Generador_Instancias import Generar_Parking, Escribir_Parking
+    Parameters = Perfiles(os.path.join(DIRECTORIO, 'Problema_05_05', 'Data_Input_VE.xlsx'))
+    Escribir_Parking(Generar_Parking(*tamano, Horas=len(Parameters)), Parameters, 'Data_Input_VE.xlsx')
+    problema = Problema_Parking_Electrico()
+    # El sitio escala con la flota, como en Benchmark_Parking
+    escala = max(tamano[0] / 3, 1)
+    problema.Cap_Panel, problema.Cap_Bat, problema.PCB = 200*escala, 200*escala, 50*escala
+    problema.SOC_BT_Inicial = problema.Cap_Bat*problema.SOC_Min
+    with Inst.Fase('carga'):
+        problema.ReadExcelFile('Data_Input_VE.xlsx', Hojas_Flota=True, Cache=False)
+    with Inst.Fase('construccion'):
+        modelo = problema.Model()
+    with Inst.Fase('solucion'):
+        results = problema.opt.Resolver(modelo, Tiempo_Limite=Tiempo_Limite)
+    Inst.Registrar_Solver(problema.opt)
+    with Inst.Fase('exportacion'):
+        problema.Print_Results(modelo)
+    return modelo, results
+
+CASOS = {'GreenPharma': Caso_GreenPharma, 'Energia': Caso_Energia, 'Scheduling': Caso_Scheduling,
+         'Parking': Caso_Parking}
+
+def Ejecutar_Caso(cola, nombre, tamano, Tiempo_Limite, Memoria):
+    # Proceso hijo: corre el caso en un directorio temporal y devuelve (filas por fase, resumen) por la cola
+    sys.path[:0] = [os.path.join(DIRECTORIO, CARPETAS[nombre]), os.path.join(DIRECTORIO, 'Codigos_Generales')]
+    from pyomo.environ import Objective, value
+    from Instrumentacion import Instrumentacion
+    Inst = Instrumentacion(Activa=True, Memoria=Memoria, Etiqueta=nombre)
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            # Se sale del directorio temporal antes de borrarlo, tambien si el caso falla (en Windows no se
+            # puede borrar el directorio de trabajo actual)
+            os.chdir(directorio)
+            try:
+                modelo, results = CASOS[nombre](tamano, Inst, Tiempo_Limite)
+                objetivo = next(modelo.component_data_objects(Objective, active=True))
+                resumen = {'Estado': str(results.solver.termination_condition), 'Objetivo': value(objetivo, exception=False),
+                           'Variables': modelo.nvariables(), 'Restricciones': modelo.nconstraints()}
+            finally:
+                os.chdir(DIRECTORIO)
+        cola.put((Inst.Fases, resumen))
+    except Exception as error:
+        cola.put((Inst.Fases, {'Estado': f'error: {error!r}'}))
+
+def Esperar_Caso(cola, proceso, Limite_Caso=None, Intervalo=1.0):
+    # Resultado del proceso del caso. Se revisa tambien si el hijo termino sin entregarlo (p. ej. eliminado por
+    # falta de memoria, sin excepcion de Python): el estado queda con su exitcode en vez de esperar para siempre
+    limite = None if Limite_Caso is None else time.perf_counter() + Limite_Caso
+    while True:
+        try:
+            return cola.get(timeout=Intervalo)
+        except queue.Empty:
+            pass
+        if not proceso.is_alive():
+            # El hijo pudo entregar el resultado justo antes de terminar
+            try:
+                return cola.get(timeout=Intervalo)
+            except queue.Empty:
+                return [], {'Estado': f'exitcode {proceso.exitcode}'}
+        if limite is not None and time.perf_counter() > limite:
+            proceso.terminate()
+            return [], {'Estado': 'limite_caso'}
+
+def Version():
+    # Commit actual del repositorio (con '+' si hay cambios sin confirmar), o None fuera de git
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=DIRECTORIO, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        cambios = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=DIRECTORIO,
+                                 capture_output=True, text=True).stdout.strip()
+        return commit + ('+' if cambios else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def Medir(Modelos=tuple(CASOS), Max_Tamanos=None, Tiempo_Limite=600, Memoria=False, Limite_Caso=None):
+    # Una fila por (modelo, tamaño, fase). Limite_Caso (s) termina el proceso del caso si se excede
+    import pyomo
+    contexto = multiprocessing.get_context('spawn')
+    entorno = {'Ejecucion': datetime.datetime.now().isoformat(timespec='seconds'), 'Version': Version(),
+               'Python': platform.python_version(), 'Pyomo': pyomo.__version__,
+               'Solver': os.environ.get('IO_SOLVER', 'glpk'), 'Maquina': platform.node()}
+    Filas = []
+    for nombre in Modelos:
+        for tamano in TAMANOS[nombre][:Max_Tamanos]:
+            cola = contexto.Queue()
+            proceso = contexto.Process(target=Ejecutar_Caso, args=(cola, nombre, tamano, Tiempo_Limite, Memoria))
+            inicio = time.perf_counter()
+            proceso.start()
+            fases, resumen = Esperar_Caso(cola, proceso, Limite_Caso)
+            proceso.join()
+            caso = {**entorno, 'Modelo': nombre, 'Tamano': 'x'.join(map(str, tamano)), **resumen,
+                    'Total_s': time.perf_counter() - inicio}
+            for fase in fases:
+                Filas.append({**caso, **fase})
+            if not fases:
+                Filas.append(caso)
+            print({clave: caso[clave] for clave in ('Modelo', 'Tamano', 'Estado', 'Total_s') if clave in caso},
+                  {fase['Fase']: round(fase['Tiempo_s'], 3) for fase in fases if fase['Fase'] in FASES})
+    return pd.DataFrame(Filas)
+
+def Leer(FileName):
+    if not os.path.exists(FileName):
+        return pd.DataFrame()
+    # Tamano como texto ('10' y '10x12x24' deben compararse igual entre archivos)
+    if FileName.endswith('.json'):
+        return pd.read_json(FileName, orient='records', dtype={'Tamano': str})
+    return pd.read_csv(FileName, dtype={'Tamano': str})
+
+def Escribir(Tabla, FileName):
+    # Agrega las filas de esta ejecucion al archivo (.csv o .json) para seguir la evolucion entre versiones
+    Tabla = pd.concat([Leer(FileName), Tabla], ignore_index=True)
+    if FileName.endswith('.json'):
+        Tabla.to_json(FileName, orient='records', indent=1)
+    elif FileName.endswith('.csv'):
+        Tabla.to_csv(FileName, index=False)
+    else:
+        raise ValueError(f"Formato de '{FileName}' no soportado (use .csv o .json)")
+
+def Comparar(Tabla, Base=None, Umbral=1.25, Minimo_s=0.05, Tolerancia=1e-6):
+    # Ultima ejecucion de Tabla contra Base (por defecto la ejecucion anterior de Tabla), por modelo, tamaño y
+    # fase. Es regresion un tiempo o RSS mayor que Umbral veces el anterior (ignorando fases de menos de
+    # Minimo_s) o un objetivo o estado distinto
+    ejecuciones = sorted(Tabla['Ejecucion'].unique())
+    actual = Tabla[Tabla['Ejecucion'] == ejecuciones[-1]]
+    if Base is None:
+        if len(ejecuciones) < 2:
+            return pd.DataFrame()
+        Base = Tabla[Tabla['Ejecucion'] == ejecuciones[-2]]
+    else:
+        Base = Base[Base['Ejecucion'] == Base['Ejecucion'].max()]
+    claves = ['Modelo', 'Tamano', 'Fase']
+    columnas = claves + ['Version', 'Estado', 'Objetivo', 'Tiempo_s', 'RSS_max_MB']
+    Union = actual[columnas].merge(Base[columnas], on=claves, suffixes=('', '_base'))
+    Union['Razon_Tiempo'] = Union['Tiempo_s'] / Union['Tiempo_s_base']
+    Union['Razon_RSS'] = Union['RSS_max_MB'] / Union['RSS_max_MB_base']
+    lento = (Union['Razon_Tiempo'] > Umbral) & (Union['Tiempo_s'] > Minimo_s)
+    memoria = Union['Razon_RSS'] > Umbral
+    objetivo = (Union['Objetivo'] - Union['Objetivo_base']).abs() > Tolerancia*(1 + Union['Objetivo_base'].abs())
+    estado = Union['Estado'] != Union['Estado_base']
+    Union['Regresion'] = [', '.join(nombre for nombre, marca in (('tiempo', l), ('memoria', m), ('objetivo', o),
+                                                                 ('estado', e)) if marca)
+                          for l, m, o, e in zip(lento, memoria, objetivo, estado)]
+    return Union[Union['Regresion'] != '']
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks de escalamiento (carga, construccion, solucion, exportacion)')
+    parser.add_argument('--modelos', nargs='+', default=list(CASOS), choices=list(CASOS))
+    parser.add_argument('--max', type=int, help='Numero de tamaños por modelo (por defecto todos)')
+    parser.add_argument('--tiempo', type=float, default=600, help='Tiempo limite del solver por caso (s)')
+    parser.add_argument('--limite-caso', type=float, help='Tiempo maximo de cada caso completo (s)')
+    parser.add_argument('--memoria', action='store_true', help='Pico de memoria de Python por fase (tracemalloc, mas lento)')
+    parser.add_argument('--archivo', default='Resultados_Benchmarks.csv', help='Archivo .csv o .json de resultados')
+    parser.add_argument('--comparar', nargs='?', const='', help='Marcar regresiones contra la ejecucion anterior '
+                        'del archivo o contra otro archivo de resultados; termina con codigo 1 si las hay')
+    parser.add_argument('--umbral', type=float, default=1.25)
+    args = parser.parse_args()
+
+    Tabla = Medir(args.modelos, args.max, args.tiempo, args.memoria, args.limite_caso)
+    Escribir(Tabla, args.archivo)
+    print(Tabla[Tabla['Fase'].isin(FASES)].pivot_table(index=['Modelo', 'Tamano'], columns='Fase', values='Tiempo_s',
+                                                      sort=False)[list(FASES)].round(3).to_string())
+    if args.comparar is not None:
+        Regresiones = Comparar(Leer(args.archivo), Leer(args.comparar) if args.comparar else None, args.umbral)
+        if len(Regresiones):
+            print('Regresiones:\n' + Regresiones.to_string(index=False))
+            sys.exit(1)
+        print('Sin regresiones')
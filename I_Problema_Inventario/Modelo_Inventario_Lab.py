@@ -1,10 +1,17 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 from pyomo.environ import * 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Tabla_Columnas, Escribir_Resultados
+from Solucionador import Solucionador
+
 class Problema_Inventario:
     def __init__(self, name=None):
         self.Data = []
+        self.opt = Solucionador()
 
     def ReadExcelFile(self, FileName):
         self.Data = pd.read_excel(FileName, sheet_name='Data')
@@ -43,27 +50,20 @@ class Problema_Inventario:
 
         Modelo_Inventario = self.Model()
         Modelo_Inventario.pprint()
-        self.opt = SolverFactory("glpk")
-        results = self.opt.solve(Modelo_Inventario)
+        results = self.opt.Resolver(Modelo_Inventario)
         results.write()
+        print('Tiempos: ' + self.opt.Reporte())
 
         print('Valor Función Objetivo: ' + str(value(Modelo_Inventario.FunObj)))
 
         return Modelo_Inventario
 
-    def Print_Results(self,Modelo_Inventario):
-
-        Table = pd.DataFrame()
+    def Print_Results(self,Modelo_Inventario, Formato=None):
 
-        r=0
-        for i in Modelo_Inventario.A:
-            Table.loc[r,'Mes'] = str(i)
-            Table.loc[r,'Prod Fabricados'] = round(Modelo_Inventario.x[i].value,4)
-            Table.loc[r,'Prod Almacenados'] = round(Modelo_Inventario.y[i].value,4)
-            r += 1
+        Table = Tabla_Columnas({'Prod Fabricados': Modelo_Inventario.x, 'Prod Almacenados': Modelo_Inventario.y}, 'Mes')
+        Table['Mes'] = Table['Mes'].astype(str)
 
-        with pd.ExcelWriter('Resultados.xlsx') as data: 
-            Table.to_excel(data, sheet_name="Resultados")
+        Escribir_Resultados({'Resultados': Table}, 'Resultados.xlsx', Formato, index=True)
 
 if __name__ == "__main__":
     runing = Problema_Inventario()
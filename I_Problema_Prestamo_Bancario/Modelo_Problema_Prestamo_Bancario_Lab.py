@@ -1,16 +1,31 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 from pyomo.environ import * 
 
-class Problema_Prestamo:
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Tabla_Columnas, Escribir_Resultados
+from Problema_Base import Problema_Base
+from Forma_Matricial import Forma_Matricial
+
+class Problema_Prestamo(Problema_Base):
+    # Limites de la cartera, compartidos por Model y Matrices
+    Fondos = 12
+    Fraccion_Minima_4 = 0.4  # Fraccion minima de la cartera en los prestamos 4 en adelante
+    Fraccion_Minima_3 = 0.5  # Fraccion minima del prestamo 3 entre los tres primeros
+    Deuda_Maxima = 0.04
+
     def __init__(self, name=None):
+        super().__init__()
         self.Data = []
 
     def ReadExcelFile(self, FileName):
         self.Data = pd.read_excel(FileName, sheet_name='Data')
         self.Nprestamos = len(self.Data)
 
-    def Model (self):
+    def Model (self, Mutable=False):
+        # Mutable=True deja T y D como parametros mutables (Instancia los actualiza sin reconstruir)
         model = AbstractModel(name='Model')
 
         ## SETS ##
@@ -19,11 +34,11 @@ class Problema_Prestamo:
         ## PARAMETERS ##
         def T_init(model,i):
             return self.Data['Tasa'].loc[i-1]
-        model.T = Param(model.A, rule=T_init)
+        model.T = Param(model.A, rule=T_init, mutable=Mutable)
 
         def D_init(model,i):
             return self.Data['Deuda'].loc[i-1]
-        model.D = Param(model.A, rule=D_init)
+        model.D = Param(model.A, rule=D_init, mutable=Mutable)
 
         ## VARIABLES ##
         model.x = Var(model.A, within = NonNegativeReals, initialize = 0)
@@ -35,47 +50,60 @@ class Problema_Prestamo:
 
         # ## CONSTRAINTS ##
         def Restriccion_1 (model):
-            return sum(model.x[i] for i in model.A) <= 12
+            return sum(model.x[i] for i in model.A) <= self.Fondos
         model.restriccion_1 = Constraint(rule=Restriccion_1)
 
         def Restriccion_2(model):
-            return sum(model.x[i] for i in model.A if i >= 4) >= 0.4 * sum(model.x[i] for i in model.A)
+            return sum(model.x[i] for i in model.A if i >= 4) >= self.Fraccion_Minima_4 * sum(model.x[i] for i in model.A)
         model.restriccion_2 = Constraint(rule=Restriccion_2)
 
         def Restriccion_3(model):
-            return model.x[3] >= 0.5 * sum(model.x[i] for i in model.A if i <= 3)
+            return model.x[3] >= self.Fraccion_Minima_3 * sum(model.x[i] for i in model.A if i <= 3)
         model.restriccion_3 = Constraint(rule=Restriccion_3)
 
         def Restriccion_4(model):
-            return sum(model.x[i] * model.D[i] for i in model.A) <= 0.04 * sum(model.x[i] for i in model.A)
+            return sum(model.x[i] * model.D[i] for i in model.A) <= self.Deuda_Maxima * sum(model.x[i] for i in model.A)
         model.restriccion_4 = Constraint(rule=Restriccion_4)
 
         return model.create_instance()
+
+    def Datos_Estructura(self):
+        return self.Nprestamos
+
+    def Datos_Parametros(self):
+        return {'T': self.Data['Tasa'].to_numpy(dtype=float), 'D': self.Data['Deuda'].to_numpy(dtype=float)}
+
+    def Matrices(self):
+        # Mismo modelo en forma matricial, armado desde las columnas del Excel (sin Pyomo), con los nombres y la
+        # orientacion de las filas que da Compilar (los duales coinciden con los del modelo Pyomo): las
+        # restricciones 2 y 3 tienen variables a ambos lados y Pyomo las guarda como derecha - izquierda <= 0
+        n = self.Nprestamos
+        T, D = self.Data['Tasa'].to_numpy(dtype=float), self.Data['Deuda'].to_numpy(dtype=float)
+        tipo = np.arange(1, n+1)
+        A_ub = np.vstack([np.ones(n), self.Fraccion_Minima_4 - (tipo >= 4),
+                          self.Fraccion_Minima_3*(tipo <= 3) - (tipo == 3), D - self.Deuda_Maxima])
+        return Forma_Matricial(T*(1-D), A_ub, [self.Fondos, 0, 0, 0], Variables={'x': tipo.reshape(n, 1)},
+                               Restricciones_ub={f'restriccion_{k}': np.array([[None]]) for k in range(1, 5)},
+                               Sentido=maximize)
     
     def Solver(self):
 
-        Modelo_Prestamo = self.Model()
+        # Se reutiliza la instancia si solo cambiaron tasas o deudas
+        Modelo_Prestamo, results = self.Resolver_Instancia()
         Modelo_Prestamo.pprint()
-        self.opt = SolverFactory('glpk')
-        results = self.opt.solve(Modelo_Prestamo)
         results.write()
+        print('Tiempos: ' + self.Reporte_Tiempos())
 
         print('Valor Función Objetivo: ' + str(value(Modelo_Prestamo.FunObj)))
 
         return Modelo_Prestamo
 
-    def Print_Results(self,Modelo_Prestamo):
-
-        Table = pd.DataFrame()
+    def Print_Results(self,Modelo_Prestamo, Formato=None):
 
-        r=0
-        for i in Modelo_Prestamo.A:
-            Table.loc[r,'Tipo Préstamo'] = str(i)
-            Table.loc[r,'Valor del préstamo'] = round(Modelo_Prestamo.x[i].value,4)
-            r += 1
+        Table = Tabla_Columnas({'Valor del préstamo': Modelo_Prestamo.x}, 'Tipo Préstamo')
+        Table['Tipo Préstamo'] = Table['Tipo Préstamo'].astype(str)
 
-        with pd.ExcelWriter('Resultados.xlsx') as data: 
-            Table.to_excel(data, sheet_name="Resultados")
+        Escribir_Resultados({'Resultados': Table}, 'Resultados.xlsx', Formato, index=True)
 
 if __name__ == "__main__":
     runing = Problema_Prestamo()
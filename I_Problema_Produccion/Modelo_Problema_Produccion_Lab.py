@@ -1,10 +1,17 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 from pyomo.environ import * 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Tabla_Columnas, Escribir_Resultados
+from Solucionador import Solucionador
+
 class Problema_Produccion:
     def __init__(self, name=None):
         self.Data = []
+        self.opt = Solucionador()
 
     def ReadExcelFile(self, FileName):
         self.Data = pd.read_excel(FileName, sheet_name='Data')
@@ -41,27 +48,20 @@ class Problema_Produccion:
 
         Modelo_Prod = self.Model()
         Modelo_Prod.pprint()
-        self.opt = SolverFactory("glpk")
-        results = self.opt.solve(Modelo_Prod)
+        results = self.opt.Resolver(Modelo_Prod)
         results.write()
+        print('Tiempos: ' + self.opt.Reporte())
 
         print('Valor Función Objetivo: ' + str(value(Modelo_Prod.FunObj)))
 
         return Modelo_Prod
 
-    def Print_Results(self,Modelo_Prod):
-
-        Table = pd.DataFrame()
+    def Print_Results(self,Modelo_Prod, Formato=None):
 
-        r=0
-        for i in Modelo_Prod.A:
-            Table.loc[r,'Tipo Producto'] = str(i)
-            Table.loc[r,'Prod Fabricados'] = round(Modelo_Prod.x[i].value,4)
-            Table.loc[r,'Prod NO Fabricados'] = round(Modelo_Prod.y[i].value,4)
-            r += 1
+        Table = Tabla_Columnas({'Prod Fabricados': Modelo_Prod.x, 'Prod NO Fabricados': Modelo_Prod.y}, 'Tipo Producto')
+        Table['Tipo Producto'] = Table['Tipo Producto'].astype(str)
 
-        with pd.ExcelWriter('Resultados.xlsx') as data: 
-            Table.to_excel(data, sheet_name="Resultados")
+        Escribir_Resultados({'Resultados': Table}, 'Resultados.xlsx', Formato, index=True)
 
 if __name__ == "__main__":
     runing = Problema_Produccion()
@@ -0,0 +1,76 @@
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+from pyomo.environ import value
+from Modelo_Parking_Electrico_V1 import Problema_Parking_Electrico
+from Generador_Instancias import Generar_Parking, Escribir_Parking
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+def Perfiles(Archivo):
+    # Hoja Parameters del laboratorio: irradiancia y precios por hora (sin las columnas de los 3 vehiculos)
+    Data = pd.read_excel(Archivo, sheet_name='Parameters')
+    return Data[['Hora', 'Irradiancia', 'P_Compra', 'P_Venta']]
+
+def Data_Reglas(problema, Parameters, flota):
+    # Hoja Parameters con las columnas PC_i, SOCmin_i, SOCinit_i que lee Model_Reglas
+    N = len(flota['SOC_Inicial'])
+    columnas = {f'PC_{i}': flota['PC'][i-1] for i in range(1, N+1)}
+    columnas.update({f'SOCmin_{i}': flota['SOC_Minimo'][i-1] for i in range(1, N+1)})
+    columnas.update({f'SOCinit_{i}': flota['SOC_Inicial'][i-1] for i in range(1, N+1)})
+    problema.Data = pd.concat([Parameters.reset_index(drop=True), pd.DataFrame(columnas)], axis=1)
+
+def Medir(tamanos, Archivo, Modos=('Arreglos', 'Reglas'), Max_Reglas=1000, Excel=False, semilla=0):
+    # Construccion y solucion por tamaño de flota. El sitio (panel, bateria) escala con la flota para que
+    # la bateria y el panel sigan siendo relevantes. Con Excel=True la flota se escribe y se lee del libro
+    Parameters = Perfiles(Archivo)
+    Tabla = []
+    for N in tamanos:
+        flota = Generar_Parking(N, Horas=len(Parameters), semilla=semilla)
+        problema = Problema_Parking_Electrico()
+        escala = max(N / 3, 1)
+        problema.Cap_Panel, problema.Cap_Bat, problema.PCB = 200*escala, 200*escala, 50*escala
+        problema.SOC_BT_Inicial = problema.Cap_Bat*problema.SOC_Min
+        carga = None
+        if Excel:
+            with tempfile.TemporaryDirectory() as directorio:
+                libro = os.path.join(directorio, f'Flota_{N}.xlsx')
+                Escribir_Parking(flota, Parameters, libro)
+                inicio = time.perf_counter()
+                problema.ReadExcelFile(libro, Hojas_Flota=True, Cache=False)
+                carga = time.perf_counter() - inicio
+        else:
+            problema.Cargar_Flota(flota['PC'], flota['SOC_Minimo'], flota['SOC_Inicial'], Parameters['Irradiancia'],
+                                  Parameters['P_Compra'], Parameters['P_Venta'])
+        for modo in Modos:
+            if modo == 'Reglas':
+                if N > Max_Reglas:
+                    continue
+                Data_Reglas(problema, Parameters, flota)
+            inicio = time.perf_counter()
+            modelo = problema.Model(modo)
+            construccion = time.perf_counter() - inicio
+            results = problema.opt.Resolver(modelo)
+            Tabla.append({'Vehiculos': N, 'Modo': modo, 'Carga_s': carga, 'Construccion_s': round(construccion, 3),
+                          'us_por_NxT': round(1e6*construccion/(N*problema.Time), 2),
+                          'Variables': modelo.nvariables(), 'Restricciones': modelo.nconstraints(),
+                          'Escritura_s': round(problema.opt.Tiempos['escritura'], 3),
+                          'Solucion_s': round(problema.opt.Tiempos['solucion'], 3),
+                          'Estado': str(results.solver.termination_condition), 'Objetivo': value(modelo.FunObj)})
+            print(Tabla[-1])
+            del modelo
+    return pd.DataFrame(Tabla)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Construccion y solucion del parqueadero electrico por tamaño de flota')
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--archivo', default=os.path.join(DIRECTORIO, 'Data_Input_VE.xlsx'))
+    parser.add_argument('--max-reglas', type=int, default=1000, help='Flota maxima para el modo Reglas (es lento)')
+    parser.add_argument('--excel', action='store_true', help='Escribir la flota a un libro y leerla con ReadExcelFile')
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    Tabla = Medir(args.tamanos, args.archivo, Max_Reglas=args.max_reglas, Excel=args.excel, semilla=args.semilla)
+    print(Tabla.to_string(index=False))
@@ -0,0 +1,65 @@
+import argparse
+import os
+import time
+import pandas as pd
+from Scheduling_Model_V1 import Scheduling_Problem
+from Solucionador import Gap_Relativo  # Codigos_Generales ya esta en sys.path por Scheduling_Model_V1
+from Generador_Instancias import Generar_Scheduling
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Variantes del modelo: argumentos de Scheduling_Problem
+CONFIGURACIONES = {
+    'original': {},
+    'M': {'M_Ajustado': True},
+    'simetria_M': {'Simetria': True, 'M_Ajustado': True},
+    'simetria_M_arranque': {'Simetria': True, 'M_Ajustado': True, 'Arranque': True},
+}
+
+def Medir(instancias, Configuraciones=CONFIGURACIONES, Tiempo_Limite=60):
+    # Tiempo al primer incumbente y gap final de cada variante. Los incumbentes solo se registran con
+    # HiGHS (IO_SOLVER=appsi_highs); con otros solvers esas columnas quedan vacias
+    Tabla = []
+    for nombre, hojas in instancias:
+        for configuracion, argumentos in Configuraciones.items():
+            problema = Scheduling_Problem(**argumentos)
+            problema.LoadData(hojas)
+            inicio = time.perf_counter()
+            modelo = problema.model()
+            construccion = time.perf_counter() - inicio
+            greedy = problema.Cargar_Arranque(modelo) if problema.Arranque else None
+            results = problema.opt.Resolver(modelo, Warmstart=problema.Arranque, Tiempo_Limite=Tiempo_Limite)
+            incumbentes = problema.opt.Incumbentes
+            objetivo, cota = results.problem.upper_bound, results.problem.lower_bound
+            gap = Gap_Relativo(objetivo, cota)
+            Tabla.append({'Instancia': nombre, 'Configuracion': configuracion,
+                          'Estado': str(results.solver.termination_condition), 'Greedy': greedy,
+                          'Primer_Incumbente_s': incumbentes[0][0] if incumbentes else None,
+                          'Primer_Objetivo': incumbentes[0][1] if incumbentes else None,
+                          'Objetivo': objetivo, 'Cota': cota, 'Gap': gap, 'Nodos': problema.opt.Nodos,
+                          'Restricciones': modelo.nconstraints(), 'Construccion_s': round(construccion, 3),
+                          'Solucion_s': round(problema.opt.Tiempos['solucion'], 3)})
+            print(Tabla[-1])
+    return pd.DataFrame(Tabla)
+
+def Instancias(tamanos, semilla=0, Archivo=None):
+    # (nombre, hojas) de Data_Input_SM.xlsx (si se indica) y de instancias sinteticas (camiones, zonas)
+    if Archivo:
+        problema = Scheduling_Problem()
+        problema.ReadExcelFile(Archivo)
+        yield 'Data_Input_SM', {'Producto': problema.Producto, 'Zonas': problema.Zonas, 'Camiones': problema.Camiones}
+    for N_camiones, N_zonas in tamanos:
+        yield f'Sintetica_{N_camiones}x{N_zonas}', Generar_Scheduling(N_camiones, N_zonas, semilla=semilla)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Ruptura de simetria, M ajustado y arranque greedy en Scheduling_Problem')
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[10, 30, 30, 100],
+                        help='Pares camiones zonas de las instancias sinteticas')
+    parser.add_argument('--tiempo', type=float, default=60, help='Tiempo limite por solve (s)')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--archivo', default=os.path.join(DIRECTORIO, 'Data_Input_SM.xlsx'))
+    args = parser.parse_args()
+
+    tamanos = list(zip(args.tamanos[::2], args.tamanos[1::2]))
+    Tabla = Medir(Instancias(tamanos, args.semilla, args.archivo), Tiempo_Limite=args.tiempo)
+    print(Tabla.to_string(index=False))
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+def Generar_Scheduling(N_camiones, N_zonas, N_productos=3, T=3, Capacidades=(120, 180), semilla=0):
+    # Instancia sintetica con las hojas de Data_Input_SM.xlsx (mismo esquema). Las capacidades se eligen de
+    # 'Capacidades', por lo que muchos camiones son identicos (la simetria que se quiere romper)
+    rng = np.random.default_rng(semilla)
+    Producto = pd.DataFrame({'Producto': np.arange(1, N_productos + 1),
+                             'Volumen': rng.choice([1.5, 2.0, 3.0], size=N_productos),
+                             'CNP': rng.integers(30, 121, size=N_productos)})
+
+    Zonas = pd.DataFrame({'Zonas': np.arange(1, N_zonas + 1)})
+    for t in range(1, T + 1):
+        for l in range(1, N_productos + 1):
+            # Alrededor de un tercio de las demandas son cero, como en el archivo del laboratorio
+            demanda = rng.integers(0, 21, size=N_zonas)
+            Zonas[f'Demanda_{l}_{t}'] = np.where(rng.random(N_zonas) < 0.3, 0, demanda)
+    Zonas['T_Visita'] = rng.integers(60, 281, size=N_zonas)
+    Zonas['ZNV'] = rng.integers(300, 801, size=N_zonas)
+
+    Camiones = pd.DataFrame({'Camion': np.arange(1, N_camiones + 1),
+                             'Capacidad': rng.choice(Capacidades, size=N_camiones)})
+
+    # Distancias simetricas entre el deposito (0) y las zonas, todos los pares ordenados como en el archivo
+    # del laboratorio (el modelo no las usa, pero el libro queda con las mismas hojas)
+    nodos = np.arange(N_zonas + 1)
+    distancias = rng.integers(5, 61, size=(N_zonas + 1, N_zonas + 1))
+    distancias = np.triu(distancias, 1) + np.triu(distancias, 1).T
+    m, n = np.meshgrid(nodos, nodos, indexing='ij')
+    pares = m != n
+    Distancia = pd.DataFrame({'m': m[pares], 'n': n[pares], 'Dist': distancias[pares]})
+    return {'Producto': Producto, 'Zonas': Zonas, 'Camiones': Camiones, 'Distancia': Distancia}
+
+def Escribir_Scheduling(hojas, FileName):
+    # Libro con las hojas de Data_Input_SM.xlsx
+    with pd.ExcelWriter(FileName) as writer:
+        for nombre, tabla in hojas.items():
+            tabla.to_excel(writer, sheet_name=nombre, index=False)
+
+def Generar_Parking(N_vehiculos, Horas=24, Cap_Bat_VE=50, PCR=35, Fi=0.95, SOC_Max=0.9, semilla=0):
+    # Flota sintetica con las matrices de Problema_Parking_Electrico.Cargar_Flota: cada vehiculo se conecta una vez
+    # (PC=1 entre su llegada y su salida) y en su ultima hora exige un SOC minimo alcanzable con la carga rapida
+    rng = np.random.default_rng(semilla)
+    llegada = rng.integers(0, Horas - 1, size=N_vehiculos)
+    salida = np.minimum(llegada + rng.integers(2, 11, size=N_vehiculos), Horas)
+    horas = np.arange(Horas)
+    PC = ((horas >= llegada[:, None]) & (horas < salida[:, None])).astype(float)
+
+    SOC_Inicial = rng.uniform(0.2, 0.5, size=N_vehiculos)
+    alcanzable = np.minimum(SOC_Inicial + Fi*PCR*(salida - llegada)/Cap_Bat_VE, SOC_Max)
+    SOC_Minimo = np.full((N_vehiculos, Horas), 0.1)
+    SOC_Minimo[np.arange(N_vehiculos), salida - 1] = SOC_Inicial + rng.uniform(0, 1, size=N_vehiculos)*(alcanzable - SOC_Inicial)
+    return {'PC': PC, 'SOC_Minimo': SOC_Minimo, 'SOC_Inicial': SOC_Inicial}
+
+def Escribir_Parking(flota, Parameters, FileName):
+    # Libro con la hoja Parameters (perfiles del sitio) y la flota en las hojas de ESQUEMA_FLOTA
+    vehiculos = pd.Index(np.arange(1, len(flota['SOC_Inicial']) + 1), name='Vehiculo')
+    horas = [str(h) for h in range(1, flota['PC'].shape[1] + 1)]
+    with pd.ExcelWriter(FileName) as writer:
+        Parameters.to_excel(writer, sheet_name='Parameters', index=False)
+        pd.DataFrame(flota['PC'], index=vehiculos, columns=horas).to_excel(writer, sheet_name='Disponibilidad')
+        pd.DataFrame(flota['SOC_Minimo'], index=vehiculos, columns=horas).to_excel(writer, sheet_name='SOC_Minimo')
+        pd.DataFrame({'SOC_Inicial': flota['SOC_Inicial']}, index=vehiculos).to_excel(writer, sheet_name='Vehiculos')
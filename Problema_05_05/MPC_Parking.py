@@ -0,0 +1,144 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from pyomo.environ import Var, Constraint, Binary, value
+from Modelo_Parking_Electrico_V1 import Problema_Parking_Electrico
+from Solucionador import Es_Optimo  # Codigos_Generales ya esta en sys.path por Modelo_Parking_Electrico_V1
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+class MPC_Parking:
+    # Control predictivo (MPC) del parqueadero: una sola instancia con parametros mutables para todo el dia.
+    # En cada paso se fija el intervalo recien ejecutado (con las mediciones de SOC), se actualiza el pronostico
+    # de los intervalos restantes y se re-resuelve partiendo de la solucion anterior. Con IO_SOLVER=appsi_highs
+    # el modelo queda cargado en HiGHS y cada re-solve solo envia los cambios
+    def __init__(self, problema):
+        self.problema = problema
+        self.modelo = problema.Model(Mutable=True)
+        self.Ejecutado = 0  # Intervalos ya ejecutados (fijos)
+        self.Historial = []
+        # Variables y restricciones de cada intervalo (el ultimo indice es siempre t)
+        self.Variables_Intervalo = {t: [] for t in self.modelo.T}
+        for var in self.modelo.component_data_objects(Var):
+            self.Variables_Intervalo[Intervalo(var.index())].append(var)
+        self.Restricciones_Intervalo = {t: [] for t in self.modelo.T}
+        for restriccion in self.modelo.component_data_objects(Constraint):
+            self.Restricciones_Intervalo[Intervalo(restriccion.index())].append(restriccion)
+
+    def Actualizar_Pronostico(self, Desde, Irradiancia=None, P_Compra=None, P_Venta=None, PC=None, SOC_Min=None,
+                              SOC_Inicial=None):
+        # Arreglos de los intervalos Desde..T: Irradiancia, P_Compra, P_Venta con forma (n,), PC y SOC_Min (N, n);
+        # SOC_Inicial (N,) es el SOC con el que llega cada vehiculo
+        m = self.modelo
+        periodos = range(Desde, self.problema.Time + 1)
+        for parametro, datos in ((m.Irr, Irradiancia), (m.Lambda_Compra, P_Compra), (m.Lambda_Venta, P_Venta)):
+            if datos is not None:
+                parametro.store_values(dict(zip(periodos, datos)))
+        for parametro, datos in ((m.PC, PC), (m.SOC_Min, SOC_Min)):
+            if datos is not None:
+                parametro.store_values({(i, t): datos[i-1][k] for i in m.N for k, t in enumerate(periodos)})
+        if SOC_Inicial is not None:
+            m.SOC_Inicial.store_values({i: SOC_Inicial[i-1] for i in m.N})
+
+    def Fijar_Ejecutado(self, t, SOC_VE=None, SOC_BT=None):
+        # El intervalo t ya ocurrio: sus variables quedan en el valor aplicado (el plan vigente) o en el medido
+        # (SOC_VE por vehiculo y SOC_BT, en kWh) y sus restricciones dejan de ser parte del problema
+        m = self.modelo
+        for var in self.Variables_Intervalo[t]:
+            var.fix(round(var.value) if var.domain is Binary else var.value)
+        if SOC_VE is not None:
+            for i in m.N:
+                m.soc_ve[i, t].fix(SOC_VE[i-1])
+        if SOC_BT is not None:
+            m.soc_bt[t].fix(SOC_BT)
+        for restriccion in self.Restricciones_Intervalo[t]:
+            restriccion.deactivate()
+
+    def Paso(self, Mediciones=None, Pronostico=None, Tiempo_Limite=None):
+        # Un paso de control: fija el intervalo anterior con las mediciones, actualiza el pronostico, re-resuelve
+        # y devuelve las decisiones del intervalo que sigue
+        reloj = time.perf_counter()
+        Mediciones = Mediciones or {}
+        if self.Ejecutado >= 1:
+            self.Fijar_Ejecutado(self.Ejecutado, Mediciones.get('SOC_VE'), Mediciones.get('SOC_BT'))
+        elif 'SOC_BT' in Mediciones:
+            self.modelo.SOC_BT_Inicial = Mediciones['SOC_BT']
+        k = self.Ejecutado + 1
+        if Pronostico:
+            self.Actualizar_Pronostico(k, **Pronostico)
+        # Warmstart: las variables conservan la solucion anterior (y los intervalos fijos su valor ejecutado)
+        results = self.problema.opt.Resolver(self.modelo, Warmstart=True, Tiempo_Limite=Tiempo_Limite)
+        if not Es_Optimo(results):
+            raise RuntimeError(f'Intervalo {k}: re-solve sin solucion optima ({results.solver.termination_condition})')
+        m = self.modelo
+        Decision = {'Intervalo': k, 'CM': value(m.cm[k]), 'VT': value(m.vt[k]), 'CH_BT': value(m.ch_bt[k]),
+                    'DS_BT': value(m.ds_bt[k]), 'PV': value(m.pv[k])}
+        Decision.update({f'CH_VE_{i}': value(m.ch_ve[i, k]) for i in m.N})
+        self.Historial.append({'Intervalo': k, 'Objetivo': value(m.FunObj), 'Solucion_s': self.problema.opt.Tiempos['solucion'],
+                               'Resolver_s': self.problema.opt.Tiempos['total'], 'Paso_s': time.perf_counter() - reloj,
+                               'Nodos': self.problema.opt.Nodos})
+        self.Ejecutado = k
+        return Decision
+
+    def Tabla_Historial(self):
+        return pd.DataFrame(self.Historial)
+
+def Intervalo(indice):
+    return indice[-1] if isinstance(indice, tuple) else indice
+
+def Pronosticos(problema):
+    # Perfiles del dia de la hoja Parameters (ya repetidos en los intervalos de ReadExcelFile)
+    Data, N = problema.Data, problema.Nodos
+    return {'Irradiancia': Data['Irradiancia'].to_numpy(dtype=float),
+            'P_Compra': Data['P_Compra'].to_numpy(dtype=float),
+            'P_Venta': Data['P_Venta'].to_numpy(dtype=float),
+            'PC': np.stack([Data[f'PC_{i}'].to_numpy(dtype=float) for i in range(1, N+1)]),
+            'SOC_Min': np.stack([Data[f'SOCmin_{i}'].to_numpy(dtype=float) for i in range(1, N+1)])}
+
+def Simular(problema, Ruido=0.1, Ruido_SOC=0.01, semilla=0):
+    # Dia simulado: el pronostico de irradiancia y precios de los intervalos futuros tiene ruido multiplicativo
+    # (Ruido) y el del intervalo actual es el real; el SOC medido de la bateria se desvia del plan hasta Ruido_SOC.
+    # Compra y venta comparten el error, asi la venta nunca supera a la compra (el modelo seria no acotado)
+    rng = np.random.default_rng(semilla)
+    real = Pronosticos(problema)
+    mpc = MPC_Parking(problema)
+    Mediciones = {}
+    for k in range(1, problema.Time + 1):
+        n = problema.Time - k + 1
+        error_irr = np.clip(1 + Ruido*rng.standard_normal(n), 0, None)
+        error_precio = np.clip(1 + Ruido*rng.standard_normal(n), 0, None)
+        error_irr[0] = error_precio[0] = 1
+        pronostico = {'Irradiancia': real['Irradiancia'][k-1:]*error_irr,
+                      'P_Compra': real['P_Compra'][k-1:]*error_precio, 'P_Venta': real['P_Venta'][k-1:]*error_precio}
+        if k == 1:
+            pronostico.update(PC=real['PC'], SOC_Min=real['SOC_Min'])
+        mpc.Paso(Mediciones, pronostico)
+        m = mpc.modelo
+        soc_bt = value(m.soc_bt[k])*(1 + Ruido_SOC*rng.uniform(-1, 1))
+        Mediciones = {'SOC_VE': [value(m.soc_ve[i, k]) for i in m.N],
+                      'SOC_BT': float(np.clip(soc_bt, problema.Cap_Bat*problema.SOC_Min, problema.Cap_Bat*problema.SOC_Max))}
+    mpc.Fijar_Ejecutado(problema.Time, **Mediciones)
+    return mpc, value(mpc.modelo.FunObj)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='MPC (horizonte rodante) del parqueadero electrico')
+    parser.add_argument('--archivo', default=os.path.join(DIRECTORIO, 'Data_Input_VE.xlsx'))
+    parser.add_argument('--intervalos', type=int, default=96, help='Intervalos del dia (96 = 15 minutos)')
+    parser.add_argument('--ruido', type=float, default=0.1, help='Error relativo del pronostico de irradiancia y precios')
+    parser.add_argument('--ruido-soc', type=float, default=0.01, help='Error relativo del SOC medido de la bateria')
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    problema = Problema_Parking_Electrico()
+    problema.ReadExcelFile(args.archivo, args.intervalos)
+    mpc, Costo = Simular(problema, args.ruido, args.ruido_soc, args.semilla)
+    Historial = mpc.Tabla_Historial()
+    print(Historial.describe().loc[['mean', '50%', 'max'], ['Solucion_s', 'Resolver_s', 'Paso_s']].to_string())
+
+    # Referencia: un solo solve con informacion perfecta
+    problema.ReadExcelFile(args.archivo, args.intervalos)
+    modelo = problema.Model()
+    problema.opt.Resolver(modelo)
+    print(f'Costo MPC: {Costo:.4f}, costo con informacion perfecta: {value(modelo.FunObj):.4f}')
@@ -1,15 +1,37 @@
+import os
+import re
+import sys
 import numpy as np
-import pandas as pd
 from pyomo.environ import * 
+from pyomo.core.expr import LinearExpression
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Tabla_Columnas, Tabla_Ancha, Escribir_Resultados
+from Solucionador import Solucionador
+from Carga_Datos import Leer_Libro, Indexar
+
+# Perfiles horarios del sitio (la flota puede venir como columnas PC_i, SOCmin_i, SOCinit_i de la misma hoja)
+ESQUEMA = {
+    'Parameters': {'columnas': ['Hora', 'Irradiancia', 'P_Compra', 'P_Venta'],
+                   'sin_nans': ['Hora', 'Irradiancia', 'P_Compra', 'P_Venta']},
+}
+# Flota en hojas propias, una fila por vehículo y una columna por hora (para más vehículos de los que caben
+# como columnas en Parameters)
+ESQUEMA_FLOTA = {
+    'Disponibilidad': {'index_col': 0},
+    'SOC_Minimo': {'index_col': 0},
+    'Vehiculos': {'columnas': ['SOC_Inicial'], 'index_col': 0},
+}
+
+def Columnas_Numeradas(Data, prefijo):
+    # Columnas <prefijo><n> ordenadas por n (PC_1, PC_2, ..., PC_10)
+    columnas = [c for c in Data.columns if re.fullmatch(prefijo + r'\d+', str(c))]
+    return sorted(columnas, key=lambda c: int(c[len(prefijo):]))
 
 class Problema_Parking_Electrico:
     def __init__(self, name=None):
         self.Data = []
-
-    def ReadExcelFile(self, FileName):
-        self.Data = pd.read_excel(FileName, sheet_name='Parameters')
-        self.Time = 24
-        self.Nodos = 3
+        self.opt = Solucionador()
         self.Cap_Bat_VE = 50
         self.PCR = 35
         self.PCL = 15
@@ -19,8 +41,127 @@ class Problema_Parking_Electrico:
         self.SOC_Max = 0.9
         self.SOC_Min = 0.1
         self.Fi = 0.95
+        self.SOC_BT_Inicial = self.Cap_Bat*self.SOC_Min  # Energía de la batería al inicio del día (kWh)
+
+    def ReadExcelFile(self, FileName, Intervalos=24, Hojas_Flota=False, Cache=True):
+        # Intervalos: divisiones del día (96 = cada 15 minutos); cada hora de la hoja se repite en sus intervalos
+        # Hojas_Flota: la flota se lee de las hojas de ESQUEMA_FLOTA en vez de las columnas de Parameters
+        Hojas = Leer_Libro(FileName, {**ESQUEMA, **ESQUEMA_FLOTA} if Hojas_Flota else ESQUEMA, Cache)
+        Data = Hojas['Parameters']
+        if Hojas_Flota:
+            PC = Hojas['Disponibilidad'].to_numpy(dtype=float)
+            SOC_Minimo = Hojas['SOC_Minimo'].to_numpy(dtype=float)
+            SOC_Inicial = Hojas['Vehiculos']['SOC_Inicial'].to_numpy(dtype=float)
+        else:
+            PC = Data[Columnas_Numeradas(Data, 'PC_')].to_numpy(dtype=float).T
+            SOC_Minimo = Data[Columnas_Numeradas(Data, 'SOCmin_')].to_numpy(dtype=float).T
+            SOC_Inicial = Data[Columnas_Numeradas(Data, 'SOCinit_')].iloc[0].to_numpy(dtype=float)
+        self.Cargar_Flota(PC, SOC_Minimo, SOC_Inicial, Data['Irradiancia'], Data['P_Compra'], Data['P_Venta'], Intervalos)
+        # Hoja con las horas repetidas en sus intervalos (la usa Model_Reglas)
+        self.Data = Data.loc[Data.index.repeat(Intervalos // len(Data))].reset_index(drop=True)
+
+    def Cargar_Flota(self, PC, SOC_Minimo, SOC_Inicial, Irradiancia, P_Compra, P_Venta, Intervalos=None):
+        # Arreglos horarios: PC y SOC_Minimo (N, H), SOC_Inicial (N,), perfiles (H,). Se repiten en los intervalos
+        Horas = len(Irradiancia)
+        Intervalos = Intervalos or Horas
+        if Intervalos % Horas:
+            raise ValueError(f'Intervalos debe ser múltiplo de las {Horas} horas de la hoja')
+        k = Intervalos // Horas
+        self.PC_arr = np.repeat(np.asarray(PC, dtype=float), k, axis=1)              # (N, T)
+        self.SOC_Min_arr = np.repeat(np.asarray(SOC_Minimo, dtype=float), k, axis=1)  # (N, T)
+        self.SOC_Inicial_arr = np.asarray(SOC_Inicial, dtype=float)                   # (N,)
+        self.Irr_arr = np.repeat(np.asarray(Irradiancia, dtype=float), k)              # (T,)
+        self.Compra_arr = np.repeat(np.asarray(P_Compra, dtype=float), k)              # (T,)
+        self.Venta_arr = np.repeat(np.asarray(P_Venta, dtype=float), k)                # (T,)
+        self.Nodos, self.Time = self.PC_arr.shape[0], Intervalos
+        self.Delta = 24 / Intervalos  # Horas por intervalo: las potencias (kW) se multiplican por Delta para la energía
+
+        esperado = {'SOC_Minimo (vehiculos, intervalos)': (self.SOC_Min_arr.shape, self.PC_arr.shape),
+                    'PC (intervalos)': (self.PC_arr.shape[1], Intervalos),
+                    'SOC_Inicial (vehiculos)': (len(self.SOC_Inicial_arr), self.Nodos),
+                    'P_Compra/P_Venta (horas)': ((len(P_Compra), len(P_Venta)), (Horas, Horas))}
+        errores = [f'{dato}: {leido}, se esperaba {valor}' for dato, (leido, valor) in esperado.items() if leido != valor]
+        if errores:
+            raise ValueError('Dimensiones inconsistentes:\n  ' + '\n  '.join(errores))
+
+    def Model(self, Modo='Arreglos', Mutable=False):
+        # Modo 'Arreglos': ConcreteModel construido desde los arreglos de la flota (lineal en N×T)
+        # Modo 'Reglas': AbstractModel original con una regla por índice sobre las columnas de Parameters
+        # Mutable=True deja los parámetros de pronóstico y medición como mutables (modo MPC, sin reconstruir)
+        if Modo == 'Reglas':
+            return self.Model_Reglas(Mutable)
+        return self.Model_Arreglos(Mutable)
+
+    def Model_Arreglos(self, Mutable=False):
+        model = ConcreteModel(name='Model')
+
+        ## SETS ##
+        model.T = Set(initialize=range(1, self.Time+1))
+        model.N = Set(initialize=range(1, self.Nodos+1))
+
+        ## PARAMETERS ##
+        # PC y SOC_Min solo son parámetros con Mutable; si no, entran en las cotas de ch_ve y soc_ve
+        if Mutable:
+            model.SOC_Min = Param(model.N, model.T, initialize=Indexar(self.SOC_Min_arr), mutable=Mutable)
+            model.PC = Param(model.N, model.T, initialize=Indexar(self.PC_arr), mutable=Mutable)
+        model.Irr = Param(model.T, initialize=Indexar(self.Irr_arr), mutable=Mutable)
+        model.Lambda_Compra = Param(model.T, initialize=Indexar(self.Compra_arr), mutable=Mutable)
+        model.Lambda_Venta = Param(model.T, initialize=Indexar(self.Venta_arr), mutable=Mutable)
+        model.SOC_Inicial = Param(model.N, initialize=Indexar(self.SOC_Inicial_arr), mutable=Mutable)
+        model.SOC_BT_Inicial = Param(initialize=self.SOC_BT_Inicial, mutable=Mutable)
+
+        ## VARIABLES ##
+        # Sin parámetros mutables, los límites de SOC y de carga de cada vehículo son cotas de las variables
+        # (sin las filas soc_ve_R_4 y ch_ve_R_5); con Mutable deben seguir a PC y SOC_Min y quedan como restricciones
+        # (pl no interviene en ninguna restricción y no se crea)
+        if Mutable:
+            model.ch_ve = Var(model.N, model.T, within = NonNegativeReals, initialize = 0)
+            model.soc_ve = Var(model.N, model.T, within = NonNegativeReals, initialize = 0)
+        else:
+            cota_ch = (self.PC_arr*self.PCR).tolist()
+            cota_soc = (self.Cap_Bat_VE*self.SOC_Min_arr*self.PC_arr).tolist()
+            model.ch_ve = Var(model.N, model.T, within = NonNegativeReals, initialize = 0,
+                              bounds = lambda model,i,t: (0, cota_ch[i-1][t-1]))
+            model.soc_ve = Var(model.N, model.T, within = NonNegativeReals, initialize = lambda model,i,t: cota_soc[i-1][t-1],
+                               bounds = lambda model,i,t: (cota_soc[i-1][t-1], self.Cap_Bat_VE*self.SOC_Max))
+
+        self.Componentes_Sitio(model)
 
-    def Model (self):
+        # ## CONSTRAINTS ##
+        def Balance (model,t):
+            variables = [model.pv[t], model.cm[t], model.vt[t], model.ds_bt[t], model.ch_bt[t]] + [model.ch_ve[i,t] for i in model.N]
+            return LinearExpression(constant=0, linear_coefs=[1, 1, -1, 1, -1] + [-1]*self.Nodos, linear_vars=variables) == 0
+        model.balance_R_1 = Constraint(model.T, rule=Balance)
+
+        # Energía con que llega cada vehículo: SOC_Inicial·Cap·PC[t]·(PC[t] - PC[t-1])
+        Llegada = (self.SOC_Inicial_arr[:, None]*self.Cap_Bat_VE*self.PC_arr*np.diff(self.PC_arr, axis=1, prepend=0)).tolist()
+        def SOC_VE (model,i,t):
+            if Mutable:
+                anterior = model.PC[i,t-1] if t > 1 else 0
+                llegada = model.SOC_Inicial[i]*self.Cap_Bat_VE*model.PC[i,t]*(model.PC[i,t] - anterior)
+            else:
+                llegada = Llegada[i-1][t-1]
+            if t == 1:
+                cuerpo = LinearExpression(constant=0, linear_coefs=[1, -self.Fi*self.Delta],
+                                          linear_vars=[model.soc_ve[i,t], model.ch_ve[i,t]])
+            else:
+                cuerpo = LinearExpression(constant=0, linear_coefs=[1, -1, -self.Fi*self.Delta],
+                                          linear_vars=[model.soc_ve[i,t], model.soc_ve[i,t-1], model.ch_ve[i,t]])
+            return cuerpo == llegada
+        model.soc_ve_R_3 = Constraint(model.N, model.T, rule=SOC_VE)
+
+        if Mutable:
+            def SOC_VE_2 (model,i,t):
+                return inequality(self.Cap_Bat_VE*model.SOC_Min[i,t]*model.PC[i,t] ,model.soc_ve[i,t],self.Cap_Bat_VE*self.SOC_Max) 
+            model.soc_ve_R_4= Constraint(model.N,model.T, rule=SOC_VE_2)
+
+            def CH_VE (model,i,t):
+                return model.ch_ve[i,t] <= model.PC[i,t]*self.PCR
+            model.ch_ve_R_5 = Constraint(model.N,model.T, rule=CH_VE)
+
+        return model
+
+    def Model_Reglas (self, Mutable=False):
         model = AbstractModel(name='Model')
 
         ## SETS ##
@@ -29,28 +170,30 @@ class Problema_Parking_Electrico:
 
         ## PARAMETERS ##
         def SOC_Min_Init(model,i,t):
-            return 
-        model.SOC_Min = Param(model.N,model.T, rule=SOC_Min_Init)
+            return self.Data['SOCmin_'+str(i)].loc[t-1]
+        model.SOC_Min = Param(model.N,model.T, rule=SOC_Min_Init, mutable=Mutable)
 
         def Irr_init(model,t):
             return self.Data['Irradiancia'].loc[t-1]
-        model.Irr = Param(model.T, rule=Irr_init)
+        model.Irr = Param(model.T, rule=Irr_init, mutable=Mutable)
 
         def PC_Init(model,i,t):
             return self.Data['PC_'+str(i)].loc[t-1]
-        model.PC = Param(model.N,model.T, rule=PC_Init)
+        model.PC = Param(model.N,model.T, rule=PC_Init, mutable=Mutable)
 
         def P_Compra_init(model,t):
-            return 
-        model.Lambda_Compra = Param(model.T, rule=P_Compra_init)
+            return self.Data['P_Compra'].loc[t-1]
+        model.Lambda_Compra = Param(model.T, rule=P_Compra_init, mutable=Mutable)
 
         def P_Venta_init(model,t):
             return self.Data['P_Venta'].loc[t-1]
-        model.Lambda_Venta = Param(model.T, rule=P_Venta_init)
+        model.Lambda_Venta = Param(model.T, rule=P_Venta_init, mutable=Mutable)
 
         def SOC_Inicial_init(model,i):
             return self.Data['SOCinit_'+str(i)].loc[0]
-        model.SOC_Inicial = Param(model.N, rule=SOC_Inicial_init)
+        model.SOC_Inicial = Param(model.N, rule=SOC_Inicial_init, mutable=Mutable)
+
+        model.SOC_BT_Inicial = Param(initialize=self.SOC_BT_Inicial, mutable=Mutable)
 
         ## VARIABLES ##
         model.pl = Var(model.N, model.T, within = NonNegativeReals, initialize = 0)
@@ -58,32 +201,19 @@ class Problema_Parking_Electrico:
         model.ch_ve = Var(model.N, model.T, within = NonNegativeReals, initialize = 0)
         model.soc_ve = Var(model.N, model.T, within = NonNegativeReals, initialize = 0)
 
-        model.ch_bt = Var(model.T, within = NonNegativeReals, initialize = 0)
-        model.ds_bt = Var(model.T, within = NonNegativeReals, initialize = 0)
-
-        model.pv = Var(model.T, within = NonNegativeReals, initialize = 0)
-        model.cm = Var(model.T, within = NonNegativeReals, initialize = 0) # Compra
-        model.vt = Var(model.T, within = NonNegativeReals, initialize = 0) # Venta
-
-        ## OBJECTIVE FUNCTION ##
-        def Fun_obj(model):
-            return sum(model.cm[t]*model.Lambda_Compra[t] ) 
-        model.FunObj = Objective(rule = Fun_obj, sense = minimize)
+        self.Componentes_Sitio(model)
 
         # ## CONSTRAINTS ##
         def Balance (model,t):
-            return model.pv[t] -  == 0
+            return model.pv[t] - sum(model.ch_ve[i,t] for i in model.N) + model.cm[t] - model.vt[t] + model.ds_bt[t] - model.ch_bt[t] == 0
         model.balance_R_1 = Constraint(model.T, rule=Balance)
 
-        def Panel_Solar (model,t):
-            return model.pv[t] <= self.Cap_Panel*model.Irr[t]
-        model.panel_R_2 = Constraint(model.T, rule=Panel_Solar)
-
         def SOC_VE (model,i,t):
             if t == 1:
-                return model.soc_ve[i,t] == model.SOC_Inicial[i]*model.PC[i,t]*self.Cap_Bat_VE + model.ch_ve[i,t]*self.Fi
+                return model.soc_ve[i,t] == model.SOC_Inicial[i]*model.PC[i,t]*self.Cap_Bat_VE + model.ch_ve[i,t]*self.Fi*self.Delta
             else:
-                return model.soc_ve[i,t] ==  
+                # Al conectarse (PC pasa de 0 a 1) el vehículo llega con SOC_Inicial
+                return model.soc_ve[i,t] == model.SOC_Inicial[i]*self.Cap_Bat_VE*model.PC[i,t]*(model.PC[i,t] - model.PC[i,t-1]) + model.soc_ve[i,t-1] + model.ch_ve[i,t]*self.Fi*self.Delta
         model.soc_ve_R_3 = Constraint(model.N,model.T, rule=SOC_VE)
 
         def SOC_VE_2 (model,i,t):
@@ -94,65 +224,74 @@ class Problema_Parking_Electrico:
             return model.ch_ve[i,t] <= model.PC[i,t]*self.PCR
         model.ch_ve_R_5 = Constraint(model.N,model.T, rule=CH_VE)
 
+        return model.create_instance()
+    
+    def Componentes_Sitio(self, model):
+        # Panel, batería y red (independientes del número de vehículos)
+        ## VARIABLES ##
+        model.ch_bt = Var(model.T, within = NonNegativeReals, initialize = 0)
+        model.ds_bt = Var(model.T, within = NonNegativeReals, initialize = 0)
+        model.soc_bt = Var(model.T, within = NonNegativeReals, initialize = 0)
+        model.w_bt = Var(model.T, within = Binary, initialize = 0) # 1: carga, 0: descarga
+
+        model.pv = Var(model.T, within = NonNegativeReals, initialize = 0)
+        model.cm = Var(model.T, within = NonNegativeReals, initialize = 0) # Compra
+        model.vt = Var(model.T, within = NonNegativeReals, initialize = 0) # Venta
+
+        ## OBJECTIVE FUNCTION ##
+        def Fun_obj(model):
+            return sum((model.cm[t]*model.Lambda_Compra[t] - model.vt[t]*model.Lambda_Venta[t])*self.Delta for t in model.T)
+        model.FunObj = Objective(rule = Fun_obj, sense = minimize)
+
+        # ## CONSTRAINTS ##
+        def Panel_Solar (model,t):
+            return model.pv[t] <= self.Cap_Panel*model.Irr[t]
+        model.panel_R_2 = Constraint(model.T, rule=Panel_Solar)
+
         def SOC_BT (model,t):
             if t == 1:
-                return model.soc_bt[t] <= 
+                return model.soc_bt[t] <= model.SOC_BT_Inicial + (self.Fi*model.ch_bt[t] - model.ds_bt[t]/self.Fi)*self.Delta
             else:
-                return model.soc_bt[t] <= model.soc_bt[t-1] + self.Fi*model.ch_bt[t] - model.ds_bt[t]/self.Fi
+                return model.soc_bt[t] <= model.soc_bt[t-1] + (self.Fi*model.ch_bt[t] - model.ds_bt[t]/self.Fi)*self.Delta
         model.soc_bt_R_6 = Constraint(model.T, rule=SOC_BT)
 
         def SOC_BT_2 (model,t):
             return inequality(self.Cap_Bat*self.SOC_Min ,model.soc_bt[t],self.Cap_Bat*self.SOC_Max) 
         model.soc_bt_R_7= Constraint(model.T, rule=SOC_BT_2)
 
+        def CH_BT (model,t):
+            return model.ch_bt[t] <= self.PCB*model.w_bt[t]
+        model.ch_bt_R_8 = Constraint(model.T, rule=CH_BT)
 
-        return model.create_instance()
-    
-    def Solver(self):
+        def DS_BT (model,t):
+            return model.ds_bt[t] <= self.PCB*(1 - model.w_bt[t])
+        model.ds_bt_R_9 = Constraint(model.T, rule=DS_BT)
 
-        Modelo_PE = self.Model()
+    def Solver(self, Modo='Arreglos'):
+
+        Modelo_PE = self.Model(Modo)
         #Modelo_PE.pprint()
-        self.opt = SolverFactory("glpk")
-        results = self.opt.solve(Modelo_PE)
+        results = self.opt.Resolver(Modelo_PE)
         results.write()
+        print('Tiempos: ' + self.opt.Reporte())
 
         print('Valor Función Objetivo: ' + str(value(Modelo_PE.FunObj)))
 
         return Modelo_PE
 
-    def Print_Results(self,Modelo_PE):
-
-        Table_PL = pd.DataFrame()
-        Table_CH_VE = pd.DataFrame()
-        Table_SOC_VE = pd.DataFrame()
-        Table_Resumen = pd.DataFrame()
- 
-        for t in Modelo_PE.T:
-            Table_Resumen.loc[t-1,'CH_BT'] = round(Modelo_PE.ch_bt[t].value,4)
-            Table_Resumen.loc[t-1,'DS_BT'] = round(Modelo_PE.ds_bt[t].value,4)
-            Table_Resumen.loc[t-1,'SOC_BT'] = round(Modelo_PE.soc_bt[t].value,4)
-            Table_Resumen.loc[t-1,'W_BT'] = round(Modelo_PE.w_bt[t].value,4)
-            Table_Resumen.loc[t-1,'PV'] = round(Modelo_PE.pv[t].value,4)
-            Table_Resumen.loc[t-1,'CM'] = round(Modelo_PE.cm[t].value,4)
-            Table_Resumen.loc[t-1,'VT'] = round(Modelo_PE.vt[t].value,4)
-
-        r=0
-        for n in Modelo_PE.N:
-            for t in Modelo_PE.T:
-                Table_CH_VE.loc[r,'Nodo'] = str(n)
-                Table_CH_VE.loc[r,str(t)] = round(Modelo_PE.ch_ve[n,t].value,4)
-                Table_SOC_VE.loc[r,'Nodo'] = str(n)
-                Table_SOC_VE.loc[r,str(t)] = round(Modelo_PE.soc_ve[n,t].value,4)
-            r +=1
-
-
-        with pd.ExcelWriter('Resultados.xlsx') as data: 
-            Table_Resumen.to_excel(data, sheet_name="Resumen")
-            Table_CH_VE.to_excel(data, sheet_name="Ch_VE")
-            Table_SOC_VE.to_excel(data, sheet_name="Soc_VE")
+    def Print_Results(self,Modelo_PE, Formato=None):
+
+        Table_Resumen = Tabla_Columnas({'CH_BT': Modelo_PE.ch_bt, 'DS_BT': Modelo_PE.ds_bt, 'SOC_BT': Modelo_PE.soc_bt,
+                                        'W_BT': Modelo_PE.w_bt, 'PV': Modelo_PE.pv, 'CM': Modelo_PE.cm,
+                                        'VT': Modelo_PE.vt}, 'T').drop(columns='T')
+        Table_CH_VE = Tabla_Ancha(Modelo_PE.ch_ve, 'Nodo')
+        Table_SOC_VE = Tabla_Ancha(Modelo_PE.soc_ve, 'Nodo')
+
+        Escribir_Resultados({'Resumen': Table_Resumen, 'Ch_VE': Table_CH_VE, 'Soc_VE': Table_SOC_VE},
+                            'Resultados.xlsx', Formato, index=True)
 
 if __name__ == "__main__":
     runing = Problema_Parking_Electrico()
     runing.ReadExcelFile('Data_Input.xlsx')
     modelo = runing.Solver()
-    runing.Print_Results(modelo)
+    runing.Print_Results(modelo)
\ No newline at end of file
@@ -1,21 +1,47 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Tabla_Variable, Escribir_Resultados
+from Solucionador import Solucionador, Gap_Relativo
+from Carga_Datos import Leer_Libro
+
+ESQUEMA = {
+    'Producto': {'columnas': ['Volumen', 'CNP']},
+    'Zonas': {'columnas': ['ZNV', 'T_Visita'], 'sin_nans': ['ZNV', 'T_Visita']},
+    'Camiones': {'columnas': ['Capacidad']},
+}
+
 class Scheduling_Problem:
-    def _init_(self, name=None):
+    def __init__(self, name=None, Simetria=False, M_Ajustado=False, Arranque=False):
         self.Data = []
+        self.opt = Solucionador()
+        # Simetria: ordena los camiones de igual capacidad por número de zonas visitadas
+        # M_Ajustado: visitas_2 con M = CC[i]/min(V) por camión en vez de 10000
+        # Arranque: la asignación greedy (Asignacion_Greedy) se entrega al solver como solución inicial
+        self.Simetria = Simetria
+        self.M_Ajustado = M_Ajustado
+        self.Arranque = Arranque
 
     def ReadExcelFile(self,FileName):
+        self.LoadData(Leer_Libro(FileName, ESQUEMA))
+
+    def LoadData(self, Hojas):
+        # Hojas: {'Producto': DataFrame, 'Zonas': ..., 'Camiones': ...} (del Excel o de Generador_Instancias)
         self.T = 3
         self.T_Max = 480
-        self.Z_Total = 6
-        self.Producto = pd.read_excel(FileName, sheet_name='Producto')
-        self.Zonas = pd.read_excel(FileName, sheet_name='Zonas')
-        self.Camiones = pd.read_excel(FileName, sheet_name='Camiones')
+        for hoja, Table in Hojas.items():
+            setattr(self, hoja, Table)
         self.N_Prod = len(self.Producto)
         self.N_Zonas = len(self.Zonas)
         self.N_Cam = len(self.Camiones)
+        # Lado derecho de visitas_1. Cada zona se visita o se marca como no visitada en cada periodo (un_camion),
+        # así el total por periodo es el número de zonas. Antes era la constante 6, las zonas de Data_Input_SM.xlsx
+        # (donde el modelo no cambia); con otro número de zonas visitas_1 contradecía a un_camion (infactible)
+        self.Z_Total = self.N_Zonas
     
     def model(self):
 
@@ -92,8 +118,11 @@ class Scheduling_Problem:
             return sum(model.z[i,t,l,j]*model.V[l] for l in model.C for j in model.B) <= model.CC[i]
         model.cap_cam = pyo.Constraint(model.A, model.T, rule = cap_cam)
 
+        # Un camión lleva a lo más CC[i]/min(V) unidades (z es entero): ese es el M más ajustado
+        M = {i: np.floor(self.Camiones['Capacidad'].loc[i-1] / self.Producto['Volumen'].min()) if self.M_Ajustado else 10000
+             for i in range(1, self.N_Cam+1)}
         def visitas_2(model,i,j,t):
-            return sum(model.z[i,t,l,j] for l in model.C) <= 10000*model.x[i,j,t]
+            return sum(model.z[i,t,l,j] for l in model.C) <= M[i]*model.x[i,j,t]
         model.visitas_2 = pyo.Constraint(model.A,model.B, model.T, rule = visitas_2)
 
         def v_oblg(model,i,t):
@@ -104,62 +133,177 @@ class Scheduling_Problem:
             return sum(model.x[i,j,t] for i in model.A) + model.y[j,t] == 1
         model.un_camion = pyo.Constraint(model.B, model.T, rule = un_camion)
 
+        if self.Simetria:
+            # Camiones de igual capacidad son intercambiables: en cada grupo (k < i consecutivos) el número de
+            # zonas visitadas es no creciente. Una fila por par y periodo (ordenar por la primera zona visitada
+            # exige O(zonas) filas por par y hace mucho más lento el LP de la raíz)
+            model.P_Sim = pyo.Set(initialize=self.Pares_Simetricos(), dimen=2)
+
+            def simetria(model,k,i,t):
+                return sum(model.x[k,j,t] for j in model.B) >= sum(model.x[i,j,t] for j in model.B)
+            model.simetria = pyo.Constraint(model.P_Sim, model.T, rule = simetria)
+
         return model.create_instance()
 
-    def Solver(self):
+    def Grupos_Simetricos(self):
+        # Camiones (desde 1) agrupados por capacidad
+        return [(grupo.index + 1).tolist() for _, grupo in self.Camiones.groupby('Capacidad', sort=False)]
+
+    def Pares_Simetricos(self):
+        # Pares (k, i) de camiones consecutivos con la misma capacidad
+        return [par for camiones in self.Grupos_Simetricos() for par in zip(camiones[:-1], camiones[1:])]
+
+    def Asignacion_Greedy(self):
+        # Asignación constructiva periodo a periodo: las zonas se recorren por penalidad (ZNV más el costo de
+        # lo pendiente) y volumen de demanda; cada zona va al camión con tiempo disponible y más capacidad libre
+        # (primero a los camiones sin visitas, por v_oblg) y se carga con los productos de mayor CNP por volumen
+        V = self.Producto['Volumen'].to_numpy(dtype=float)
+        CNP = self.Producto['CNP'].to_numpy(dtype=float)
+        CC = self.Camiones['Capacidad'].to_numpy(dtype=float)
+        TV = self.Zonas['T_Visita'].to_numpy(dtype=float)
+        ZNV = self.Zonas['ZNV'].to_numpy(dtype=float)
+        D = np.stack([self.Zonas[[f'Demanda_{l}_{t}' for l in range(1, self.N_Prod+1)]].to_numpy(dtype=float)
+                      for t in range(1, self.T+1)], axis=2)  # (J, L, T)
+        I, J, L = self.N_Cam, self.N_Zonas, self.N_Prod
+        x, y = np.zeros((I, J, self.T)), np.zeros((J, self.T))
+        z, w, d = np.zeros((I, self.T, L, J)), np.zeros((self.T, J, L)), np.zeros((J, L, self.T))
+        productos = np.argsort(-CNP / V)
+
+        pendiente = np.zeros((J, L))
+        for t in range(self.T):
+            d[:, :, t] = D[:, :, t] + pendiente
+            orden = np.lexsort((-(d[:, :, t] @ V), -(ZNV + d[:, :, t] @ CNP)))
+            tiempo, capacidad, visitas = np.full(I, float(self.T_Max)), CC.copy(), np.zeros(I)
+            for j in orden:
+                candidatos = np.flatnonzero(tiempo >= TV[j])
+                if len(candidatos) == 0:
+                    y[j, t] = 1
+                    continue
+                sin_visita = candidatos[visitas[candidatos] == 0]
+                if len(sin_visita):
+                    candidatos = sin_visita
+                i = candidatos[np.argmax(capacidad[candidatos])]
+                x[i, j, t] = 1
+                tiempo[i] -= TV[j]
+                visitas[i] += 1
+                for l in productos:
+                    carga = min(d[j, l, t], np.floor(capacidad[i] / V[l]))
+                    z[i, t, l, j] = carga
+                    capacidad[i] -= carga * V[l]
+            w[t] = d[:, :, t] - z[:, t].sum(axis=0).T
+            pendiente = w[t]
+
+            # Camiones iguales intercambiables: se reordenan por número de visitas para cumplir 'simetria'
+            for camiones in self.Grupos_Simetricos():
+                grupo = np.array(camiones) - 1
+                orden = grupo[np.argsort(-x[grupo, :, t].sum(axis=1), kind='stable')]
+                x[grupo, :, t], z[grupo, t] = x[orden, :, t], z[orden, t]
+
+        objetivo = (y * ZNV[:, None]).sum() + (w * CNP).sum()
+        return {'x': x, 'y': y, 'z': z, 'w': w, 'd': d}, objetivo
+
+    def Cargar_Arranque(self, Modelo_SP):
+        # Valores de Asignacion_Greedy en las variables del modelo (índices desde 1)
+        valores, objetivo = self.Asignacion_Greedy()
+        for nombre, arreglo in valores.items():
+            getattr(Modelo_SP, nombre).set_values({tuple(k + 1 for k in indice): valor
+                                                   for indice, valor in np.ndenumerate(arreglo)})
+        print('Objetivo de la asignación greedy: ' + str(objetivo))
+        return objetivo
+
+    def Solver(self, Tiempo_Limite=None, Gap=None):
 
         Modelo_SP = self.model()
-        self.opt = pyo.SolverFactory('glpk', executable=r"/home/notebook01/anaconda3/envs/io/bin/glpsol")
-        results = self.opt.solve(Modelo_SP)
+        if self.Arranque:
+            self.Cargar_Arranque(Modelo_SP)
+        results = self.opt.Resolver(Modelo_SP, Warmstart=self.Arranque, Tiempo_Limite=Tiempo_Limite, Gap=Gap)
+        self.results = results
         results.write()
+        print('Tiempos: ' + self.opt.Reporte())
 
-        print('Valor Función Objetivo: ' + str(value(Modelo_SP.FunObj)))
+        print('Valor Función Objetivo: ' + str(pyo.value(Modelo_SP.FunObj)))
+
+        return Modelo_SP
+
+    def Solver_Anytime(self, Tiempo_Limite, Gap=None, Directorio='Despacho', Formato='csv'):
+        # Resolución con plazo de despacho: cada incumbente mejorado se escribe de inmediato como el plan vigente
+        # (Plan_Visitas, Plan_No_Visitas, Plan_No_Entregados) y se agrega a Incumbentes.csv; al terminar se
+        # escribe Resumen.csv con estado, objetivo, cota, gap y nodos. Los incumbentes intermedios solo llegan
+        # con HiGHS (IO_SOLVER=appsi_highs); con otros solvers se escribe únicamente el plan final
+        Modelo_SP = self.model()
+        if self.Arranque:
+            self.Cargar_Arranque(Modelo_SP)
+        os.makedirs(Directorio, exist_ok=True)
+        Bitacora = os.path.join(Directorio, 'Incumbentes.csv')
+        pd.DataFrame(columns=['Tiempo_s', 'Objetivo', 'Cota', 'Gap']).to_csv(Bitacora, index=False)
+
+        def al_incumbente(tiempo, objetivo, cota):
+            self.Escribir_Plan(Modelo_SP, Directorio, Formato)
+            pd.DataFrame([[tiempo, objetivo, cota, Gap_Relativo(objetivo, cota)]]).to_csv(
+                Bitacora, mode='a', header=False, index=False)
+
+        self.opt.Al_Incumbente = al_incumbente
+        try:
+            results = self.opt.Resolver(Modelo_SP, Warmstart=self.Arranque, Tiempo_Limite=Tiempo_Limite, Gap=Gap)
+        finally:
+            self.opt.Al_Incumbente = None
+        self.results = results
+
+        # Plan final solo si el solver cargó una solución factible: sin incumbente las variables conservan sus
+        # valores iniciales (0) y el plan vacío se leería como un despacho válido de costo 0
+        objetivo = None
+        if self.opt.Con_Solucion:
+            objetivo = pyo.value(Modelo_SP.FunObj)
+            self.Escribir_Plan(Modelo_SP, Directorio, Formato)
+        cota = results.problem.lower_bound
+        Resumen = {'Estado': str(results.solver.termination_condition), 'Objetivo': objetivo, 'Cota': cota,
+                   'Gap': Gap_Relativo(objetivo, cota), 'Nodos': self.opt.Nodos,
+                   'Incumbentes': len(self.opt.Incumbentes), 'Tiempo_s': self.opt.Tiempos['solucion'],
+                   'Tiempo_Limite_s': Tiempo_Limite, 'Gap_Objetivo': Gap}
+        pd.DataFrame([Resumen]).to_csv(os.path.join(Directorio, 'Resumen.csv'), index=False)
+        print('Resumen: ' + ', '.join(f'{clave}: {valor}' for clave, valor in Resumen.items()))
 
         return Modelo_SP
 
-    def Print_Results(self,Modelo_SP):
+    def Escribir_Plan(self, Modelo_SP, Directorio, Formato='csv'):
+        # Se escribe en archivos temporales y se renombran (os.replace es atómico): quien lea el plan
+        # nunca ve un archivo a medio escribir
+        temporales = Escribir_Resultados(self.Tablas_Resultados(Modelo_SP, Solo_No_Nulos=True),
+                                         os.path.join(Directorio, '.Plan'), Formato)
+        for archivo in temporales:
+            os.replace(archivo, os.path.join(Directorio, os.path.basename(archivo)[1:]))
+
+    def Tablas_Resultados(self, Modelo_SP, Solo_No_Nulos=False):
+        Table_Visitas = Tabla_Variable(Modelo_SP.x, ['Camiones', 'Zona', 'Tiempo'], 'Valor', decimales=6,
+                                       solo_no_nulos=Solo_No_Nulos, orden=['Camiones', 'Tiempo', 'Zona'])
+        Table_No_Visitas = Tabla_Variable(Modelo_SP.y, ['Zona', 'Tiempo'], 'Valor', decimales=6,
+                                          solo_no_nulos=Solo_No_Nulos, orden=['Tiempo', 'Zona'])
+        Table_No_Entregados = Tabla_Variable(Modelo_SP.w, ['Tiempo', 'Zona', 'Producto'], 'Valor', decimales=6,
+                                             solo_no_nulos=Solo_No_Nulos, orden=['Tiempo', 'Zona', 'Producto'])
+        return {'Visitas': Table_Visitas, 'No_Visitas': Table_No_Visitas, 'No_Entregados': Table_No_Entregados}
+
+    def Print_Results(self,Modelo_SP, Formato=None, Solo_No_Nulos=False):
 
         # ### Creating Excel Output ## ---------------------------------->
-        Table_Visitas = pd.DataFrame()
-        Table_No_Visitas = pd.DataFrame()
-        Table_No_Entregados = pd.DataFrame()
-
-        r=0
-        for i in Modelo_SP.C:
-            for t in Modelo_SP.T:
-                for j in Modelo_SP.B:
-                    Table_Visitas.loc[r,'Camiones'] = i
-                    Table_Visitas.loc[r,'Tiempo'] = t
-                    Table_Visitas.loc[r,'Zona'] = j
-                    Table_Visitas.loc[r,'Valor'] = round(Modelo_SP.x[i,j,t].value,6)
-                    r += 1
-
-        r=0
-        for t in Modelo_SP.T:
-            for j in Modelo_SP.B:
-                Table_No_Visitas.loc[r,'Tiempo'] = t
-                Table_No_Visitas.loc[r,'Zona'] = j
-                Table_No_Visitas.loc[r,'Valor'] = round(Modelo_SP.y[j,t].value,6)
-                r += 1
-
-        r=0
-        for t in Modelo_SP.T:
-            for j in Modelo_SP.B:
-                for l in Modelo_SP.C:
-                    Table_No_Entregados.loc[r,'Tiempo'] = t
-                    Table_No_Entregados.loc[r,'Zona'] = j
-                    Table_No_Entregados.loc[r,'Producto'] = l
-                    Table_No_Entregados.loc[r,'Valor'] = round(Modelo_SP.w[t,j,l].value,6)
-                    r += 1
-
-        with pd.ExcelWriter('Results.xlsx') as data:
-            Table_Visitas.to_excel(data, sheet_name='Visitas')
-            Table_No_Visitas.to_excel(data, sheet_name='No_Visitas')
-            Table_No_Entregados.to_excel(data, sheet_name='No_Entregados')
+        Escribir_Resultados(self.Tablas_Resultados(Modelo_SP, Solo_No_Nulos), 'Results.xlsx', Formato, index=True)
 
 
 if __name__ == "__main__":
-    runing = Scheduling_Problem()
-    runing.ReadExcelFile(r'/home/notebook01/Proyectos/Investigacion-Operaciones/Problema_05_05/Data_Input_SM.xlsx')
-    modelo = runing.Solver()
-    runing.Print_Results(modelo)
\ No newline at end of file
+    # Sin --tiempo resuelve hasta el óptimo y escribe Results.xlsx; con --tiempo usa el modo anytime
+    import argparse
+    parser = argparse.ArgumentParser(description='Scheduling de camiones')
+    parser.add_argument('--archivo', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data_Input_SM.xlsx'))
+    parser.add_argument('--tiempo', type=float, help='Plazo de despacho (s): escribe cada incumbente en --directorio')
+    parser.add_argument('--gap', type=float, help='Gap relativo objetivo')
+    parser.add_argument('--directorio', default='Despacho')
+    parser.add_argument('--formato', default='csv', choices=['xlsx', 'csv', 'parquet'])
+    parser.add_argument('--arranque', action='store_true', help='Simetría, M ajustado y arranque greedy')
+    args = parser.parse_args()
+
+    runing = Scheduling_Problem(Simetria=args.arranque, M_Ajustado=args.arranque, Arranque=args.arranque)
+    runing.ReadExcelFile(args.archivo)
+    if args.tiempo is None:
+        modelo = runing.Solver(Gap=args.gap)
+        runing.Print_Results(modelo)
+    else:
+        runing.Solver_Anytime(args.tiempo, args.gap, args.directorio, args.formato)
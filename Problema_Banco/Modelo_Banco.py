@@ -1,10 +1,17 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 from pyomo.environ import * 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Tabla_Columnas, Escribir_Resultados
+from Solucionador import Solucionador
+
 class Problema_Dieta:
     def __init__(self, name=None):
         self.Data = []
+        self.opt = Solucionador()
 
     def ReadExcelFile(self, FileName):
         self.Data = pd.read_excel(FileName, sheet_name='Problema_Banco/Datos.csv')
@@ -55,28 +62,20 @@ class Problema_Dieta:
     def Solver(self):
 
         Modelo_dieta = self.Model()
-        #self.opt = SolverFactory('glpk', executable=r'/home/pc01/anaconda3/envs/io/bin/glpsol)
-        self.opt = SolverFactory('glpk', executable=r'/home/pc01/anaconda3/envs/io/bin/glpsol')
-        #self.opt = SolverFactory("glpk")
-        results = self.opt.solve(Modelo_dieta)
+        results = self.opt.Resolver(Modelo_dieta)
         results.write()
+        print('Tiempos: ' + self.opt.Reporte())
 
         print('Valor Función Objetivo: ' + str(value(Modelo_dieta.FunObj)))
 
         return Modelo_dieta
 
-    def Print_Results(self,Modelo_dieta):
-
-        Table = pd.DataFrame()
+    def Print_Results(self,Modelo_dieta, Formato=None):
 
-        r=0
-        for i in Modelo_dieta.A:
-            Table.loc[r,'Tipo Forraje'] = str(i)
-            Table.loc[r,'Libras'] = round(Modelo_dieta.x[i].value,4)
-            r += 1
+        Table = Tabla_Columnas({'Libras': Modelo_dieta.x}, 'Tipo Forraje')
+        Table['Tipo Forraje'] = Table['Tipo Forraje'].astype(str)
 
-        with pd.ExcelWriter('Resultados.xlsx') as data: 
-            Table.to_excel(data, sheet_name="Resultados")
+        Escribir_Resultados({'Resultados': Table}, 'Resultados.xlsx', Formato, index=True)
 
 if __name__ == "__main__":
     runing = Problema_Dieta()
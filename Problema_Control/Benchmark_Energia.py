@@ -0,0 +1,173 @@
+import argparse
+import importlib.util
+import os
+import sys
+import time
+import tracemalloc
+from importlib.machinery import SourceFileLoader
+import pandas as pd
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(DIRECTORIO)
+from Generador_Instancias import Generar_Alimentador
+
+def Cargar_Modulo(nombre='Modelo_5_Nodos'):
+    # Modelo_5_Nodos no tiene extension .py: se carga explicitamente desde el archivo
+    cargador = SourceFileLoader(nombre, os.path.join(DIRECTORIO, nombre))
+    spec = importlib.util.spec_from_loader(nombre, cargador)
+    modulo = importlib.util.module_from_spec(spec)
+    # Registrado en sys.modules para que los procesos de SolveModel_Periodos encuentren sus funciones
+    sys.modules[nombre] = modulo
+    cargador.exec_module(modulo)
+    return modulo
+
+Modelo_5_Nodos = Cargar_Modulo()
+EnergyExchangeModel = Modelo_5_Nodos.EnergyExchangeModel
+
+# Numero de nodos de los alimentadores radiales a comparar
+TAMANOS = [5, 100, 1000]
+
+def Medir_Construccion(tamanos=TAMANOS, N_periodos=24, repeticiones=1, Pares='adyacencia'):
+    # Tiempo de BuildModel sobre alimentadores sinteticos, con el tamaño del modelo resultante.
+    # Pares='todos' deja e denso (todos los pares de nodos) para medir solo las listas de incidencia
+    Tabla = []
+    for N_buses in tamanos:
+        modelo = EnergyExchangeModel(Pares_Intercambio=Pares)
+        modelo.LoadData(Generar_Alimentador(N_buses, N_periodos))
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            modelo.BuildModel()
+            tiempos.append(time.perf_counter() - inicio)
+        Tabla.append({'Nodos': N_buses, 'Lineas': modelo.N_lines, 'Periodos': N_periodos, 'Pares': Pares,
+                      'Variables': modelo.model.nvariables(), 'Restricciones': modelo.model.nconstraints(),
+                      'Tiempo_s': round(min(tiempos), 3)})
+        print(Tabla[-1])
+    return pd.DataFrame(Tabla)
+
+def Instancias(tamanos, N_periodos=24, Archivo=None):
+    # (nombre, hojas) de Data_Input.xlsx (si se indica) y de los alimentadores sinteticos
+    if Archivo:
+        yield 'Data_Input', Archivo
+    for N_buses in tamanos:
+        yield f'Radial_{N_buses}', Generar_Alimentador(N_buses, N_periodos)
+
+def Medir_Solucion(instancias, Configuraciones, Tiempo_Limite=600):
+    # Resuelve cada instancia con cada configuracion ({'nombre': argumentos de EnergyExchangeModel})
+    Tabla = []
+    for nombre, datos in instancias:
+        for configuracion, argumentos in Configuraciones.items():
+            modelo = EnergyExchangeModel(**argumentos)
+            modelo.opt.Tee = False
+            if isinstance(datos, str):
+                modelo.ReadExcelFile(datos)
+            else:
+                modelo.LoadData(datos)
+            inicio = time.perf_counter()
+            modelo.BuildModel()
+            construccion = time.perf_counter() - inicio
+            results = modelo.opt.Resolver(modelo.model, Tiempo_Limite=Tiempo_Limite, Gap=0.01)
+            Tabla.append({'Instancia': nombre, 'Configuracion': configuracion,
+                          'Estado': str(results.solver.termination_condition),
+                          'Objetivo': results.problem.upper_bound, 'Nodos': modelo.opt.Nodos,
+                          'Construccion_s': round(construccion, 3), 'Solucion_s': round(modelo.opt.Tiempos['solucion'], 3)})
+            print(Tabla[-1])
+    return pd.DataFrame(Tabla)
+
+def Medir_Intercambio(tamanos, N_periodos=24, Pares=('todos', 'adyacencia')):
+    # Variables de intercambio y memoria maxima de BuildModel (tracemalloc) con pares densos vs. adyacencia
+    Tabla = []
+    for N_buses in tamanos:
+        hojas = Generar_Alimentador(N_buses, N_periodos)
+        for pares in Pares:
+            modelo = EnergyExchangeModel(Pares_Intercambio=pares)
+            modelo.LoadData(hojas)
+            tracemalloc.start()
+            inicio = time.perf_counter()
+            modelo.BuildModel()
+            tiempo = time.perf_counter() - inicio
+            memoria = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            Tabla.append({'Nodos': N_buses, 'Periodos': N_periodos, 'Pares': pares,
+                          'Variables_e': len(modelo.model.e), 'Variables': modelo.model.nvariables(),
+                          'Memoria_MB': round(memoria, 1), 'Tiempo_s': round(tiempo, 3)})
+            print(Tabla[-1])
+            del modelo
+    return pd.DataFrame(Tabla)
+
+def Medir_Cortes(N_buses, horizontes, Smax=0.25, Segmentos=(4,)):
+    # Limite termico completo vs. planos de corte (partiendo de cada numero de Segmentos) en horizontes crecientes,
+    # en una red enmallada (N_buses/2 lazos) con Smax bajo para que algunas lineas queden activas. Con Smax=0.15
+    # en 30 nodos los segmentos iniciales se violan y los cortes necesitan varias rondas
+    Tabla = []
+    for N_periodos in horizontes:
+        hojas = Generar_Alimentador(N_buses, N_periodos, Smax=Smax, Lazos=N_buses // 2)
+        for modo, segmentos in [('completo', None)] + [('perezoso', n) for n in Segmentos]:
+            modelo = EnergyExchangeModel(Limite_Termico=modo)
+            modelo.opt.Tee = False
+            if segmentos is not None:
+                modelo.Segmentos_Iniciales = segmentos
+            modelo.LoadData(hojas)
+            inicio = time.perf_counter()
+            modelo.BuildModel()
+            results = modelo.SolveModel()
+            Tabla.append({'Nodos': N_buses, 'Periodos': N_periodos, 'Smax': Smax, 'Modo': modo,
+                          'Segmentos_Iniciales': segmentos, 'Estado': str(results.solver.termination_condition),
+                          'Objetivo': results.problem.upper_bound, 'Segmentos': len(modelo.model.ThermalLimit),
+                          'Iteraciones': getattr(modelo, 'Iteraciones', 1), 'Convergido': getattr(modelo, 'Convergido', True),
+                          'Tiempo_s': round(time.perf_counter() - inicio, 3)})
+            print(Tabla[-1])
+    return pd.DataFrame(Tabla)
+
+def Medir_Periodos(tamanos, N_periodos=24, Bloque=24, Procesos=None, Gap=1e-6):
+    # Modelo completo vs. un subproblema por bloque de periodos en paralelo; con gap pequeño ambos objetivos coinciden
+    Tabla = []
+    for N_buses in tamanos:
+        hojas = Generar_Alimentador(N_buses, N_periodos)
+        for modo in ('completo', 'periodos'):
+            modelo = EnergyExchangeModel()
+            modelo.opt.Tee = False
+            modelo.Gap = Gap
+            modelo.LoadData(hojas)
+            inicio = time.perf_counter()
+            if modo == 'completo':
+                modelo.BuildModel()
+                results = modelo.SolveModel()
+            else:
+                results = modelo.SolveModel_Periodos(Bloque, Procesos)
+            Tabla.append({'Nodos': N_buses, 'Periodos': N_periodos, 'Modo': modo,
+                          'Estado': str(results.solver.termination_condition), 'Objetivo': getattr(modelo, 'Objetivo', None),
+                          'Tiempo_s': round(time.perf_counter() - inicio, 3)})
+            print(Tabla[-1])
+    return pd.DataFrame(Tabla)
+
+# Formulaciones de la exclusividad compra/venta a comparar
+EXCLUSIVIDAD = {'bigM': {'Exclusividad': 'bigM'}, 'ajustada': {'Exclusividad': 'ajustada'}, 'sos1': {'Exclusividad': 'sos1'}}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks de EnergyExchangeModel en alimentadores radiales')
+    parser.add_argument('prueba', nargs='?', default='construccion', choices=['construccion', 'exclusividad', 'intercambio', 'cortes', 'periodos'])
+    parser.add_argument('--nodos', type=int, nargs='+', default=TAMANOS)
+    parser.add_argument('--periodos', type=int, default=24)
+    parser.add_argument('--repeticiones', type=int, default=1)
+    parser.add_argument('--bloque', type=int, default=24, help='Periodos por subproblema (prueba periodos)')
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--smax', type=float, default=0.25, help='Limite termico de las lineas (prueba cortes)')
+    parser.add_argument('--segmentos', type=int, nargs='+', default=[4], help='Segmentos iniciales (prueba cortes)')
+    parser.add_argument('--pares', default='adyacencia', choices=['adyacencia', 'todos'],
+                        help='Pares de intercambio (prueba construccion)')
+    parser.add_argument('--archivo', default=os.path.join(DIRECTORIO, 'Data_Input.xlsx'))
+    args = parser.parse_args()
+
+    if args.prueba == 'construccion':
+        Tabla = Medir_Construccion(args.nodos, args.periodos, args.repeticiones, args.pares)
+    elif args.prueba == 'cortes':
+        Tabla = Medir_Cortes(args.nodos[0], [args.periodos, 7 * args.periodos, 30 * args.periodos], args.smax,
+                             args.segmentos)
+    elif args.prueba == 'periodos':
+        Tabla = Medir_Periodos(args.nodos, args.periodos, args.bloque, args.procesos)
+    elif args.prueba == 'intercambio':
+        Tabla = Medir_Intercambio(args.nodos, args.periodos)
+    else:
+        Tabla = Medir_Solucion(Instancias(args.nodos, args.periodos, args.archivo), EXCLUSIVIDAD)
+    print(Tabla.to_string(index=False))
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+def Generar_Alimentador(N_buses, N_periodos=24, N_circum=12, Carga_Total=1.0, Smax=10.0, Lazos=0, semilla=0):
+    # Alimentador radial sintetico con las hojas de Data_Input.xlsx (mismo esquema).
+    # El nodo 1 es el slack (sin demanda ni generacion) y puede vender a la red toda la carga,
+    # el ultimo nodo compensa la potencia reactiva (suma de QL igual a cero) para que la instancia sea factible.
+    # Lazos > 0 agrega lineas extra entre nodos no conectados (red enmallada, los flujos pueden redistribuirse)
+    rng = np.random.default_rng(semilla)
+    buses = np.arange(1, N_buses + 1)
+
+    # Arbol aleatorio: cada nodo cuelga de uno anterior (profundidad esperada O(log N))
+    padres = np.array([rng.integers(1, k) for k in range(2, N_buses + 1)], dtype=int)
+    hijos = buses[1:]
+    existentes = set(zip(padres.tolist(), hijos.tolist()))
+    while Lazos > 0 and len(existentes) < N_buses * (N_buses - 1) // 2:
+        i, j = sorted(rng.choice(buses, size=2, replace=False).tolist())
+        if (i, j) not in existentes:
+            existentes.add((i, j))
+            padres, hijos = np.append(padres, i), np.append(hijos, j)
+            Lazos -= 1
+
+    PL = rng.uniform(0.5, 1.5, size=N_buses) * Carga_Total / max(N_buses - 1, 1)
+    PL[0] = 0.0
+    QL = (0.1 * PL).round(6)
+    if N_buses > 1:
+        QL[-1] = -QL[:-1].sum()
+    DG = np.where(rng.random(N_buses) < 0.3, PL, 0.0).round(4)
+    DG[0] = 0.0
+    P_SG_max = np.zeros(N_buses)
+    P_SG_max[0] = 1.5 * PL.sum()
+    P_BG_max = np.zeros(N_buses)
+    P_BG_max[0] = 1.5 * PL.sum()
+
+    Buses = pd.DataFrame({
+        'bus_i': buses, 'type': 1, 'PL': PL.round(6), 'QL': QL,
+        'Vmax': np.where(buses == 1, 1.0, 1.1), 'Vmin': np.where(buses == 1, 1.0, 0.9),
+        'DG': DG, 'BT': 0.0, 'BT_Loc': 0, 'P_SG_max': P_SG_max.round(6), 'P_BG_max': P_BG_max.round(6),
+    })
+
+    r = rng.uniform(0.0005, 0.003, size=len(padres)).round(5)
+    Lines = pd.DataFrame({'fbus': padres, 'tbus': hijos, 'r': r, 'x': (10 * r).round(5), 'Smax': Smax})
+
+    adyacencia = np.zeros((N_buses, N_buses), dtype=int)
+    adyacencia[padres - 1, hijos - 1] = 1
+    adyacencia[hijos - 1, padres - 1] = 1
+    Adj_Matrix = pd.DataFrame(adyacencia, columns=range(N_buses))
+
+    # Perfil solar normalizado por hora para la generacion local de los nodos con DG
+    horas = np.arange(1, N_periodos + 1)
+    solar = np.clip(np.sin(np.pi * ((horas - 1) % 24 - 6) / 12), 0, None)
+    Precio = (50 + 15 * np.sin(np.pi * ((horas - 1) % 24 - 8) / 12) + rng.normal(0, 2, size=N_periodos)).round(2)
+    Profiles = pd.DataFrame({'Hour': horas, 'PG_max': 0.0, 'Price': Precio, 'Selling_Price': (Precio / 3).round(3)})
+    generacion = pd.DataFrame((solar[:, None] * DG[None, :]).round(4), columns=[f'P_{i}' for i in buses])
+    Profiles = pd.concat([Profiles, generacion], axis=1)
+
+    # Poligono regular de N_circum lados que aproxima el circulo del limite termico
+    angulos = 2 * np.pi * np.arange(N_circum) / N_circum
+    Circum = pd.DataFrame({'AA': np.cos(angulos).round(4), 'BB': np.sin(angulos).round(4), 'CC': -1.0})
+
+    return {'Buses': Buses, 'Lines': Lines, 'Adj_Matrix': Adj_Matrix, 'Profiles': Profiles, 'Circum': Circum}
+
+def Escribir_Instancia(hojas, FileName):
+    with pd.ExcelWriter(FileName) as writer:
+        for nombre, tabla in hojas.items():
+            tabla.to_excel(writer, sheet_name=nombre, index=False)
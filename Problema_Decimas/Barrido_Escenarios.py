@@ -0,0 +1,127 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from pyomo.environ import value
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Escribir_Resultados, FORMATOS
+from Solucionador import Es_Optimo
+from Problema_GreenPharma import Problema_GreenPharma, Leer_Arreglos
+
+HOJAS_ESCENARIO = ('Produccion', 'Demanda')
+
+# Estado de cada proceso: el modelo se construye una vez (con P y D mutables) y se reutiliza en todos sus escenarios
+_problema = None
+_modelo = None
+_hojas_base = None  # Cada escenario parte de estas hojas, no de las del escenario anterior del mismo proceso
+
+def Escenarios_Directorio(Directorio):
+    # Un escenario por archivo xlsx; cada archivo trae la hoja Demanda y/o Produccion (las ausentes quedan como la base)
+    for archivo in sorted(glob.glob(os.path.join(Directorio, '*.xlsx'))):
+        yield os.path.splitext(os.path.basename(archivo))[0], archivo
+
+def Escenarios_Perturbados(Problema_base, N_escenarios, Desviacion=0.1, semilla=0):
+    # Variantes sinteticas de la base: demanda y produccion multiplicadas por un factor lognormal por celda
+    rng = np.random.default_rng(semilla)
+    for k in range(1, N_escenarios + 1):
+        hojas = {}
+        for nombre in HOJAS_ESCENARIO:
+            tabla = getattr(Problema_base, nombre).copy()
+            factor = rng.lognormal(0.0, Desviacion, size=(len(tabla), tabla.shape[1] - 1))
+            tabla.iloc[:, 1:] = (tabla.iloc[:, 1:].to_numpy(dtype=float) * factor).round(2)
+            hojas[nombre] = tabla
+        yield f'Escenario_{k}', hojas
+
+def Leer_Escenario(fuente):
+    # fuente: ruta a un xlsx o diccionario {'Demanda': DataFrame, 'Produccion': DataFrame}
+    if isinstance(fuente, dict):
+        return fuente
+    libro = pd.ExcelFile(fuente)
+    return {hoja: libro.parse(hoja) for hoja in HOJAS_ESCENARIO if hoja in libro.sheet_names}
+
+def _Iniciar_Proceso(Hojas_base):
+    global _problema, _modelo, _hojas_base
+    _hojas_base = Hojas_base
+    _problema = Problema_GreenPharma()
+    # Un hilo por proceso: el paralelismo viene de los procesos, no del solver
+    if _problema.opt.Persistente:
+        _problema.opt.Opciones['threads'] = 1
+    for nombre, tabla in Hojas_base.items():
+        setattr(_problema, nombre, tabla)
+    Leer_Arreglos(_problema)
+    _modelo = _problema.Model(Mutable=True)
+
+def _Resolver_Escenario(tarea):
+    nombre, fuente, Solo_No_Nulos, Tablas = tarea
+    inicio = time.perf_counter()
+    try:
+        hojas = Leer_Escenario(fuente)
+        _problema.Actualizar_Escenario(_modelo, *(hojas.get(hoja, _hojas_base[hoja]) for hoja in HOJAS_ESCENARIO))
+        results = _problema.opt.Resolver(_modelo, Warmstart=True)
+    except Exception as error:
+        return {'Escenario': nombre, 'Estado': f'error: {error}', 'FunObj': np.nan,
+                'Tiempo_s': time.perf_counter() - inicio, 'PID': os.getpid()}, {}
+
+    resumen = {'Escenario': nombre, 'Estado': str(results.solver.termination_condition),
+               'FunObj': value(_modelo.FunObj) if Es_Optimo(results) else np.nan,
+               'Tiempo_s': time.perf_counter() - inicio, 'PID': os.getpid()}
+    tablas = {}
+    if Tablas and Es_Optimo(results):
+        for hoja, Table in _problema.Tablas_Resultados(_modelo, Solo_No_Nulos).items():
+            Table.insert(0, 'Escenario', nombre)
+            tablas[hoja] = Table
+    return resumen, tablas
+
+def Barrido(Escenarios, Hojas_base, Procesos=None, Solo_No_Nulos=True, Tablas=True):
+    # Escenarios: iterable de (nombre, fuente). Devuelve {'Resumen': ..., 'Transporte': ..., ...} consolidado
+    Procesos = Procesos or os.cpu_count()
+    tareas = [(nombre, fuente, Solo_No_Nulos, Tablas) for nombre, fuente in Escenarios]
+    # Bloques de varias tareas por envio para no pagar la comunicacion por escenario
+    bloque = max(1, len(tareas) // (4 * Procesos))
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=Procesos, initializer=_Iniciar_Proceso, initargs=(Hojas_base,)) as executor:
+        salidas = list(executor.map(_Resolver_Escenario, tareas, chunksize=bloque))
+    total = time.perf_counter() - inicio
+
+    Resultados = {'Resumen': pd.DataFrame([resumen for resumen, _ in salidas])}
+    for hoja in ('Transporte', 'Inventario', 'Stock'):
+        partes = [tablas[hoja] for _, tablas in salidas if hoja in tablas]
+        if partes:
+            Resultados[hoja] = pd.concat(partes, ignore_index=True)
+    print(f'{len(tareas)} escenarios en {total:.2f} s con {Procesos} procesos')
+    return Resultados
+
+def Hojas_Base(FileName):
+    problema = Problema_GreenPharma()
+    problema.ReadExcelFile(FileName)
+    hojas = {nombre: getattr(problema, nombre)
+             for nombre in ('Produccion', 'Demanda', 'Costos_Fabricas', 'Costos_Transporte', 'Costos_Centros')}
+    return problema, hojas
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Barrido de escenarios de demanda/produccion GreenPharma')
+    parser.add_argument('--base', default='Data_Input.xlsx', help='Archivo con los costos y las hojas por defecto')
+    parser.add_argument('--directorio', help='Directorio con un xlsx por escenario (hojas Demanda y/o Produccion)')
+    parser.add_argument('--sinteticos', type=int, default=0, help='Numero de escenarios perturbados a partir de la base')
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--salida', default='Resultados_Escenarios.xlsx')
+    parser.add_argument('--formato', default=None, choices=FORMATOS, help='Por defecto IO_FORMATO_SALIDA (o xlsx)')
+    parser.add_argument('--dispersas', action='store_true', help='Guardar solo las filas con valores no nulos')
+    parser.add_argument('--solo-resumen', action='store_true', help='No consolidar las tablas de transporte/inventario/stock')
+    args = parser.parse_args()
+
+    problema, hojas = Hojas_Base(args.base)
+    if args.directorio:
+        escenarios = Escenarios_Directorio(args.directorio)
+    else:
+        escenarios = Escenarios_Perturbados(problema, args.sinteticos or 8)
+
+    Resultados = Barrido(escenarios, hojas, args.procesos, Tablas=not args.solo_resumen)
+    print(Resultados['Resumen'].to_string(index=False))
+    Escribir_Resultados(Resultados, args.salida, args.formato, Dispersas=args.dispersas or None)
@@ -0,0 +1,39 @@
+import argparse
+import time
+import pandas as pd
+from Problema_GreenPharma import Problema_GreenPharma
+from Generador_Instancias import Generar_Instancia, Cargar_Instancia
+
+# Tamaños (fabricas, centros, periodos) a comparar
+TAMANOS = [(10, 12, 24), (50, 200, 24), (100, 500, 52), (200, 1000, 52)]
+
+def Medir_Construccion(tamanos=TAMANOS, modos=('Reglas', 'Arreglos'), repeticiones=1):
+    # Tiempo de construccion de la instancia (create_instance vs ConcreteModel) por tamaño y modo
+    Tabla = []
+    for N_fabricas, N_centros, N_periodos in tamanos:
+        problema = Cargar_Instancia(Problema_GreenPharma(), Generar_Instancia(N_fabricas, N_centros, N_periodos))
+        for modo in modos:
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                modelo = problema.Model(modo)
+                tiempos.append(time.perf_counter() - inicio)
+                del modelo
+            Tabla.append({'Fabricas': N_fabricas, 'Centros': N_centros, 'Periodos': N_periodos,
+                          'Variables': N_fabricas * N_centros * N_periodos + (N_fabricas + N_centros) * N_periodos,
+                          'Modo': modo, 'Tiempo_s': round(min(tiempos), 3)})
+            print(Tabla[-1])
+    Tabla = pd.DataFrame(Tabla)
+    Resumen = Tabla.pivot_table(index=['Fabricas', 'Centros', 'Periodos'], columns='Modo', values='Tiempo_s')
+    if {'Reglas', 'Arreglos'} <= set(Resumen.columns):
+        Resumen['Aceleracion'] = (Resumen['Reglas'] / Resumen['Arreglos']).round(2)
+    return Tabla, Resumen
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Comparacion de construccion Reglas vs Arreglos (GreenPharma)')
+    parser.add_argument('--max', type=int, default=len(TAMANOS), help='Numero de tamaños a medir')
+    parser.add_argument('--repeticiones', type=int, default=1)
+    args = parser.parse_args()
+
+    _, Resumen = Medir_Construccion(TAMANOS[:args.max], repeticiones=args.repeticiones)
+    print(Resumen.to_string())
@@ -0,0 +1,56 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from Problema_GreenPharma import Problema_GreenPharma
+from Generador_Instancias import Generar_Instancia, Cargar_Instancia
+from Salida_Resultados import Escribir_Resultados, FORMATOS
+
+# Tamaño (fabricas, centros, periodos) por defecto: ~240 mil filas de transporte
+TAMANO = (50, 200, 24)
+
+def Tablas_GreenPharma(N_fabricas, N_centros, N_periodos):
+    # Tablas de resultados de una instancia sintetica resuelta por la forma matricial (sin Pyomo)
+    problema = Cargar_Instancia(Problema_GreenPharma(), Generar_Instancia(N_fabricas, N_centros, N_periodos))
+    _, Solucion = problema.Resolver_Matricial()
+    return problema.Tablas_Resultados(Solucion)
+
+def Medir_Salida(tablas, formatos=FORMATOS, repeticiones=1):
+    # Tiempo de escritura y tamaño total de los archivos por formato, con todas las filas y solo las no nulas
+    Tabla = []
+    directorio = tempfile.mkdtemp()
+    try:
+        for formato in formatos:
+            for dispersas in (False, True):
+                tiempos = []
+                for _ in range(repeticiones):
+                    inicio = time.perf_counter()
+                    archivos = Escribir_Resultados(tablas, os.path.join(directorio, 'Resultados.xlsx'), formato,
+                                                   Dispersas=dispersas)
+                    tiempos.append(time.perf_counter() - inicio)
+                Tabla.append({'Formato': formato, 'Dispersas': dispersas, 'Tiempo_s': round(min(tiempos), 3),
+                              'Tamano_MB': round(sum(os.path.getsize(a) for a in archivos)/2**20, 2)})
+                print(Tabla[-1])
+                for archivo in archivos:
+                    os.remove(archivo)
+    finally:
+        shutil.rmtree(directorio)
+    Tabla = pd.DataFrame(Tabla)
+    # Aceleracion respecto a pd.ExcelWriter con todas las filas (la escritura anterior)
+    referencia = Tabla.loc[(Tabla['Formato'] == 'xlsx_openpyxl') & ~Tabla['Dispersas'], 'Tiempo_s']
+    if len(referencia):
+        Tabla['Aceleracion'] = (referencia.iloc[0] / Tabla['Tiempo_s']).round(1)
+    return Tabla
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Tiempo y tamaño de escritura de resultados GreenPharma por formato')
+    parser.add_argument('--tamano', type=int, nargs=3, default=TAMANO, metavar=('FABRICAS', 'CENTROS', 'PERIODOS'))
+    parser.add_argument('--formatos', nargs='+', default=FORMATOS, choices=FORMATOS)
+    parser.add_argument('--repeticiones', type=int, default=1)
+    args = parser.parse_args()
+
+    tablas = Tablas_GreenPharma(*args.tamano)
+    print({hoja: len(Table) for hoja, Table in tablas.items()})
+    print(Medir_Salida(tablas, args.formatos, args.repeticiones).to_string(index=False))
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+def Generar_Instancia(N_fabricas, N_centros, N_periodos, semilla=0):
+    # Genera las hojas de Data_Input.xlsx (mismo esquema) para una instancia sintetica factible
+    rng = np.random.default_rng(semilla)
+    periodos = np.arange(1, N_periodos + 1)
+
+    demanda = rng.uniform(30, 80, size=(N_periodos, N_centros)).round(2)
+    # La produccion total cubre la demanda de cada periodo con holgura
+    reparto = rng.dirichlet(np.ones(N_fabricas), size=N_periodos)
+    produccion = (reparto * demanda.sum(axis=1, keepdims=True) * rng.uniform(1.1, 1.4, size=(N_periodos, 1))).round(2)
+    # La capacidad de transporte permite despachar la produccion de cualquier periodo
+    capacidad = (produccion.max(axis=0) * 1.05).round(2)
+
+    Produccion = pd.DataFrame(produccion, columns=[f'Produccion_{i}' for i in range(1, N_fabricas + 1)])
+    Produccion.insert(0, 'Periodo', periodos)
+
+    Demanda = pd.DataFrame(demanda, columns=[f'Demanda_{j}' for j in range(1, N_centros + 1)])
+    Demanda.insert(0, 'Periodo', periodos)
+
+    Costos_Fabricas = pd.DataFrame({
+        'Fabrica': np.arange(1, N_fabricas + 1),
+        'Costo_mantener_stock': rng.uniform(20, 35, size=N_fabricas).round(2),
+        'Capacidad_transporte': capacidad,
+    })
+
+    Costos_Centros = pd.DataFrame({
+        'Centro': np.arange(1, N_centros + 1),
+        'Costo_inventario': rng.uniform(0.5, 2.0, size=N_centros).round(2),
+    })
+
+    Costos_Transporte = pd.DataFrame(rng.uniform(4, 10, size=(N_fabricas, N_centros)).round(2),
+                                     columns=[f'Costo_transporte_C{j}' for j in range(1, N_centros + 1)])
+    Costos_Transporte.insert(0, 'Fabrica', np.arange(1, N_fabricas + 1))
+
+    return {
+        'Produccion': Produccion,
+        'Demanda': Demanda,
+        'Costos_Fabricas': Costos_Fabricas,
+        'Costos_Transporte': Costos_Transporte,
+        'Costos_Centros': Costos_Centros,
+    }
+
+def Cargar_Instancia(problema, hojas):
+    # Asigna las hojas generadas a una instancia de Problema_GreenPharma(_Dual) sin pasar por Excel
+    from Problema_GreenPharma import Leer_Arreglos
+    for nombre, tabla in hojas.items():
+        setattr(problema, nombre, tabla)
+    Leer_Arreglos(problema)
+    return problema
+
+def Escribir_Instancia(hojas, FileName):
+    with pd.ExcelWriter(FileName) as writer:
+        for nombre, tabla in hojas.items():
+            tabla.to_excel(writer, sheet_name=nombre, index=False)
@@ -0,0 +1,121 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from pyomo.environ import value
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Extraer_Valores, Escribir_Resultados
+from Instrumentacion import Memoria_Maxima
+from Solucionador import Es_Optimo
+from Problema_GreenPharma import Problema_GreenPharma
+from Generador_Instancias import Generar_Instancia, Cargar_Instancia
+
+def Resolver_Ventanas(problema, W, Paso=None, Solo_No_Nulos=True):
+    # Horizonte rodante: ventanas de W periodos; se fijan los primeros 'Paso' periodos de cada ventana
+    # y su inventario final pasa como inventario inicial de la siguiente. Solo una ventana vive en memoria.
+    Paso = Paso or max(1, W // 2)
+    if not 1 <= Paso <= W:
+        raise ValueError(f'Paso debe estar entre 1 y W={W}')
+    I, J, T = problema.N_fabricas, problema.N_centros, problema.N_periodos
+    y0 = np.zeros(J)
+    Costo = 0.0
+    Resumen, Transporte, Inventario, Stock = [], [], [], []
+
+    inicio = 1
+    while inicio <= T:
+        fin = min(inicio + W - 1, T)
+        # En la ultima ventana se fijan todos sus periodos
+        fijos = fin - inicio + 1 if fin == T else Paso
+        reloj = time.perf_counter()
+        modelo = problema.Model(Periodos=(inicio, fin), Inventario_Inicial=y0)
+        results = problema.opt.Resolver(modelo)
+        Resumen.append({'Inicio': inicio, 'Fin': fin, 'Fijos': fijos, 'Estado': str(results.solver.termination_condition),
+                        'Variables': modelo.nvariables(), 'Tiempo_s': round(time.perf_counter() - reloj, 4)})
+        if not Es_Optimo(results):
+            print(f'Ventana {inicio}-{fin} sin solucion optima: {results.solver.termination_condition}')
+            return None, pd.DataFrame(Resumen), {}
+
+        # Valores de la ventana en arreglos (I,J,Tw), (J,Tw), (I,Tw); se guardan solo los periodos fijados
+        n = fin - inicio + 1
+        x = Extraer_Valores(modelo.x)[1].reshape(I, J, n)[:, :, :fijos]
+        y = Extraer_Valores(modelo.y)[1].reshape(J, n)[:, :fijos]
+        s = Extraer_Valores(modelo.s)[1].reshape(I, n)[:, :fijos]
+        Costo += (problema.C_arr[:, :, None] * x).sum() + (problema.H_arr[:, None] * y).sum() + (problema.G_arr[:, None] * s).sum()
+        periodos = np.arange(inicio, inicio + fijos)
+        Transporte.append(Tabla_Fijada(x, ['Fabrica', 'Centro'], periodos, 'Cantidad', Solo_No_Nulos))
+        Inventario.append(Tabla_Fijada(y, ['Centro'], periodos, 'Inventario', Solo_No_Nulos))
+        Stock.append(Tabla_Fijada(s, ['Fabrica'], periodos, 'Stock', Solo_No_Nulos))
+
+        y0 = y[:, -1]
+        inicio += fijos
+        del modelo
+
+    Tablas = {'Transporte': pd.concat(Transporte, ignore_index=True),
+              'Inventario': pd.concat(Inventario, ignore_index=True),
+              'Stock': pd.concat(Stock, ignore_index=True)}
+    return Costo, pd.DataFrame(Resumen), Tablas
+
+def Tabla_Fijada(arreglo, columnas, periodos, valor, Solo_No_Nulos=True, decimales=4):
+    # Tabla larga de un arreglo (..., Periodo) con los indices 1-based y el periodo real de la ventana
+    indices = np.indices(arreglo.shape).reshape(arreglo.ndim, -1).T
+    valores = arreglo.ravel()
+    if Solo_No_Nulos:
+        mascara = np.abs(valores) > 0
+        indices, valores = indices[mascara], valores[mascara]
+    Table = pd.DataFrame(indices[:, :-1] + 1, columns=columnas)
+    Table.insert(0, 'Periodo', periodos[indices[:, -1]])
+    Table[valor] = np.round(valores, decimales)
+    return Table
+
+def Texto_Memoria(memoria):
+    # Memoria_Maxima es None donde no hay modulo resource (Windows)
+    return 'no disponible' if memoria is None else f'{memoria:.0f} MB'
+
+def Comparar_Completo(problema, W, Paso=None):
+    # Brecha del horizonte rodante respecto del modelo completo (cuando este todavia se puede resolver)
+    reloj = time.perf_counter()
+    Costo_RH, Resumen, _ = Resolver_Ventanas(problema, W, Paso)
+    tiempo_rh = time.perf_counter() - reloj
+    memoria_rh = Memoria_Maxima()
+
+    reloj = time.perf_counter()
+    modelo = problema.Model()
+    results = problema.opt.Resolver(modelo)
+    tiempo_completo = time.perf_counter() - reloj
+    Costo_completo = value(modelo.FunObj) if Es_Optimo(results) else np.nan
+    memoria_completo = Memoria_Maxima()
+
+    brecha = (Costo_RH - Costo_completo) / abs(Costo_completo) if Costo_RH is not None else np.nan
+    print(Resumen.to_string(index=False))
+    print(f'Horizonte rodante: {Costo_RH} en {tiempo_rh:.2f} s (memoria maxima {Texto_Memoria(memoria_rh)})')
+    print(f'Modelo completo: {Costo_completo} en {tiempo_completo:.2f} s (memoria maxima {Texto_Memoria(memoria_completo)})')
+    print(f'Brecha de optimalidad: {100 * brecha:.4f} %')
+    return brecha
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Horizonte rodante para GreenPharma')
+    parser.add_argument('--ventana', type=int, default=8, help='Periodos por ventana (W)')
+    parser.add_argument('--paso', type=int, default=None, help='Periodos fijados por ventana (por defecto W/2)')
+    parser.add_argument('--archivo', default='Data_Input.xlsx')
+    parser.add_argument('--sintetico', type=int, nargs=3, metavar=('FABRICAS', 'CENTROS', 'PERIODOS'),
+                        help='Usar una instancia generada en lugar del archivo')
+    parser.add_argument('--comparar', action='store_true', help='Resolver tambien el modelo completo y reportar la brecha')
+    args = parser.parse_args()
+
+    problema = Problema_GreenPharma()
+    if args.sintetico:
+        Cargar_Instancia(problema, Generar_Instancia(*args.sintetico))
+    else:
+        problema.ReadExcelFile(args.archivo)
+
+    if args.comparar:
+        Comparar_Completo(problema, args.ventana, args.paso)
+    else:
+        Costo, Resumen, Tablas = Resolver_Ventanas(problema, args.ventana, args.paso)
+        print(Resumen.to_string(index=False))
+        print('Costo horizonte rodante: ' + str(Costo))
+        if Tablas:
+            Escribir_Resultados(Tablas, 'Resultados_GreenPharma_Rodante.xlsx')
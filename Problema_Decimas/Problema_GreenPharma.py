@@ -1,23 +1,105 @@
+import os
+import sys
+import time
 import numpy as np
-import pandas as pd
 from pyomo.environ import *
-
-class Problema_GreenPharma:
+from pyomo.core.expr import LinearExpression
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Tabla_Variable, Tabla_Indices, Extraer_Valores, Escribir_Resultados
+from Solucionador import Solucionador
+from Carga_Datos import Leer_Libro, Indexar
+from Instrumentacion import Instrumentacion
+from Problema_Base import Problema_Base
+from Forma_Matricial import Forma_Matricial
+from scipy import sparse
+
+# Hojas de Data_Input.xlsx y columnas fijas de cada una
+ESQUEMA = {
+    'Produccion': {'columnas': ['Periodo']},
+    'Demanda': {'columnas': ['Periodo']},
+    'Costos_Fabricas': {'columnas': ['Fabrica', 'Costo_mantener_stock', 'Capacidad_transporte']},
+    'Costos_Transporte': {'columnas': ['Fabrica']},
+    'Costos_Centros': {'columnas': ['Centro', 'Costo_inventario']},
+}
+
+def Leer_Arreglos(problema):
+    # Convierte las hojas leidas a arreglos NumPy una sola vez (sin la primera columna de indices)
+    problema.P_arr = problema.Produccion.iloc[:, 1:].to_numpy(dtype=float).T        # (I, T)
+    problema.D_arr = problema.Demanda.iloc[:, 1:].to_numpy(dtype=float).T           # (J, T)
+    problema.C_arr = problema.Costos_Transporte.iloc[:, 1:].to_numpy(dtype=float)   # (I, J)
+    problema.G_arr = problema.Costos_Fabricas.iloc[:, 1].to_numpy(dtype=float)      # (I,)
+    problema.K_arr = problema.Costos_Fabricas.iloc[:, 2].to_numpy(dtype=float)      # (I,)
+    problema.H_arr = problema.Costos_Centros.iloc[:, 1].to_numpy(dtype=float)       # (J,)
+
+    problema.N_fabricas = problema.P_arr.shape[0]
+    problema.N_centros = problema.D_arr.shape[0]
+    problema.N_periodos = problema.P_arr.shape[1]
+
+    # Las dimensiones de las hojas deben ser consistentes entre si
+    esperado = {'Demanda (periodos)': (problema.D_arr.shape[1], problema.N_periodos),
+                'Costos_Transporte (fabricas, centros)': (problema.C_arr.shape, (problema.N_fabricas, problema.N_centros)),
+                'Costos_Fabricas (fabricas)': (len(problema.G_arr), problema.N_fabricas),
+                'Costos_Centros (centros)': (len(problema.H_arr), problema.N_centros)}
+    errores = [f'{hoja}: {leido}, se esperaba {valor}' for hoja, (leido, valor) in esperado.items() if leido != valor]
+    if errores:
+        raise ValueError('Dimensiones inconsistentes:\n  ' + '\n  '.join(errores))
+
+class Problema_GreenPharma(Problema_Base):
     def __init__(self):
+        super().__init__()
         self.Data = None
+        # Tiempos, memoria y tamaño por componente (se activa con IO_INSTRUMENTAR)
+        self.Inst = Instrumentacion(Etiqueta='GreenPharma')
     
-    def ReadExcelFile(self, FileName):
-        self.Produccion = pd.read_excel(FileName, sheet_name='Produccion')
-        self.Demanda = pd.read_excel(FileName, sheet_name='Demanda')
-        self.Costos_Fabricas = pd.read_excel(FileName, sheet_name='Costos_Fabricas')
-        self.Costos_Transporte = pd.read_excel(FileName, sheet_name='Costos_Transporte')
-        self.Costos_Centros = pd.read_excel(FileName, sheet_name='Costos_Centros')
-        
-        self.N_fabricas = len(self.Produccion.columns) - 1  # Assuming first column is index
-        self.N_centros = len(self.Demanda.columns) - 1     # Assuming first column is index
-        self.N_periodos = len(self.Produccion)             # Number of rows in Produccion
-
-    def Model(self):
+    def ReadExcelFile(self, FileName, Cache=True):
+        # Una sola apertura del libro; con el archivo sin cambios se usa el cache y no se lee el Excel
+        with self.Inst.Fase('carga_datos'):
+            for hoja, Table in Leer_Libro(FileName, ESQUEMA, Cache).items():
+                setattr(self, hoja, Table)
+            Leer_Arreglos(self)
+
+    def Model(self, Modo='Arreglos', Mutable=False, Periodos=None, Inventario_Inicial=None):
+        # Modo 'Arreglos': ConcreteModel con parametros inicializados en bloque desde NumPy
+        # Modo 'Reglas': AbstractModel original con una regla iloc por indice
+        # Mutable=True deja P y D como parametros mutables para cambiar de escenario sin reconstruir
+        if Modo == 'Reglas':
+            return self.Model_Reglas()
+        return self.Model_Arreglos(Mutable, Periodos, Inventario_Inicial)
+
+    def Model_Arreglos(self, Mutable=False, Periodos=None, Inventario_Inicial=None):
+        # Periodos=(inicio, fin) construye solo esa ventana del horizonte (extremos incluidos);
+        # Inventario_Inicial (J,) es el inventario de los centros al comenzar la ventana
+        inicio, fin = Periodos or (1, self.N_periodos)
+        model = ConcreteModel(name='Model')
+
+        ## SETS ##
+        model.I = Set(initialize=range(1, self.N_fabricas + 1))
+        model.J = Set(initialize=range(1, self.N_centros + 1))
+        model.T = Set(initialize=range(inicio, fin + 1))
+
+        ## PARAMETERS ##
+        model.C = Param(model.I, model.J, initialize=Indexar(self.C_arr))
+        model.H = Param(model.J, initialize=Indexar(self.H_arr))
+        model.G = Param(model.I, initialize=Indexar(self.G_arr))
+        model.P = Param(model.I, model.T, initialize=Indexar(self.P_arr[:, inicio-1:fin], (1, inicio)), mutable=Mutable)
+        model.D = Param(model.J, model.T, initialize=Indexar(self.D_arr[:, inicio-1:fin], (1, inicio)), mutable=Mutable)
+        model.K = Param(model.I, initialize=Indexar(self.K_arr))
+        if Inventario_Inicial is not None:
+            model.y0 = Param(model.J, initialize=Indexar(np.asarray(Inventario_Inicial, dtype=float)), mutable=True)
+
+        self.Componentes(model, Objetivo=False)
+
+        ## OBJECTIVE FUNCTION ##
+        # Coeficientes en el mismo orden que las variables x[i,j,t], y[j,t], s[i,t]
+        T = fin - inicio + 1
+        coeficientes = np.concatenate([np.repeat(self.C_arr.ravel(), T), np.repeat(self.H_arr, T), np.repeat(self.G_arr, T)])
+        variables = list(model.x.values()) + list(model.y.values()) + list(model.s.values())
+        model.FunObj = Objective(expr=LinearExpression(constant=0, linear_coefs=coeficientes.tolist(), linear_vars=variables),
+                                 sense=minimize)
+        return model
+
+    def Model_Reglas(self):
         model = AbstractModel(name='Model')
 
         ## SETS ##
@@ -50,6 +132,10 @@ class Problema_GreenPharma:
             return self.Costos_Fabricas.iloc[i-1, 2]
         model.K = Param(model.I, rule=K_init) 
 
+        self.Componentes(model)
+        return model.create_instance()
+
+    def Componentes(self, model, Objetivo=True):
         ## VARIABLES ##
         model.x = Var(model.I, model.J, model.T, within=NonNegativeReals, initialize=0)
         model.y = Var(model.J, model.T, within=NonNegativeReals, initialize=0)
@@ -61,19 +147,23 @@ class Problema_GreenPharma:
             costos_inventario = sum(model.H[j] * model.y[j,t] for j in model.J for t in model.T)
             costos_stock = sum(model.G[i] * model.s[i,t] for i in model.I for t in model.T)
             return costos_transporte + costos_inventario + costos_stock
-        model.FunObj = Objective(rule=Fun_obj, sense=minimize)
+        if Objetivo:
+            model.FunObj = Objective(rule=Fun_obj, sense=minimize)
 
         ## CONSTRAINTS ##
         def Balance_Fabricas(model, i, t):
             return sum(model.x[i,j,t] for j in model.J) + model.s[i,t] == model.P[i,t]
         model.balance_fabricas = Constraint(model.I, model.T, rule=Balance_Fabricas)
 
+        # Primer periodo del modelo (1, o el inicio de la ventana con inventario inicial y0)
         def Balance_Centros_P1(model, j):
-            return sum(model.x[i,j,1] for i in model.I) == model.D[j,1] + model.y[j,1]
+            t = model.T.first()
+            inicial = model.y0[j] if hasattr(model, 'y0') else 0
+            return inicial + sum(model.x[i,j,t] for i in model.I) == model.D[j,t] + model.y[j,t]
         model.balance_centros_p1 = Constraint(model.J, rule=Balance_Centros_P1)
 
         def Balance_Centros_Resto(model, j, t):
-            if t > 1:
+            if t > model.T.first():
                 return model.y[j,t-1] + sum(model.x[i,j,t] for i in model.I) == model.D[j,t] + model.y[j,t]
             return Constraint.Skip
         model.balance_centros_resto = Constraint(model.J, model.T, rule=Balance_Centros_Resto)
@@ -81,71 +171,173 @@ class Problema_GreenPharma:
         def Capacidad_Transporte(model, i, t):
             return sum(model.x[i,j,t] for j in model.J) <= model.K[i]
         model.capacidad_transporte = Constraint(model.I, model.T, rule=Capacidad_Transporte)
-        
-        return model.create_instance()
 
-    def Solver(self):
-        Modelo_greenpharma = self.Model()
-        self.opt = SolverFactory('glpk', executable=r'/home/pc01/anaconda3/envs/io/bin/glpsol')
-        results = self.opt.solve(Modelo_greenpharma)
+    def Datos_Estructura(self):
+        # Los costos y capacidades son coeficientes fijos del modelo; P y D son los Param mutables
+        return self.C_arr, self.H_arr, self.G_arr, self.K_arr, self.P_arr.shape, self.D_arr.shape
+
+    def Datos_Parametros(self):
+        return {'P': self.P_arr, 'D': self.D_arr}
+
+    def Matrices(self):
+        # Mismo modelo en forma matricial desde los arreglos (sin Pyomo). Columnas x[i,j,t], y[j,t], s[i,t] y filas
+        # balance_fabricas (i,t), balance_centros_p1 (j), balance_centros_resto (j,t) y capacidad_transporte (i,t),
+        # en el orden del modelo Pyomo
+        I, J, T = self.N_fabricas, self.N_centros, self.N_periodos
+        n_x, n_y = I*J*T, J*T
+        i_x, j_x, t_x = (eje.ravel() for eje in np.meshgrid(np.arange(I), np.arange(J), np.arange(T), indexing='ij'))
+        j_y, t_y = (eje.ravel() for eje in np.meshgrid(np.arange(J), np.arange(T), indexing='ij'))
+        i_s, t_s = (eje.ravel() for eje in np.meshgrid(np.arange(I), np.arange(T), indexing='ij'))
+        columnas_x, columnas_y, columnas_s = np.arange(n_x), n_x + np.arange(n_y), n_x + n_y + np.arange(I*T)
+
+        def Fila_Centro(j, t):
+            # Primer periodo en balance_centros_p1, el resto en balance_centros_resto
+            return np.where(t == 0, I*T + j, I*T + J + j*(T-1) + t - 1)
+
+        resto = t_y > 0
+        filas = np.concatenate([i_x*T + t_x, i_s*T + t_s, Fila_Centro(j_x, t_x), Fila_Centro(j_y, t_y),
+                                Fila_Centro(j_y[resto], t_y[resto])])
+        columnas = np.concatenate([columnas_x, columnas_s, columnas_x, columnas_y, columnas_y[resto] - 1])
+        coeficientes = np.concatenate([np.ones(n_x + I*T + n_x), -np.ones(n_y), np.ones(resto.sum())])
+        N = n_x + n_y + I*T
+        A_eq = sparse.csr_array((coeficientes, (filas, columnas)), shape=(I*T + J*T, N))
+        b_eq = np.concatenate([self.P_arr.ravel(), self.D_arr[:, 0], self.D_arr[:, 1:].ravel()])
+        A_ub = sparse.csr_array((np.ones(n_x), (i_x*T + t_x, columnas_x)), shape=(I*T, N))
+
+        c = np.concatenate([np.repeat(self.C_arr.ravel(), T), np.repeat(self.H_arr, T), np.repeat(self.G_arr, T)])
+        Variables = {'x': np.column_stack([i_x, j_x, t_x]) + 1, 'y': np.column_stack([j_y, t_y]) + 1,
+                     's': np.column_stack([i_s, t_s]) + 1}
+        Restricciones_eq = {'balance_fabricas': Variables['s'], 'balance_centros_p1': np.arange(1, J+1).reshape(J, 1),
+                            'balance_centros_resto': Variables['y'][resto]}
+        return Forma_Matricial(c, A_ub, np.repeat(self.K_arr, T), A_eq, b_eq, Variables=Variables,
+                               Restricciones_ub={'capacidad_transporte': Variables['s']},
+                               Restricciones_eq=Restricciones_eq)
+
+    def Construir_Instancia(self):
+        with self.Inst.Construccion():
+            model = self.Model(Mutable=True)
+        self.Inst.Contar_Componentes(model)
+        return model
+
+    def Actualizar_Escenario(self, model, Produccion=None, Demanda=None):
+        # Reemplaza las hojas Produccion/Demanda (None conserva la actual) y actualiza los parametros mutables del
+        # modelo ya construido. Se valida antes de asignar: un escenario con otras dimensiones no altera el problema
+        Produccion = self.Produccion if Produccion is None else Produccion
+        Demanda = self.Demanda if Demanda is None else Demanda
+        P_arr = Produccion.iloc[:, 1:].to_numpy(dtype=float).T
+        D_arr = Demanda.iloc[:, 1:].to_numpy(dtype=float).T
+        esperado = {'Produccion (fabricas, periodos)': (P_arr.shape, self.P_arr.shape),
+                    'Demanda (centros, periodos)': (D_arr.shape, self.D_arr.shape)}
+        errores = [f'{hoja}: {leido}, el modelo tiene {valor}' for hoja, (leido, valor) in esperado.items() if leido != valor]
+        if errores:
+            raise ValueError('El escenario tiene dimensiones distintas al modelo:\n  ' + '\n  '.join(errores))
+        self.Produccion, self.Demanda, self.P_arr, self.D_arr = Produccion, Demanda, P_arr, D_arr
+        model.P.store_values(Indexar(P_arr))
+        model.D.store_values(Indexar(D_arr))
+
+    def Solver(self, Modo='Arreglos', Duales=False):
+        # Modo 'Arreglos' reutiliza la instancia en cache (si solo cambiaron Produccion o Demanda actualiza P y D);
+        # 'Reglas' construye siempre. Duales=True importa los duales y costos reducidos del mismo solve
+        if Modo == 'Arreglos':
+            Modelo_greenpharma = self.Instancia()
+        else:
+            inicio = time.perf_counter()
+            with self.Inst.Construccion():
+                Modelo_greenpharma = self.Model(Modo)
+            self.Inst.Contar_Componentes(Modelo_greenpharma)
+            self.Reconstruida = True
+            self.Tiempos = {'construccion': time.perf_counter() - inicio, 'actualizacion': 0.0}
+        if Duales and Modelo_greenpharma.component('dual') is None:
+            Modelo_greenpharma.dual = Suffix(direction=Suffix.IMPORT)
+            Modelo_greenpharma.rc = Suffix(direction=Suffix.IMPORT)
+        results = self.opt.Resolver(Modelo_greenpharma, Warmstart=not self.Reconstruida)
+        self.Tiempos['solucion'] = self.opt.Tiempos['total']
+        self.Inst.Registrar_Solver(self.opt)
         results.write()
+        print('Tiempos: ' + self.Reporte_Tiempos())
 
         print('Valor Función Objetivo: ' + str(value(Modelo_greenpharma.FunObj)))
         return Modelo_greenpharma
 
-    def Print_Results(self, Modelo_greenpharma):
-        Table_Transport = pd.DataFrame()
-        Table_Inventory = pd.DataFrame()
-        Table_Stock = pd.DataFrame()
-
-        r = 0
-        for t in Modelo_greenpharma.T:
-            for i in Modelo_greenpharma.I:
-                for j in Modelo_greenpharma.J:
-                    Table_Transport.loc[r,'Periodo'] = t
-                    Table_Transport.loc[r,'Fabrica'] = i
-                    Table_Transport.loc[r,'Centro'] = j
-                    Table_Transport.loc[r,'Cantidad'] = round(Modelo_greenpharma.x[i,j,t].value,4)
-                    r += 1
-
-        r = 0
-        for t in Modelo_greenpharma.T:
-            for j in Modelo_greenpharma.J:
-                Table_Inventory.loc[r,'Periodo'] = t
-                Table_Inventory.loc[r,'Centro'] = j
-                Table_Inventory.loc[r,'Inventario'] = round(Modelo_greenpharma.y[j,t].value,4)
-                r += 1
-
-        r = 0
-        for t in Modelo_greenpharma.T:
-            for i in Modelo_greenpharma.I:
-                Table_Stock.loc[r,'Periodo'] = t
-                Table_Stock.loc[r,'Fabrica'] = i
-                Table_Stock.loc[r,'Stock'] = round(Modelo_greenpharma.s[i,t].value,4)
-                r += 1
-
-        with pd.ExcelWriter('Resultados_GreenPharma.xlsx') as writer:
-            Table_Transport.to_excel(writer, sheet_name='Transporte', index=False)
-            Table_Inventory.to_excel(writer, sheet_name='Inventario', index=False)
-            Table_Stock.to_excel(writer, sheet_name='Stock', index=False)
+    def Tablas_Resultados(self, Modelo_greenpharma, Solo_No_Nulos=False):
+        Table_Transport = Tabla_Variable(Modelo_greenpharma.x, ['Fabrica', 'Centro', 'Periodo'], 'Cantidad',
+                                         solo_no_nulos=Solo_No_Nulos, orden=['Periodo', 'Fabrica', 'Centro'])
+        Table_Inventory = Tabla_Variable(Modelo_greenpharma.y, ['Centro', 'Periodo'], 'Inventario',
+                                         solo_no_nulos=Solo_No_Nulos, orden=['Periodo', 'Centro'])
+        Table_Stock = Tabla_Variable(Modelo_greenpharma.s, ['Fabrica', 'Periodo'], 'Stock',
+                                     solo_no_nulos=Solo_No_Nulos, orden=['Periodo', 'Fabrica'])
+        return {'Transporte': Table_Transport, 'Inventario': Table_Inventory, 'Stock': Table_Stock}
+
+    def Print_Results(self, Modelo_greenpharma, Formato=None, Solo_No_Nulos=False):
+        with self.Inst.Fase('exportacion'):
+            Tablas = self.Tablas_Resultados(Modelo_greenpharma, Solo_No_Nulos)
+            Escribir_Resultados(Tablas, 'Resultados_GreenPharma.xlsx', Formato)
+
+    def Tablas_Duales(self, Modelo_greenpharma, Solo_No_Nulos=False, decimales=4):
+        # Mismas tablas que Problema_GreenPharma_Dual.Print_Results, tomadas del sufijo 'dual' del primal:
+        # a <- balance_fabricas, b <- balance_centros (p1 y resto), c <- capacidad_transporte
+        dual = Modelo_greenpharma.dual
+        Table_Dual_Fab = Tabla_Variable(Modelo_greenpharma.balance_fabricas, ['Fabrica', 'Periodo'], 'Valor_a',
+                                        decimales, Solo_No_Nulos, ['Periodo', 'Fabrica'], sufijo=dual)
+
+        centros_p1, valores_p1 = Extraer_Valores(Modelo_greenpharma.balance_centros_p1, dual)
+        indices_resto, valores_resto = Extraer_Valores(Modelo_greenpharma.balance_centros_resto, dual)
+        indices_p1 = np.column_stack([centros_p1[:, 0], np.full(len(centros_p1), Modelo_greenpharma.T.first(), dtype=centros_p1.dtype)])
+        Table_Dual_Centros = Tabla_Indices(np.vstack([indices_p1, indices_resto]), np.concatenate([valores_p1, valores_resto]),
+                                           ['Centro', 'Periodo'], 'Valor_b', decimales, Solo_No_Nulos, ['Periodo', 'Centro'])
+
+        Table_Dual_Capacidad = Tabla_Variable(Modelo_greenpharma.capacidad_transporte, ['Fabrica', 'Periodo'], 'Valor_c',
+                                              decimales, Solo_No_Nulos, ['Periodo', 'Fabrica'], sufijo=dual)
+        return {'Balance_Produccion': Table_Dual_Fab, 'Balance_Inventario': Table_Dual_Centros,
+                'Capacidad_Transporte': Table_Dual_Capacidad}
+
+    def Tabla_Costos_Reducidos(self, Modelo_greenpharma, Solo_No_Nulos=False):
+        return Tabla_Variable(Modelo_greenpharma.x, ['Fabrica', 'Centro', 'Periodo'], 'Costo_Reducido',
+                              solo_no_nulos=Solo_No_Nulos, orden=['Periodo', 'Fabrica', 'Centro'], sufijo=Modelo_greenpharma.rc)
+
+    def Print_Duales(self, Modelo_greenpharma, Formato=None, Solo_No_Nulos=False, Costos_Reducidos=False):
+        Tablas = self.Tablas_Duales(Modelo_greenpharma, Solo_No_Nulos)
+        if Costos_Reducidos:
+            Tablas['Costos_Reducidos'] = self.Tabla_Costos_Reducidos(Modelo_greenpharma, Solo_No_Nulos)
+        with self.Inst.Fase('exportacion_duales'):
+            Escribir_Resultados(Tablas, 'Resultados_GreenPharma_Dual.xlsx', Formato)
 
 class Problema_GreenPharma_Dual:
     def __init__(self):
         self.Data = None
+        self.opt = Solucionador()
     
-    def ReadExcelFile(self, FileName):
+    def ReadExcelFile(self, FileName, Cache=True):
         # Mantener la misma lectura de datos que el primal
-        self.Produccion = pd.read_excel(FileName, sheet_name='Produccion')
-        self.Demanda = pd.read_excel(FileName, sheet_name='Demanda')
-        self.Costos_Fabricas = pd.read_excel(FileName, sheet_name='Costos_Fabricas')
-        self.Costos_Transporte = pd.read_excel(FileName, sheet_name='Costos_Transporte')
-        self.Costos_Centros = pd.read_excel(FileName, sheet_name='Costos_Centros')
-        
-        self.N_fabricas = len(self.Produccion.columns) - 1
-        self.N_centros = len(self.Demanda.columns) - 1
-        self.N_periodos = len(self.Produccion)
-
-    def Model(self):
+        for hoja, Table in Leer_Libro(FileName, ESQUEMA, Cache).items():
+            setattr(self, hoja, Table)
+        Leer_Arreglos(self)
+
+    def Model(self, Modo='Arreglos'):
+        if Modo == 'Reglas':
+            return self.Model_Reglas()
+        return self.Model_Arreglos()
+
+    def Model_Arreglos(self):
+        model = ConcreteModel(name='Model_Dual')
+
+        ## SETS ##
+        model.I = Set(initialize=range(1, self.N_fabricas + 1))
+        model.J = Set(initialize=range(1, self.N_centros + 1))
+        model.T = Set(initialize=range(1, self.N_periodos + 1))
+
+        ## PARAMETERS ##
+        model.C = Param(model.I, model.J, initialize=Indexar(self.C_arr))
+        model.H = Param(model.J, initialize=Indexar(self.H_arr))
+        model.G = Param(model.I, initialize=Indexar(self.G_arr))
+        model.K = Param(model.I, initialize=Indexar(self.K_arr))
+        model.P = Param(model.I, model.T, initialize=Indexar(self.P_arr))
+        model.D = Param(model.J, model.T, initialize=Indexar(self.D_arr))
+
+        self.Componentes(model)
+        return model
+
+    def Model_Reglas(self):
         model = AbstractModel(name='Model_Dual')
 
         ## SETS ##
@@ -178,6 +370,10 @@ class Problema_GreenPharma_Dual:
             return self.Demanda.iloc[t-1, j]
         model.D = Param(model.J, model.T, rule=D_init)
 
+        self.Componentes(model)
+        return model.create_instance()
+
+    def Componentes(self, model):
         ## VARIABLES ##
         model.a = Var(model.I, model.T, within=Reals)
         model.b = Var(model.J, model.T, within=Reals)
@@ -208,60 +404,46 @@ class Problema_GreenPharma_Dual:
         def Rest_Stock_Fabricas(model, i, t):
             return model.a[i,t] <= model.G[i]
         model.rest_stock_fabricas = Constraint(model.I, model.T, rule=Rest_Stock_Fabricas)
-
-        return model.create_instance()
     
-    def Solver(self):
-        Modelo_dual = self.Model()
-        self.opt = SolverFactory('glpk', executable=r'/home/pc01/anaconda3/envs/io/bin/glpsol')
-        results = self.opt.solve(Modelo_dual)
+    def Solver(self, Modo='Arreglos'):
+        Modelo_dual = self.Model(Modo)
+        results = self.opt.Resolver(Modelo_dual)
         results.write()
+        print('Tiempos: ' + self.opt.Reporte())
 
         print('Valor Función Objetivo Dual: ' + str(value(Modelo_dual.FunObj)))
         return Modelo_dual
 
-    def Print_Results(self, Modelo_dual):
-        Table_Dual_Fab = pd.DataFrame()
-        Table_Dual_Centros = pd.DataFrame()
-        Table_Dual_Capacidad = pd.DataFrame()
-
-        r = 0
-        for t in Modelo_dual.T:
-            for i in Modelo_dual.I:
-                Table_Dual_Fab.loc[r,'Periodo'] = t
-                Table_Dual_Fab.loc[r,'Fabrica'] = i
-                Table_Dual_Fab.loc[r,'Valor_a'] = round(Modelo_dual.a[i,t].value,4)
-                r += 1
-
-        r = 0
-        for t in Modelo_dual.T:
-            for j in Modelo_dual.J:
-                Table_Dual_Centros.loc[r,'Periodo'] = t
-                Table_Dual_Centros.loc[r,'Centro'] = j
-                Table_Dual_Centros.loc[r,'Valor_b'] = round(Modelo_dual.b[j,t].value,4)
-                r += 1
-
-        r = 0
-        for t in Modelo_dual.T:
-            for i in Modelo_dual.I:
-                Table_Dual_Capacidad.loc[r,'Periodo'] = t
-                Table_Dual_Capacidad.loc[r,'Fabrica'] = i
-                Table_Dual_Capacidad.loc[r,'Valor_c'] = round(Modelo_dual.c[i,t].value,4)
-                r += 1
-
-        with pd.ExcelWriter('Resultados_GreenPharma_Dual.xlsx') as writer:
-            Table_Dual_Fab.to_excel(writer, sheet_name='Balance_Produccion', index=False)
-            Table_Dual_Centros.to_excel(writer, sheet_name='Balance_Inventario', index=False)
-            Table_Dual_Capacidad.to_excel(writer, sheet_name='Capacidad_Transporte', index=False)
+    def Tablas_Resultados(self, Modelo_dual, Solo_No_Nulos=False):
+        Table_Dual_Fab = Tabla_Variable(Modelo_dual.a, ['Fabrica', 'Periodo'], 'Valor_a',
+                                        solo_no_nulos=Solo_No_Nulos, orden=['Periodo', 'Fabrica'])
+        Table_Dual_Centros = Tabla_Variable(Modelo_dual.b, ['Centro', 'Periodo'], 'Valor_b',
+                                            solo_no_nulos=Solo_No_Nulos, orden=['Periodo', 'Centro'])
+        Table_Dual_Capacidad = Tabla_Variable(Modelo_dual.c, ['Fabrica', 'Periodo'], 'Valor_c',
+                                              solo_no_nulos=Solo_No_Nulos, orden=['Periodo', 'Fabrica'])
+        return {'Balance_Produccion': Table_Dual_Fab, 'Balance_Inventario': Table_Dual_Centros,
+                'Capacidad_Transporte': Table_Dual_Capacidad}
+
+    def Print_Results(self, Modelo_dual, Formato=None, Solo_No_Nulos=False):
+        Tablas = self.Tablas_Resultados(Modelo_dual, Solo_No_Nulos)
+        Escribir_Resultados(Tablas, 'Resultados_GreenPharma_Dual.xlsx', Formato)
 
 if __name__ == "__main__":
+    # El dual se obtiene del mismo solve del primal; --verificar-dual resuelve ademas el modelo dual explicito
+    import argparse
+    parser = argparse.ArgumentParser(description='Problema GreenPharma')
+    parser.add_argument('--verificar-dual', action='store_true', help='Resolver tambien Problema_GreenPharma_Dual como control')
+    args = parser.parse_args()
+
     problema = Problema_GreenPharma()
     problema.ReadExcelFile('Data_Input.xlsx')
-    modelo = problema.Solver()
+    modelo = problema.Solver(Duales=True)
     problema.Print_Results(modelo)
-
-    problema_dual = Problema_GreenPharma_Dual()
-    problema_dual.ReadExcelFile('Data_Input.xlsx')
-    modelo_dual = problema_dual.Solver()
-    problema_dual.Print_Results(modelo_dual)
-
+    problema.Print_Duales(modelo)
+    problema.Inst.Escribir(os.environ.get('IO_INSTRUMENTAR_ARCHIVO', 'Instrumentacion_GreenPharma.json'))
+
+    if args.verificar_dual:
+        problema_dual = Problema_GreenPharma_Dual()
+        problema_dual.ReadExcelFile('Data_Input.xlsx')
+        modelo_dual = problema_dual.Solver()
+        print('Diferencia primal - dual: ' + str(value(modelo.FunObj) - value(modelo_dual.FunObj)))
@@ -1,80 +1,145 @@
+import argparse
+import os
+import sys
 import pandas as pd
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Tabla_Variable, Tabla_Indices, Extraer_Valores
+
 class Verificacion_Holgura:
     def __init__(self):
         self.primal = None
         self.dual = None
         self.tolerancia = 1e-1  # Tolerancia para considerar un número como cero
-    
-    def ReadResults(self):
-        # Leer resultados del primal
-        self.transporte = pd.read_excel('Resultados_GreenPharma.xlsx', sheet_name='Transporte')
-        self.inventario = pd.read_excel('Resultados_GreenPharma.xlsx', sheet_name='Inventario')
-        self.stock = pd.read_excel('Resultados_GreenPharma.xlsx', sheet_name='Stock')
-        
-        # Leer resultados del dual
-        self.balance_prod = pd.read_excel('Resultados_GreenPharma_Dual.xlsx', sheet_name='Balance_Produccion')
-        self.balance_inv = pd.read_excel('Resultados_GreenPharma_Dual.xlsx', sheet_name='Balance_Inventario')
-        self.capacidad = pd.read_excel('Resultados_GreenPharma_Dual.xlsx', sheet_name='Capacidad_Transporte')
-
-    def Verificar_Holgura(self):
+
+    def CargarModelos(self, Modelo_primal, Modelo_dual=None):
+        # Toma los valores directamente de las instancias resueltas (sin pasar por Excel).
+        # Sin Modelo_dual se usan los duales importados en el sufijo 'dual' del primal (Solver(Duales=True))
+        self.transporte = Tabla_Variable(Modelo_primal.x, ['Fabrica', 'Centro', 'Periodo'], 'Cantidad', decimales=None)
+        self.inventario = Tabla_Variable(Modelo_primal.y, ['Centro', 'Periodo'], 'Inventario', decimales=None)
+        self.stock = Tabla_Variable(Modelo_primal.s, ['Fabrica', 'Periodo'], 'Stock', decimales=None)
+
+        if Modelo_dual is None:
+            from Problema_GreenPharma import Problema_GreenPharma
+            Duales = Problema_GreenPharma().Tablas_Duales(Modelo_primal, decimales=None)
+            self.balance_prod = Duales['Balance_Produccion']
+            self.balance_inv = Duales['Balance_Inventario']
+            self.capacidad = Duales['Capacidad_Transporte']
+        else:
+            self.balance_prod = Tabla_Variable(Modelo_dual.a, ['Fabrica', 'Periodo'], 'Valor_a', decimales=None)
+            self.balance_inv = Tabla_Variable(Modelo_dual.b, ['Centro', 'Periodo'], 'Valor_b', decimales=None)
+            self.capacidad = Tabla_Variable(Modelo_dual.c, ['Fabrica', 'Periodo'], 'Valor_c', decimales=None)
+
+        self.costos_transporte = Tabla_Variable(Modelo_primal.C, ['Fabrica', 'Centro'], 'C', decimales=None)
+        self.costos_centros = Tabla_Variable(Modelo_primal.H, ['Centro'], 'H', decimales=None)
+        self.costos_fabricas = Tabla_Variable(Modelo_primal.G, ['Fabrica'], 'G', decimales=None)
+        self.costos_fabricas['K'] = Extraer_Valores(Modelo_primal.K)[1]
+
+    def ReadResults(self, Archivo_Primal='Resultados_GreenPharma.xlsx', Archivo_Dual='Resultados_GreenPharma_Dual.xlsx',
+                    Archivo_Datos='Data_Input.xlsx'):
+        # Alternativa opcional: leer los resultados ya exportados a Excel
+        primal = pd.read_excel(Archivo_Primal, sheet_name=['Transporte', 'Inventario', 'Stock'])
+        self.transporte, self.inventario, self.stock = primal['Transporte'], primal['Inventario'], primal['Stock']
+
+        dual = pd.read_excel(Archivo_Dual, sheet_name=['Balance_Produccion', 'Balance_Inventario', 'Capacidad_Transporte'])
+        self.balance_prod = dual['Balance_Produccion']
+        self.balance_inv = dual['Balance_Inventario']
+        self.capacidad = dual['Capacidad_Transporte']
+
+        # Los costos se necesitan para las holguras duales (costos reducidos)
+        from Problema_GreenPharma import Problema_GreenPharma
+        datos = Problema_GreenPharma()
+        datos.ReadExcelFile(Archivo_Datos)
+        I, J = datos.C_arr.shape
+        fabricas, centros = np.arange(1, I + 1), np.arange(1, J + 1)
+        indices = np.stack(np.meshgrid(fabricas, centros, indexing='ij'), axis=-1).reshape(-1, 2)
+        self.costos_transporte = Tabla_Indices(indices, datos.C_arr.ravel(), ['Fabrica', 'Centro'], 'C', decimales=None)
+        self.costos_centros = pd.DataFrame({'Centro': centros, 'H': datos.H_arr})
+        self.costos_fabricas = pd.DataFrame({'Fabrica': fabricas, 'G': datos.G_arr, 'K': datos.K_arr})
+
+    def Productos(self):
+        # Calcula todos los productos variable * holgura con joins vectorizados
+        a = self.balance_prod[['Fabrica', 'Periodo', 'Valor_a']]
+        b = self.balance_inv[['Centro', 'Periodo', 'Valor_b']]
+        c = self.capacidad[['Fabrica', 'Periodo', 'Valor_c']]
+
+        # 1. x[i,j,t] * (C[i,j] - a[i,t] - b[j,t] - c[i,t])
+        T = (self.transporte.merge(a, on=['Fabrica', 'Periodo'], how='left')
+             .merge(b, on=['Centro', 'Periodo'], how='left')
+             .merge(c, on=['Fabrica', 'Periodo'], how='left')
+             .merge(self.costos_transporte, on=['Fabrica', 'Centro'], how='left'))
+        T['Holgura'] = T['C'] - (T['Valor_a'] + T['Valor_b'] + T['Valor_c'])
+        T['Producto'] = T['Cantidad'] * T['Holgura']
+
+        # 2. y[j,t] * (H[j] + b[j,t] - b[j,t+1]), con b[j,T+1] = 0 en el inventario final
+        b_siguiente = b.assign(Periodo=b['Periodo'] - 1).rename(columns={'Valor_b': 'Valor_b_sig'})
+        Y = (self.inventario.merge(b, on=['Centro', 'Periodo'], how='left')
+             .merge(b_siguiente, on=['Centro', 'Periodo'], how='left')
+             .merge(self.costos_centros, on='Centro', how='left'))
+        Y['Valor_b_sig'] = Y['Valor_b_sig'].fillna(0.0)
+        Y['Holgura'] = Y['H'] + Y['Valor_b'] - Y['Valor_b_sig']
+        Y['Producto'] = Y['Inventario'] * Y['Holgura']
+
+        # 3. s[i,t] * (G[i] - a[i,t])
+        S = (self.stock.merge(a, on=['Fabrica', 'Periodo'], how='left')
+             .merge(self.costos_fabricas[['Fabrica', 'G']], on='Fabrica', how='left'))
+        S['Holgura'] = S['G'] - S['Valor_a']
+        S['Producto'] = S['Stock'] * S['Holgura']
+
+        # 4. c[i,t] * (K[i] - sum_j x[i,j,t])
+        envios = self.transporte.groupby(['Fabrica', 'Periodo'], as_index=False)['Cantidad'].sum()
+        K = (c.merge(envios, on=['Fabrica', 'Periodo'], how='left')
+             .merge(self.costos_fabricas[['Fabrica', 'K']], on='Fabrica', how='left'))
+        K['Holgura'] = K['K'] - K['Cantidad'].fillna(0.0)
+        K['Producto'] = K['Valor_c'] * K['Holgura']
+
+        self.Detalle = {'Transporte': T, 'Inventario': Y, 'Stock': S, 'Capacidad': K}
+        return self.Detalle
+
+    def Verificar_Holgura(self, N_Peores=5):
+        Detalle = self.Productos()
+
+        Resumen = []
+        for nombre, Table in Detalle.items():
+            abs_producto = Table['Producto'].abs()
+            Resumen.append({'Restriccion': nombre, 'N': len(Table),
+                            'Max_Violacion': abs_producto.max() if len(Table) else 0.0,
+                            'N_Violaciones': int((abs_producto >= self.tolerancia).sum())})
+        self.Resumen = pd.DataFrame(Resumen)
+
         print("Verificación de Holgura Complementaria:")
         print("-" * 50)
+        print(self.Resumen.to_string(index=False))
+        peores = self.Peores(N_Peores)
+        if len(peores):
+            print(f"\nPeores {len(peores)} casos:")
+            print(peores.to_string(index=False))
+        print("\nCumple holgura complementaria:", 'SI' if self.Resumen['N_Violaciones'].sum() == 0 else 'NO')
+        return self.Resumen
 
-        # 1. Restricción de Transporte
-        print("\n1. Restricción de Transporte:")
-        for _, row in self.transporte.iterrows():
-            t = row['Periodo']
-            i = row['Fabrica']
-            j = row['Centro']
-            x = row['Cantidad']
-            a = self.balance_prod[(self.balance_prod['Periodo'] == t) & 
-                                  (self.balance_prod['Fabrica'] == i)]['Valor_a'].values[0]
-            b = self.balance_inv[(self.balance_inv['Periodo'] == t) & 
-                                 (self.balance_inv['Centro'] == j)]['Valor_b'].values[0]
-            c = self.capacidad[(self.capacidad['Periodo'] == t) & 
-                               (self.capacidad['Fabrica'] == i)]['Valor_c'].values[0]
-            holgura_dual = (a + b + c)  # Debe ser igual a C[i,j] en el modelo, pero aquí solo usamos el dual
-            producto = x * (holgura_dual)
-            cumple = abs(producto) < self.tolerancia
-            print(f"x[{i},{j},{t}] = {x:.4f}, (a+b+c) = {holgura_dual:.4f}, x*(a+b+c) = {producto:.2e} -> {'OK' if cumple else 'NO'}")
-
-        # 2. Restricción de Inventario
-        print("\n2. Restricción de Inventario:")
-        periodos = sorted(self.inventario['Periodo'].unique())
-        for _, row in self.inventario.iterrows():
-            t = row['Periodo']
-            j = row['Centro']
-            y = row['Inventario']
-            if t < periodos[-1]:
-                b_actual = self.balance_inv[(self.balance_inv['Periodo'] == t) & 
-                                            (self.balance_inv['Centro'] == j)]['Valor_b'].values[0]
-                b_siguiente = self.balance_inv[(self.balance_inv['Periodo'] == t+1) & 
-                                               (self.balance_inv['Centro'] == j)]['Valor_b'].values[0]
-                holgura_dual = (-b_actual + b_siguiente)
-            else:
-                b_actual = self.balance_inv[(self.balance_inv['Periodo'] == t) & 
-                                            (self.balance_inv['Centro'] == j)]['Valor_b'].values[0]
-                holgura_dual = -b_actual  # Inventario final
-            producto = y * holgura_dual
-            cumple = abs(producto) < self.tolerancia
-            print(f"y[{j},{t}] = {y:.4f}, holgura dual = {holgura_dual:.4f}, y*holgura = {producto:.2e} -> {'OK' if cumple else 'NO'}")
-
-        # 3. Restricción de Stock
-        print("\n3. Restricción de Stock:")
-        for _, row in self.stock.iterrows():
-            t = row['Periodo']
-            i = row['Fabrica']
-            s = row['Stock']
-            a = self.balance_prod[(self.balance_prod['Periodo'] == t) & 
-                                  (self.balance_prod['Fabrica'] == i)]['Valor_a'].values[0]
-            holgura_dual = a  # En el dual, a <= G, así que holgura es a-G, pero para la complementaria usamos a
-            producto = s * holgura_dual
-            cumple = abs(producto) < self.tolerancia
-            print(f"s[{i},{t}] = {s:.4f}, a = {a:.4f}, s*a = {producto:.2e} -> {'OK' if cumple else 'NO'}")
+    def Peores(self, N=5):
+        # Casos con mayor |variable * holgura| entre todas las restricciones
+        tablas = []
+        for nombre, Table in self.Detalle.items():
+            indices = [col for col in ('Fabrica', 'Centro', 'Periodo') if col in Table.columns]
+            tablas.append(Table[indices + ['Holgura', 'Producto']].assign(Restriccion=nombre))
+        Todos = pd.concat(tablas, ignore_index=True)
+        Todos = Todos[Todos['Producto'].abs() >= self.tolerancia]
+        orden = Todos['Producto'].abs().sort_values(ascending=False).index[:N]
+        return Todos.loc[orden, ['Restriccion', 'Fabrica', 'Centro', 'Periodo', 'Holgura', 'Producto']]
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Verificacion de holgura complementaria GreenPharma')
+    parser.add_argument('--excel', action='store_true', help='Leer los resultados exportados en lugar de resolver en memoria')
+    args = parser.parse_args()
+
     verificador = Verificacion_Holgura()
-    verificador.ReadResults()
-    verificador.Verificar_Holgura()
\ No newline at end of file
+    if args.excel:
+        verificador.ReadResults()
+    else:
+        from Problema_GreenPharma import Problema_GreenPharma
+        problema = Problema_GreenPharma()
+        problema.ReadExcelFile('Data_Input.xlsx')
+        verificador.CargarModelos(problema.Solver(Duales=True))
+    verificador.Verificar_Holgura()
@@ -1,16 +1,30 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 from pyomo.environ import * 
 
-class Problema_Dieta:
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Codigos_Generales'))
+from Extraccion_Resultados import Tabla_Columnas, Escribir_Resultados
+from Problema_Base import Problema_Base
+from Forma_Matricial import Forma_Matricial
+
+class Problema_Dieta(Problema_Base):
+    # Requisitos de la mezcla, compartidos por Model y Matrices
+    Libras_Minimas = 800
+    Proteina_Minima = 0.3
+    Fibra_Maxima = 0.05
+
     def __init__(self, name=None):
+        super().__init__()
         self.Data = []
 
     def ReadExcelFile(self, FileName):
         self.Data = pd.read_excel(FileName, sheet_name='Data')
         self.Nforrajes = len(self.Data)
 
-    def Model (self):
+    def Model (self, Mutable=False):
+        # Mutable=True deja C, P y F como parametros mutables (Instancia los actualiza sin reconstruir)
         model = AbstractModel(name='Model')
 
         ## SETS ##
@@ -19,15 +33,15 @@ class Problema_Dieta:
         ## PARAMETERS ##
         def C_init(model,i):
             return self.Data['Costo'].loc[i-1]
-        model.C = Param(model.A, rule=C_init)
+        model.C = Param(model.A, rule=C_init, mutable=Mutable)
 
         def P_init(model,i):
             return self.Data['Proteina'].loc[i-1]
-        model.P = Param(model.A, rule=P_init)
+        model.P = Param(model.A, rule=P_init, mutable=Mutable)
 
         def F_init(model,i):
             return self.Data['Fibra'].loc[i-1]
-        model.F = Param(model.A, rule=F_init)
+        model.F = Param(model.A, rule=F_init, mutable=Mutable)
 
         ## VARIABLES ##
         model.x = Var(model.A, within = NonNegativeReals, initialize = 0)
@@ -39,44 +53,56 @@ class Problema_Dieta:
 
         # ## CONSTRAINTS ##
         def Restriccion_1 (model):
-            return sum(model.x[i] for i in model.A) >= 800
+            return sum(model.x[i] for i in model.A) >= self.Libras_Minimas
         model.restriccion_1 = Constraint(rule=Restriccion_1)
 
         def Restriccion_2 (model):
-            return sum(model.P[i]*model.x[i] for i in model.A) >= 0.3*sum(model.x[i] for i in model.A)
+            return sum(model.P[i]*model.x[i] for i in model.A) >= self.Proteina_Minima*sum(model.x[i] for i in model.A)
         model.restriccion_2 = Constraint(rule=Restriccion_2)
 
         def Restriccion_3 (model):
-            return sum(model.F[i]*model.x[i] for i in model.A) <= 0.05*sum(model.x[i] for i in model.A)
+            return sum(model.F[i]*model.x[i] for i in model.A) <= self.Fibra_Maxima*sum(model.x[i] for i in model.A)
         model.restriccion_3 = Constraint(rule=Restriccion_3)
 
         return model.create_instance()
+
+    def Datos_Estructura(self):
+        return self.Nforrajes
+
+    def Datos_Parametros(self):
+        return {'C': self.Data['Costo'].to_numpy(dtype=float), 'P': self.Data['Proteina'].to_numpy(dtype=float),
+                'F': self.Data['Fibra'].to_numpy(dtype=float)}
+
+    def Matrices(self):
+        # Mismo modelo en forma matricial, armado desde las columnas del Excel (sin Pyomo), con los nombres y la
+        # orientacion de las filas que da Compilar (los duales coinciden con los del modelo Pyomo): Pyomo guarda
+        # restriccion_2 (variables a ambos lados) como 0.3*sum(x) - sum(P*x) <= 0; solo restriccion_1 (>= 800)
+        # se multiplica por -1
+        n = self.Nforrajes
+        P, F = self.Data['Proteina'].to_numpy(dtype=float), self.Data['Fibra'].to_numpy(dtype=float)
+        A_ub = np.vstack([-np.ones(n), self.Proteina_Minima - P, F - self.Fibra_Maxima])
+        return Forma_Matricial(self.Data['Costo'].to_numpy(dtype=float), A_ub, [-self.Libras_Minimas, 0, 0],
+                               Variables={'x': np.arange(1, n+1).reshape(n, 1)},
+                               Restricciones_ub={f'restriccion_{k}': np.array([[None]]) for k in range(1, 4)},
+                               Signos_ub=np.array([-1, 1, 1]))
     
     def Solver(self):
 
-        Modelo_dieta = self.Model()
-        #self.opt = SolverFactory('glpk', executable=r'/home/pc01/anaconda3/envs/io/bin/glpsol)
-        self.opt = SolverFactory('glpk', executable=r'/home/pc01/anaconda3/envs/io/bin/glpsol')
-        #self.opt = SolverFactory("glpk")
-        results = self.opt.solve(Modelo_dieta)
+        # Se reutiliza la instancia si solo cambiaron costos o nutrientes
+        Modelo_dieta, results = self.Resolver_Instancia()
         results.write()
+        print('Tiempos: ' + self.Reporte_Tiempos())
 
         print('Valor Función Objetivo: ' + str(value(Modelo_dieta.FunObj)))
 
         return Modelo_dieta
 
-    def Print_Results(self,Modelo_dieta):
-
-        Table = pd.DataFrame()
+    def Print_Results(self,Modelo_dieta, Formato=None):
 
-        r=0
-        for i in Modelo_dieta.A:
-            Table.loc[r,'Tipo Forraje'] = str(i)
-            Table.loc[r,'Libras'] = round(Modelo_dieta.x[i].value,4)
-            r += 1
+        Table = Tabla_Columnas({'Libras': Modelo_dieta.x}, 'Tipo Forraje')
+        Table['Tipo Forraje'] = Table['Tipo Forraje'].astype(str)
 
-        with pd.ExcelWriter('Resultados.xlsx') as data: 
-            Table.to_excel(data, sheet_name="Resultados")
+        Escribir_Resultados({'Resultados': Table}, 'Resultados.xlsx', Formato, index=True)
 
 if __name__ == "__main__":
     runing = Problema_Dieta()